@@ -0,0 +1,324 @@
+"""
+AT-RISK SCORING
+===============
+
+A weekly at-risk list per course, combining the current score, missing and
+late work, and participation, without re-reading the whole course each time.
+
+The engine keeps its state in the disk cache (`DiskCache("at_risk")`), one
+entry per course:
+
+* `subs`      – `[user_id, assignment_id, missing, late, excused]` per
+                submission id, kept current incrementally like the course
+                mirror: `students/submissions` with `submitted_since` /
+                `graded_since` at the saved watermark, plus the unsubmitted rows
+                of assignments that are new or came due since the last run, and
+                every row of students who joined since
+* `students`  – per student the raw inputs, the feature vector
+                (`FEATURES`, each 0–1), the risk score (0–100), level and
+                reasons
+
+Enrollments (current scores), the assignment listing and the course's student
+summaries (participation, shared with the analytics tools through
+`canvas_agent.course_analytics`) are fetched concurrently each run.  Only
+students whose inputs changed are re-scored; everyone else keeps their stored
+vector.  Changing `WEIGHTS` or the thresholds re-scores everyone once.  When the course mirror holds fresh submissions and
+enrollments they are read from it instead.
+
+    python -m canvas_agent.at_risk --course 123            # incremental
+    python -m canvas_agent.at_risk --course 123 --full     # rebuild the state
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from canvas_agent.canvas_cache import DiskCache
+from canvas_agent.course_analytics import course_analytics
+from canvas_agent.course_mirror import fresh_mirror
+from canvas_agent.openai_tools import DEFAULT_COURSE_ID, canvas_map, canvas_paginate
+from canvas_agent.roster import roster_for
+
+# A stored at-risk list younger than this is served without touching Canvas.
+RISK_MAX_AGE = float(os.getenv("CANVAS_RISK_MAX_AGE", "900"))
+
+FEATURES = ("grade", "missing", "late", "inactivity")
+WEIGHTS = np.array([0.45, 0.30, 0.10, 0.15])
+GOOD_SCORE, FAILING_SCORE = 85.0, 55.0  # grade feature is 0 at GOOD, 1 at FAILING
+MISSING_SATURATION = 0.25               # missing feature is 1 at 25% of due work missing
+LATE_SATURATION = 0.50
+LEVELS = (("high", 50.0), ("medium", 30.0), ("low", 0.0))
+
+_MODEL = hashlib.sha1(json.dumps([FEATURES, WEIGHTS.tolist(), GOOD_SCORE, FAILING_SCORE,
+                                  MISSING_SATURATION, LATE_SATURATION, LEVELS])
+                      .encode("utf-8")).hexdigest()[:12]
+
+_state_cache = DiskCache("at_risk")
+_locks: Dict[int, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _course_lock(course_id: int) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(course_id, threading.Lock())
+
+
+def _level(risk: float) -> str:
+    return next(name for name, floor in LEVELS if risk >= floor)
+
+
+def feature_matrix(inputs: np.ndarray) -> np.ndarray:
+    """
+    Feature vectors for rows of inputs.
+
+    Args:
+        inputs: (n, 8) array of `[current_score (NaN if none), missing, late,
+            due, page_views, max_page_views, participations, max_participations]`.
+
+    Returns:
+        np.ndarray: (n, len(FEATURES)) array, each feature in [0, 1].
+    """
+    score, missing, late, due, views, max_views, parts, max_parts = inputs.T
+    due = np.maximum(due, 1)
+    grade = np.where(np.isnan(score), 0.5,
+                     (GOOD_SCORE - np.nan_to_num(score)) / (GOOD_SCORE - FAILING_SCORE))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        activity = np.nanmean(np.stack([np.where(max_views > 0, views / max_views, np.nan),
+                                        np.where(max_parts > 0, parts / max_parts, np.nan)]),
+                              axis=0)
+    inactivity = np.where(np.isnan(activity), 0.0, 1 - activity)
+    features = np.stack([grade, missing / due / MISSING_SATURATION,
+                         late / due / LATE_SATURATION, inactivity], axis=1)
+    return np.clip(features, 0.0, 1.0)
+
+
+def _reasons(row: Dict[str, Any], features: List[float]) -> List[str]:
+    grade, missing, late, inactivity = features
+    reasons = []
+    if grade >= 0.4:
+        reasons.append("no current score" if row["current_score"] is None
+                       else f"current score {row['current_score']:.1f}%")
+    if missing >= 0.4:
+        reasons.append(f"{row['missing']} of {row['due']} due assignments missing")
+    if late >= 0.4:
+        reasons.append(f"{row['late']} late submissions")
+    if inactivity >= 0.6:
+        reasons.append(f"low activity ({row['participations']} participations, "
+                       f"{row['page_views']} page views)")
+    return reasons
+
+
+class RiskEngine:
+    """Incremental at-risk scoring of one course."""
+
+    def __init__(self, course_id: int):
+        self.course_id = course_id
+        self.state: Dict[str, Any] = _state_cache.get(str(course_id)) or {}
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        synced = self.state.get("synced_at")
+        return None if synced is None else time.time() - synced
+
+    # -- inputs -------------------------------------------------------------
+
+    def _listing(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return list(canvas_paginate(f"courses/{self.course_id}/students/submissions",
+                                    params={"student_ids[]": "all", **params}))
+
+    def _submission_updates(self, full: bool, due: Dict[str, Optional[str]],
+                            enrolled: Set[int], now: str) -> List[Dict[str, Any]]:
+        known = self.state.get("subs") or {}
+        since = self.state.get("watermark")
+        if full or not known or not since:
+            return self._listing({})
+        last_run = datetime.fromtimestamp(self.state["synced_at"], timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ")
+        old_due = self.state.get("assignments") or {}
+        # New assignments, and ones that came due since the last run: their
+        # unsubmitted rows turn missing without any timestamp changing.
+        touched = [int(aid) for aid, at in due.items()
+                   if aid not in old_due or (at and last_run < at <= now)]
+        seen = {row[0] for row in known.values()}
+        joined = sorted(enrolled - seen)
+        queries = [{"submitted_since": since}, {"graded_since": since}]
+        if touched:
+            queries.append({"assignment_ids[]": touched})
+        if joined:
+            queries.append({"student_ids[]": joined})
+        return [s for rows in canvas_map(self._listing, queries) for s in rows]
+
+    def _inputs(self, full: bool):
+        mirror = fresh_mirror(self.course_id, "submissions")
+        if mirror is not None and mirror.is_fresh(self.course_id, "enrollments"):
+            summaries = course_analytics(self.course_id, "student_summaries")
+            due = {str(a["id"]): a["due_at"] for a in mirror.assignments(self.course_id)}
+            enrollments = mirror.enrollments(self.course_id)
+            subs = mirror.submissions(self.course_id)
+            return enrollments, due, summaries, subs, True
+
+        enrollments, assignments, summaries = canvas_map(lambda fetch: fetch(), [
+            lambda: list(canvas_paginate(f"courses/{self.course_id}/enrollments",
+                                         params={"type[]": ["StudentEnrollment"],
+                                                 "state[]": ["active"], "include[]": ["grades"]})),
+            lambda: list(canvas_paginate(f"courses/{self.course_id}/assignments",
+                                         params={"exclude_response_fields[]":
+                                                 ["description", "rubric"]})),
+            lambda: course_analytics(self.course_id, "student_summaries"),
+        ])
+        due = {str(a["id"]): a.get("due_at") for a in assignments}
+        enrolled = {e["user_id"] for e in enrollments}
+        subs = self._submission_updates(full, due, enrolled, _utcnow())
+        replace = full or not self.state.get("subs") or not self.state.get("watermark")
+        return enrollments, due, summaries, subs, replace
+
+    # -- run ----------------------------------------------------------------
+
+    def run(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the course's scores up to date.
+
+        Args:
+            full: Ignore the saved state and re-read every submission.
+
+        Returns:
+            Dict[str, Any]: {'course_id', 'students', 'recomputed', 'unchanged',
+            'removed', 'fetched_submissions', 'full', 'levels': {level: n}, 'seconds'}
+        """
+        started = time.time()
+        now = _utcnow()
+        enrollments, due, summaries, updates, replace = self._inputs(full)
+
+        subs = {} if replace else dict(self.state.get("subs") or {})
+        watermark = None if replace else self.state.get("watermark")
+        for s in updates:
+            subs[str(s["id"])] = [s["user_id"], s["assignment_id"], bool(s.get("missing")),
+                                  bool(s.get("late")), bool(s.get("excused"))]
+            for stamp in (s.get("submitted_at"), s.get("graded_at")):
+                if stamp and (watermark is None or stamp > watermark):
+                    watermark = stamp
+
+        students = {e["user_id"]: e for e in enrollments}
+        counts = {uid: [0, 0, 0] for uid in students}  # missing, late, due
+        for uid, aid, missing, late, excused in subs.values():
+            at = due.get(str(aid))
+            if uid not in counts or excused or not at or at > now:
+                continue
+            c = counts[uid]
+            c[0] += missing
+            c[1] += late
+            c[2] += 1
+        activity = {s["id"]: s for s in summaries}
+        people = roster_for(self.course_id).resolve(students)
+
+        old = {} if self.state.get("model") != _MODEL else self.state.get("students") or {}
+        rows, changed = {}, []
+        for uid, e in students.items():
+            a = activity.get(uid) or {}
+            score = (e.get("grades") or {}).get("current_score")
+            inputs = [score, *counts[uid], a.get("page_views") or 0, a.get("max_page_views") or 0,
+                      a.get("participations") or 0, a.get("max_participations") or 0]
+            name = (people.get(uid) or {}).get("name")
+            previous = old.get(str(uid))
+            if previous and previous["inputs"] == inputs:
+                rows[str(uid)] = {**previous, "name": name}
+            else:
+                rows[str(uid)] = {"name": name, "inputs": inputs}
+                changed.append(str(uid))
+
+        if changed:
+            matrix = np.array([[np.nan if v is None else float(v) for v in rows[uid]["inputs"]]
+                               for uid in changed])
+            features = feature_matrix(matrix)
+            for uid, vector, risk in zip(changed, features, 100 * features @ WEIGHTS):
+                row = rows[uid]
+                score, missing, late, due_n, views, _, parts, _ = row["inputs"]
+                view = {"current_score": score, "missing": missing, "late": late, "due": due_n,
+                        "page_views": views, "participations": parts}
+                row.update(features=[round(float(v), 4) for v in vector],
+                           risk=round(float(risk), 1), level=_level(float(risk)),
+                           reasons=_reasons(view, vector.tolist()))
+
+        self.state = {"model": _MODEL, "synced_at": started, "watermark": watermark,
+                      "assignments": due, "subs": subs, "students": rows}
+        _state_cache.put(str(self.course_id), self.state, permanent=True)
+        levels = [r["level"] for r in rows.values()]
+        return {
+            "course_id": self.course_id,
+            "students": len(rows),
+            "recomputed": len(changed),
+            "unchanged": len(rows) - len(changed),
+            "removed": len(set(old) - set(rows)),
+            "fetched_submissions": len(updates),
+            "full": replace,
+            "levels": {name: levels.count(name) for name, _ in LEVELS},
+            "seconds": round(time.time() - started, 2),
+        }
+
+    # -- results ------------------------------------------------------------
+
+    def ranked(self, min_level: str = "medium", limit: int = 25) -> List[Dict[str, Any]]:
+        """Scored students at or above `min_level`, highest risk first."""
+        floor = dict(LEVELS)[min_level]
+        rows = []
+        for uid, r in (self.state.get("students") or {}).items():
+            if r["risk"] < floor:
+                continue
+            score, missing, late, due_n, views, _, parts, _ = r["inputs"]
+            rows.append({"user_id": int(uid), "name": r["name"], "risk": r["risk"],
+                         "level": r["level"], "reasons": r["reasons"],
+                         "current_score": score, "missing": missing, "late": late,
+                         "due": due_n, "page_views": views, "participations": parts,
+                         "features": dict(zip(FEATURES, r["features"]))})
+        rows.sort(key=lambda r: (-r["risk"], r["user_id"]))
+        return rows[:limit]
+
+
+def score_course(course_id: int, refresh: bool = False, full: bool = False,
+                 max_age: float = RISK_MAX_AGE) -> RiskEngine:
+    """
+    The course's engine with up-to-date scores.
+
+    The stored scores are used as they are when younger than `max_age`;
+    otherwise (or with `refresh`) the engine runs incrementally first.
+    """
+    with _course_lock(course_id):
+        engine = RiskEngine(course_id)
+        if refresh or full or engine.age is None or engine.age > max_age:
+            engine.last_run = engine.run(full=full)
+        return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score the at-risk students of a Canvas course.")
+    parser.add_argument("--course", type=int, default=DEFAULT_COURSE_ID)
+    parser.add_argument("--full", action="store_true", help="Rebuild the state from scratch.")
+    parser.add_argument("--min-level", choices=[name for name, _ in LEVELS], default="medium")
+    parser.add_argument("--limit", type=int, default=25)
+    args = parser.parse_args()
+
+    engine = score_course(args.course, refresh=True, full=args.full)
+    run = engine.last_run
+    print(f"Scored {run['students']} students of course {args.course} in {run['seconds']}s "
+          f"({run['recomputed']} recomputed, {run['unchanged']} unchanged, "
+          f"{run['fetched_submissions']} submissions read)")
+    print("  " + ", ".join(f"{name}: {n}" for name, n in run["levels"].items()))
+    for r in engine.ranked(args.min_level, args.limit):
+        print(f"  {r['risk']:5.1f}  {r['level']:<6}  {r['name'] or r['user_id']}: "
+              f"{'; '.join(r['reasons']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,23 +11,173 @@ Get the sub-accounts of an account
 Get the Terms of Service
 Get help links
 Get the manually-created courses sub-account for the domain root account
-List active courses in an accountUpdate an account
+List active courses in an account**
+Update an account
 Delete a user from the root account
 Restore a deleted user from a root account
-
-need to implement 2!
 """
-from openai_tools import *
-def get_users(account_id: int):
-    canvas = get_canvas()
-    account = canvas.get_account(account_id)
-    for user in account.get_users():
-        print(user)
-    # for att in account.attributes:
-        # print(att)
-    # print(account)
-    
-def get_account(account_id: int):
-    canvas = get_canvas()
-    account = canvas.get_account(account_id)
-    return account
\ No newline at end of file
+
+import statistics
+import time
+from typing import Any, Dict, Iterator, List, Literal, Optional
+
+from canvas_agent.openai_tools import (
+    CANVAS_MAX_WORKERS,
+    canvas_get,
+    canvas_imap,
+    canvas_paginate,
+    function_tool,
+)
+
+_ACCOUNT_FIELDS = ("id", "name", "parent_account_id", "root_account_id", "workflow_state",
+                   "default_time_zone", "sis_account_id")
+
+
+@function_tool()
+def get_account(account_id: int) -> Dict[str, Any]:
+    """
+    Get a single account.
+
+    Args:
+        account_id (int): Canvas account ID.
+
+    Returns:
+        Dict[str, Any]: {'id', 'name', 'parent_account_id', 'root_account_id',
+        'workflow_state', 'default_time_zone', 'sis_account_id'}
+    """
+    account = canvas_get(f"accounts/{account_id}")
+    return {k: account.get(k) for k in _ACCOUNT_FIELDS}
+
+
+@function_tool()
+def list_account_users(account_id: int, search: Optional[str] = None,
+                       limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    List users in an account.
+
+    Args:
+        account_id (int): Canvas account ID.
+        search (str, optional): Part of a name, login or SIS id to filter by.
+        limit (int): Maximum number of users to return.
+
+    Returns:
+        List[Dict[str, Any]]: [{'id', 'name', 'sortable_name', 'sis_user_id', 'login_id'}]
+    """
+    params = {"search_term": search} if search else None
+    users = []
+    for user in canvas_paginate(f"accounts/{account_id}/users", params=params):
+        users.append({k: user.get(k) for k in ("id", "name", "sortable_name",
+                                                 "sis_user_id", "login_id")})
+        if len(users) >= limit:
+            break
+    return users
+
+
+def iter_account_courses(account_id: int, term_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Active courses with students in an account, streamed page by page."""
+    params: Dict[str, Any] = {"state[]": ["available"], "with_enrollments": "true",
+                              "include[]": ["total_students"]}
+    if term_id is not None:
+        params["enrollment_term_id"] = term_id
+    return canvas_paginate(f"accounts/{account_id}/courses", params=params)
+
+
+def course_grade_stats(course: Dict[str, Any], threshold: float = 70.0) -> Dict[str, Any]:
+    """Current-score statistics of one course's active students (one paginated listing)."""
+    scores = []
+    students = 0
+    for e in canvas_paginate(f"courses/{course['id']}/enrollments",
+                             params={"type[]": ["StudentEnrollment"], "state[]": ["active"]}):
+        students += 1
+        score = (e.get("grades") or {}).get("current_score")
+        if score is not None:
+            scores.append(float(score))
+    row = {"course_id": course["id"], "name": course.get("name"),
+           "course_code": course.get("course_code"), "students": students,
+           "graded": len(scores), "mean": None, "median": None, "stdev": None,
+           "min": None, "max": None, "pct_below": None}
+    if scores:
+        row.update(
+            mean=round(statistics.fmean(scores), 2),
+            median=round(statistics.median(scores), 2),
+            stdev=round(statistics.pstdev(scores), 2),
+            min=round(min(scores), 2),
+            max=round(max(scores), 2),
+            pct_below=round(100.0 * sum(s < threshold for s in scores) / len(scores), 1),
+        )
+    return row
+
+
+@function_tool()
+def scan_account_grades(
+    account_id: int,
+    term_id: Optional[int] = None,
+    sort_by: Literal["mean", "median", "pct_below", "students", "stdev"] = "mean",
+    descending: bool = True,
+    threshold: float = 70.0,
+    min_students: int = 1,
+    limit: int = 25,
+) -> Dict[str, Any]:
+    """
+    Average current grade of every active course in an account, ranked.
+
+    Courses are streamed from the account's course listing and each course's
+    student enrollments are fetched concurrently as the listing arrives, so a
+    department of hundreds of courses takes a few seconds rather than minutes.
+
+    Args:
+        account_id (int): Canvas account (or sub-account) ID.
+        term_id (int, optional): Only courses of this enrollment term.
+        sort_by (str): Column to rank by: "mean", "median", "pct_below" (share of
+            students below `threshold`), "students" or "stdev".
+        descending (bool): Highest first (default) or lowest first.
+        threshold (float): Score counted as "below" for `pct_below`.
+        min_students (int): Leave out courses with fewer graded students.
+        limit (int): Number of ranked courses to return.
+
+    Returns:
+        Dict[str, Any]: {'account_id', 'term_id', 'courses_scanned', 'courses_ranked',
+        'students', 'graded', 'account_mean' (student-weighted), 'mean_of_course_means',
+        'failed': [{'course_id', 'name', 'error'}], 'seconds',
+        'courses': [{'rank', 'course_id', 'name', 'course_code', 'students', 'graded',
+        'mean', 'median', 'stdev', 'min', 'max', 'pct_below'}]}
+    """
+    started = time.time()
+
+    def stats(course: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return course_grade_stats(course, threshold)
+        except RuntimeError as exc:
+            return {"error": str(exc)}
+
+    rows, failed = [], []
+    students = graded = 0
+    score_sum = 0.0
+    for course, row in canvas_imap(stats, iter_account_courses(account_id, term_id),
+                                   max_workers=CANVAS_MAX_WORKERS):
+        if "error" in row:
+            failed.append({"course_id": course["id"], "name": course.get("name"),
+                           "error": row["error"]})
+            continue
+        students += row["students"]
+        if row["mean"] is not None:
+            graded += row["graded"]
+            score_sum += row["mean"] * row["graded"]
+        rows.append(row)
+
+    ranked = [r for r in rows if r["graded"] >= min_students and r[sort_by] is not None]
+    ranked.sort(key=lambda r: (r[sort_by], -r["course_id"]), reverse=descending)
+    means = [r["mean"] for r in rows if r["mean"] is not None]
+    return {
+        "account_id": account_id,
+        "term_id": term_id,
+        "courses_scanned": len(rows) + len(failed),
+        "courses_ranked": len(ranked),
+        "students": students,
+        "graded": graded,
+        "account_mean": round(score_sum / graded, 2) if graded else None,
+        "mean_of_course_means": round(statistics.fmean(means), 2) if means else None,
+        "failed": failed,
+        "seconds": round(time.time() - started, 2),
+        "courses": [{"rank": i, **r} for i, r in enumerate(ranked[:limit], 1)],
+    }
@@ -13,10 +13,186 @@ Get user-in-a-course-level messaging data*
 3 for sure, last 3 are maybe.
 """
 import os
-import requests
-from fastapi import HTTPException
-from typing import Optional, Dict
-from agents import function_tool
+from datetime import datetime, timezone
+from itertools import product
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from canvas_agent.at_risk import LEVELS, score_course
+from canvas_agent.canvas_cache import DiskCache
+from canvas_agent.course_analytics import course_analytics
+from canvas_agent.course_mirror import fresh_mirror
+from canvas_agent.roster import roster_for
+from canvas_agent.openai_tools import (
+    function_tool,
+    canvas_get,
+    canvas_map,
+    canvas_paginate,
+)
+
+# Distributions of terms that have not ended yet are re-fetched after this long;
+# completed terms are cached permanently.
+CURRENT_GRADES_TTL = float(os.getenv("CANVAS_CURRENT_GRADES_TTL", "3600"))
+PERCENTILES = [10, 25, 50, 75, 90]
+BINS = np.arange(101)
+
+_grades_cache = DiskCache("department_grades")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# H E L P E R S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def _ended(term: Dict[str, Any]) -> bool:
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return bool(term.get("end_at")) and term["end_at"] < now
+
+
+def fetch_department_grades(
+    account_id: int,
+    term_id: Optional[int] = None,
+    completed: bool = False,
+    term_ended: bool = False,
+) -> np.ndarray:
+    """
+    One account/term grade distribution as a length-101 count vector.
+
+    Distributions of ended terms are immutable and cached permanently; the
+    others are cached for `CURRENT_GRADES_TTL` seconds.
+    """
+    if term_id is not None:
+        key, path = f"{account_id}:term:{term_id}", f"accounts/{account_id}/analytics/terms/{term_id}/grades"
+    else:
+        state = "completed" if completed else "current"
+        key, path = f"{account_id}:{state}", f"accounts/{account_id}/analytics/{state}/grades"
+
+    counts = _grades_cache.get(key, max_age=CURRENT_GRADES_TTL)
+    if counts is None:
+        # Canvas returns {"0": n, ..., "100": n}
+        raw = canvas_get(path)
+        counts = [int(raw.get(str(b), 0)) for b in BINS]
+        _grades_cache.put(key, counts, permanent=term_ended)
+    return np.asarray(counts, dtype=np.int64)
+
+
+def _hist_summary(counts: np.ndarray) -> Dict[str, Any]:
+    """Count, mean, std and percentiles of a 0–100 grade histogram."""
+    total = int(counts.sum())
+    if total == 0:
+        return {"count": 0}
+    mean = float((BINS * counts).sum() / total)
+    std = float(np.sqrt((counts * (BINS - mean) ** 2).sum() / total))
+    cdf = np.cumsum(counts)
+    pct = np.searchsorted(cdf, np.asarray(PERCENTILES) / 100 * total)
+    return {
+        "count": total,
+        "mean": round(mean, 2),
+        "std": round(std, 2),
+        "percentiles": {f"p{p}": int(v) for p, v in zip(PERCENTILES, pct)},
+    }
+
+
+def _delta(current: Dict[str, Any], previous: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not current.get("count") or not previous.get("count"):
+        return None
+    delta = {"mean": round(current["mean"] - previous["mean"], 2),
+             "count": current["count"] - previous["count"]}
+    for p, v in current["percentiles"].items():
+        delta[p] = v - previous["percentiles"][p]
+    return delta
+
+
+def _recent_terms(account_id: int, last_terms: int) -> List[Dict[str, Any]]:
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    terms = [t for t in canvas_paginate(f"accounts/{account_id}/terms", key="enrollment_terms")
+             if t.get("start_at") and t["start_at"] <= now]
+    terms.sort(key=lambda t: t["start_at"])
+    return terms[-last_terms:] if last_terms > 0 else []
+
+
+def _student_roster(course_id: int) -> Dict[int, Dict[str, Any]]:
+    """user_id -> {'name', 'current_score'} for active students."""
+    mirror = fresh_mirror(course_id, "enrollments")
+    if mirror is not None:
+        enrollments = mirror.enrollments(course_id)
+    else:
+        enrollments = canvas_paginate(f"courses/{course_id}/enrollments",
+                                      params={"type[]": "StudentEnrollment",
+                                              "state[]": "active", "include[]": "grades"})
+    enrollments = list(enrollments)
+    people = roster_for(course_id).resolve(e["user_id"] for e in enrollments)
+    return {e["user_id"]: {"name": (people.get(e["user_id"]) or {}).get("name"),
+                           "current_score": (e.get("grades") or {}).get("current_score")}
+            for e in enrollments}
+
+
+def _engagement_rows(summaries: List[Dict[str, Any]],
+                     roster: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rows = []
+    for s in summaries:
+        tardy = s.get("tardiness_breakdown") or {}
+        student = roster.get(s["id"], {})
+        rows.append({
+            "user_id": s["id"],
+            "name": student.get("name"),
+            "current_score": student.get("current_score"),
+            "page_views": s.get("page_views") or 0,
+            "participations": s.get("participations") or 0,
+            "on_time": tardy.get("on_time") or 0,
+            "late": tardy.get("late") or 0,
+            "missing": tardy.get("missing") or 0,
+        })
+    return rows
+
+
+def _participation(activity: List[Dict[str, Any]], days: int) -> Dict[str, Any]:
+    views = np.array([d.get("views") or 0 for d in activity], dtype=float)
+    parts = np.array([d.get("participations") or 0 for d in activity], dtype=float)
+    recent, prior = slice(-days, None), slice(-2 * days, -days)
+    return {
+        "days": len(activity),
+        "total_views": int(views.sum()),
+        "total_participations": int(parts.sum()),
+        f"last_{days}_days": {"views": int(views[recent].sum()),
+                              "participations": int(parts[recent].sum())},
+        f"previous_{days}_days": {"views": int(views[prior].sum()),
+                                  "participations": int(parts[prior].sum())},
+        "series": [{"date": (d.get("date") or "")[:10], "views": d.get("views"),
+                    "participations": d.get("participations")} for d in activity[recent]],
+    }
+
+
+def _assignment_rows(assignments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rows = []
+    for a in assignments:
+        tardy = a.get("tardiness_breakdown") or {}
+        rows.append({
+            "assignment_id": a.get("assignment_id"),
+            "title": a.get("title"),
+            "due_at": a.get("due_at"),
+            "points_possible": a.get("points_possible"),
+            "median": a.get("median"),
+            "first_quartile": a.get("first_quartile"),
+            "third_quartile": a.get("third_quartile"),
+            "missing_rate": round(tardy.get("missing") or 0, 3),
+            "late_rate": round(tardy.get("late") or 0, 3),
+            "on_time_rate": round(tardy.get("on_time") or 0, 3),
+        })
+    return rows
+
+
+def _sorted(rows: List[Dict[str, Any]], column: str, descending: bool) -> List[Dict[str, Any]]:
+    """Sort rows by `column`; rows without a value always go last."""
+    present = [r for r in rows if r.get(column) is not None]
+    present.sort(key=lambda r: r[column], reverse=descending)
+    return present + [r for r in rows if r.get(column) is None]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# T O O L   F U N C T I O N S
+# ────────────────────────────────────────────────────────────────────────────────
+
 
 @function_tool()
 def get_department_grades(
@@ -37,27 +213,262 @@ def get_department_grades(
         A dict mapping integer grade bins (0–100) to raw counts.
 
     Raises:
-        HTTPException: on any non‐200 response from Canvas.
+        RuntimeError: on any non‐200 response from Canvas.
     """
-    base = os.getenv("CANVAS_API_URL")  # e.g. "https://yourinstitution.instructure.com"
-    token = os.getenv("CANVAS_API_TOKEN")
-    if not base or not token:
-        raise HTTPException(500, "Missing CANVAS_API_URL or CANVAS_API_TOKEN")
+    counts = fetch_department_grades(account_id, term_id, completed)
+    return {int(b): int(n) for b, n in zip(BINS, counts)}
 
-    # build URL
-    if term_id is not None:
-        url = f"{base}/api/v1/accounts/{account_id}/analytics/terms/{term_id}/grades"
-    elif completed:
-        url = f"{base}/api/v1/accounts/{account_id}/analytics/completed/grades"
+
+@function_tool()
+def compare_department_grades(
+    account_id: int,
+    term_ids: Optional[List[int]] = None,
+    last_terms: int = 8,
+    include_sub_accounts: bool = False,
+) -> Dict[str, Any]:
+    """
+    Compare department grade distributions across terms (and sub-accounts).
+
+    All account/term distributions are fetched concurrently, merged per term,
+    and summarised; each term is compared with the one before it.
+
+    Args:
+        account_id (int): Canvas account ID for the department.
+        term_ids (List[int], optional): Terms to compare, oldest first.  Defaults
+            to the `last_terms` most recent terms that have started.
+        last_terms (int): Number of recent terms when `term_ids` is omitted (default 8).
+        include_sub_accounts (bool): Also fetch each direct sub-account and report
+            it separately (term totals still cover `account_id` only).
+
+    Returns:
+        Dict[str, Any]: {
+            'terms': [{'term_id', 'name', 'ended', 'count', 'mean', 'std',
+                       'percentiles': {'p10'...'p90'},
+                       'delta': change vs previous term or None}],
+            'overall': summary of all listed terms merged,
+            'sub_accounts': [{'account_id', 'name', 'count', 'mean', ...,
+                              'by_term': {term_id: mean}}]  (if requested)
+        }
+    """
+    if term_ids:
+        known = {t["id"]: t for t in canvas_paginate(
+            f"accounts/{account_id}/terms", key="enrollment_terms")}
+        terms = [known.get(tid, {"id": tid}) for tid in term_ids]
     else:
-        url = f"{base}/api/v1/accounts/{account_id}/analytics/current/grades"
+        terms = _recent_terms(account_id, last_terms)
+
+    accounts: List[Dict[str, Any]] = [{"id": account_id, "name": None}]
+    if include_sub_accounts:
+        accounts += list(canvas_paginate(f"accounts/{account_id}/sub_accounts"))
+
+    def pull(pair: Tuple[Dict[str, Any], Dict[str, Any]]) -> np.ndarray:
+        account, term = pair
+        return fetch_department_grades(account["id"], term["id"], term_ended=_ended(term))
 
-    headers = {"Authorization": f"Bearer {token}"}
-    resp = requests.get(url, headers=headers, timeout=10)
-    if not resp.ok:
-        raise HTTPException(resp.status_code, f"Canvas API error: {resp.text}")
+    # grid[a, t] is the histogram of account a in term t (no terms: an empty grid,
+    # so every summary below comes out as {'count': 0})
+    pairs = list(product(accounts, terms))
+    grid = (np.stack(canvas_map(pull, pairs)) if pairs else np.zeros((0, len(BINS)))).reshape(
+        len(accounts), len(terms), len(BINS))
 
-    # The API returns a JSON object whose keys are strings "0"–"100"
-    # and whose values are counts; convert keys to int
-    raw = resp.json()
-    return {int(bin_str): count for bin_str, count in raw.items()}
+    rows: List[Dict[str, Any]] = []
+    previous: Dict[str, Any] = {}
+    for t, term in enumerate(terms):
+        summary = _hist_summary(grid[0, t])
+        rows.append({"term_id": term["id"], "name": term.get("name"), "ended": _ended(term),
+                     **summary, "delta": _delta(summary, previous)})
+        previous = summary
+
+    result: Dict[str, Any] = {"terms": rows, "overall": _hist_summary(grid[0].sum(axis=0))}
+    if include_sub_accounts:
+        result["sub_accounts"] = [{
+            "account_id": account["id"],
+            "name": account.get("name"),
+            **_hist_summary(grid[a].sum(axis=0)),
+            "by_term": {term["id"]: _hist_summary(grid[a, t]).get("mean")
+                        for t, term in enumerate(terms)},
+        } for a, account in enumerate(accounts) if a > 0]
+    return result
+
+
+@function_tool()
+def get_course_participation(course_id: int, days: int = 7) -> Dict[str, Any]:
+    """
+    Course-wide page views and participations per day (Canvas course analytics).
+
+    Args:
+        course_id (int): Canvas course ID.
+        days (int): Size of the recent window to report and compare (default 7).
+
+    Returns:
+        Dict[str, Any]: {'days', 'total_views', 'total_participations',
+                         'last_<days>_days': {'views', 'participations'},
+                         'previous_<days>_days': {...},
+                         'series': [{'date', 'views', 'participations'}] for the window}
+    """
+    return _participation(course_analytics(course_id, "activity"), max(1, days))
+
+
+@function_tool()
+def get_course_assignment_analytics(
+    course_id: int,
+    sort_by: Literal["missing_rate", "late_rate", "on_time_rate", "median", "due_at"] = "missing_rate",
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """
+    Per-assignment score quartiles and missing/late/on-time rates.
+
+    Args:
+        course_id (int): Canvas course ID.
+        sort_by (str): Column to sort by, descending: 'missing_rate', 'late_rate',
+            'on_time_rate', 'median' or 'due_at' (default 'missing_rate').
+        limit (int): Maximum number of assignments to return (default 20).
+
+    Returns:
+        List[Dict[str, Any]]: [{'assignment_id', 'title', 'due_at', 'points_possible',
+                                'median', 'first_quartile', 'third_quartile',
+                                'missing_rate', 'late_rate', 'on_time_rate'}]
+    """
+    rows = _assignment_rows(course_analytics(course_id, "assignments"))
+    return _sorted(rows, sort_by, descending=True)[:limit]
+
+
+@function_tool()
+def get_student_engagement(
+    course_id: int,
+    sort_by: Literal["page_views", "participations", "missing", "late", "on_time",
+                     "current_score"] = "page_views",
+    descending: bool = False,
+    max_page_views: Optional[int] = None,
+    max_participations: Optional[int] = None,
+    min_missing: Optional[int] = None,
+    limit: int = 25,
+) -> Dict[str, Any]:
+    """
+    Per-student engagement table: activity, submission timeliness and current score.
+
+    Filters are combined with AND; by default the least active students come first.
+
+    Args:
+        course_id (int): Canvas course ID.
+        sort_by (str): 'page_views', 'participations', 'missing', 'late',
+            'on_time' or 'current_score' (default 'page_views').
+        descending (bool): Sort from highest to lowest (default False).
+        max_page_views (int, optional): Only students with at most this many page views.
+        max_participations (int, optional): Only students with at most this many participations.
+        min_missing (int, optional): Only students with at least this many missing submissions.
+        limit (int): Maximum number of rows to return (default 25).
+
+    Returns:
+        Dict[str, Any]: {'matched': number of students passing the filters,
+                         'students': [{'user_id', 'name', 'current_score', 'page_views',
+                                       'participations', 'on_time', 'late', 'missing'}]}
+    """
+    summaries, roster = canvas_map(
+        lambda fetch: fetch(),
+        [lambda: course_analytics(course_id, "student_summaries"),
+         lambda: _student_roster(course_id)])
+    rows = _engagement_rows(summaries, roster)
+    if max_page_views is not None:
+        rows = [r for r in rows if r["page_views"] <= max_page_views]
+    if max_participations is not None:
+        rows = [r for r in rows if r["participations"] <= max_participations]
+    if min_missing is not None:
+        rows = [r for r in rows if r["missing"] >= min_missing]
+    return {"matched": len(rows), "students": _sorted(rows, sort_by, descending)[:limit]}
+
+
+@function_tool()
+def get_course_pulse(course_id: int, days: int = 7) -> Dict[str, Any]:
+    """
+    One-call overview of a course: recent participation, the assignments students
+    struggle to submit, and students who look disengaged.
+
+    Participation, assignment and student-summary analytics (plus the roster)
+    are fetched concurrently.
+
+    Args:
+        course_id (int): Canvas course ID.
+        days (int): Recent window for participation trends (default 7).
+
+    Returns:
+        Dict[str, Any]: {
+            'participation': {'last_<days>_days', 'previous_<days>_days', 'total_views', ...},
+            'most_missed_assignments': top 3 by missing rate,
+            'engagement': {'students', 'median_page_views', 'median_participations',
+                           'no_participation': count, 'with_missing': count},
+            'least_engaged': 5 students with the fewest participations
+        }
+    """
+    activity, assignments, summaries, roster = canvas_map(
+        lambda fetch: fetch(),
+        [lambda: course_analytics(course_id, "activity"),
+         lambda: course_analytics(course_id, "assignments"),
+         lambda: course_analytics(course_id, "student_summaries"),
+         lambda: _student_roster(course_id)])
+
+    participation = _participation(activity, max(1, days))
+    participation.pop("series")
+    asgn = sorted(_assignment_rows(assignments), key=lambda r: r["missing_rate"], reverse=True)
+    rows = _engagement_rows(summaries, roster)
+    views = np.array([r["page_views"] for r in rows], dtype=float)
+    parts = np.array([r["participations"] for r in rows], dtype=float)
+    return {
+        "participation": participation,
+        "most_missed_assignments": [{k: r[k] for k in ("assignment_id", "title", "due_at",
+                                                       "missing_rate", "late_rate")}
+                                    for r in asgn[:3]],
+        "engagement": {
+            "students": len(rows),
+            "median_page_views": float(np.median(views)) if rows else None,
+            "median_participations": float(np.median(parts)) if rows else None,
+            "no_participation": int((parts == 0).sum()),
+            "with_missing": sum(1 for r in rows if r["missing"] > 0),
+        },
+        "least_engaged": sorted(rows, key=lambda r: (r["participations"], r["page_views"]))[:5],
+    }
+
+
+@function_tool()
+def get_at_risk_students(
+    course_id: int,
+    min_level: Literal["high", "medium", "low"] = "medium",
+    limit: int = 25,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Students at risk in a course, ranked by a 0–100 risk score that combines the
+    current score, missing and late work, and participation.
+
+    Scores are kept between calls and only students whose inputs changed are
+    re-scored, so repeated calls are cheap; a list younger than the configured
+    max age (`RISK_MAX_AGE`, set through CANVAS_RISK_MAX_AGE) is returned
+    without contacting Canvas unless `refresh` is set.
+
+    Args:
+        course_id (int): Canvas course ID.
+        min_level (str): 'high', 'medium' or 'low' (everyone) (default 'medium').
+        limit (int): Maximum number of students to return (default 25).
+        refresh (bool): Re-check Canvas even if the stored list is recent.
+
+    Returns:
+        Dict[str, Any]: {
+            'scored_at', 'levels': {'high', 'medium', 'low'},
+            'run': {'recomputed', 'unchanged', 'fetched_submissions', 'seconds'} or None
+                   if the stored list was used,
+            'students': [{'user_id', 'name', 'risk', 'level', 'reasons', 'current_score',
+                          'missing', 'late', 'due', 'page_views', 'participations',
+                          'features': {'grade', 'missing', 'late', 'inactivity'}}]
+        }
+    """
+    engine = score_course(course_id, refresh=refresh)
+    levels = [r["level"] for r in engine.state["students"].values()]
+    run = engine.last_run
+    return {
+        "scored_at": datetime.fromtimestamp(engine.state["synced_at"], timezone.utc)
+                             .strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "levels": {name: levels.count(name) for name, _ in LEVELS},
+        "run": run and {k: run[k] for k in ("recomputed", "unchanged",
+                                            "fetched_submissions", "seconds")},
+        "students": engine.ranked(min_level, limit),
+    }
@@ -24,6 +24,8 @@ Batch update overrides in a course
 8 to implement
 """
 from canvas_agent.openai_tools import *
+from canvas_agent.projection import Detail, fields_error, select_fields, project, canvas_params
+from canvas_agent.course_mirror import fresh_mirror
 
 class AssignmentCreate(BaseModel):
     """
@@ -129,21 +131,27 @@ def create_assignment(course_id: int, assignment_data: AssignmentCreate):
     except KeyError:
         raise KeyError("Problem in create_assignment.")
 
-@function_tool()
-def get_assignments(course_id: int):
+@function_tool(failure_error_function=fields_error)
+def get_assignments(
+    course_id: int,
+    detail: Detail = "standard",
+    fields: Optional[List[str]] = None,
+):
     """
     Retrieve all assignments for a specific Canvas course in a structured format.
 
     This function fetches every assignment in a course and returns a clean, simplified 
-    list of dictionaries containing the most important details for each assignment, 
-    such as its name, description, due date, points possible, type of assignment, 
-    and publication status.
+    list of dictionaries trimmed to the requested detail level or field set. The HTML
+    description is only fetched (and returned) when asked for.
 
     Args:
         course_id (int): The Canvas course ID to fetch assignments from.
+        detail (str): "minimal", "standard" (default) or "full". Only "full"
+            includes the HTML `description`.
+        fields (List[str], optional): Explicit fields to return; overrides `detail`.
 
     Returns:
-        List[Dict[str, Any]]: A list where each item represents an assignment, containing:
+        List[Dict[str, Any]]: A list where each item represents an assignment, with any of:
             - 'id' (int): Assignment ID
             - 'name' (str): Assignment name
             - 'description' (str): HTML description (if any)
@@ -160,25 +168,19 @@ def get_assignments(course_id: int):
     Notes:
         - Unpublished assignments are included in the results.
         - Some fields like `due_at` may be None if no due date is set.
+        - Served from the local course mirror when it is fresh.
     """
-    canvas = get_canvas()
-    assignments = canvas.get_course(course_id).get_assignments()
-
-    formatted_assignments = []
-    for asgn in assignments:
-        formatted_assignments.append({
-            "id": asgn.id,
-            "name": asgn.name,
-            "description": asgn.description,
-            "due_at": asgn.due_at,  # ISO string or None
-            "points_possible": asgn.points_possible,
-            "submission_types": asgn.submission_types,
-            "is_quiz_assignment": asgn.is_quiz_assignment,
-            "published": asgn.published,
-            "html_url": asgn.html_url,
-        })
-
-    return formatted_assignments
+    keep = select_fields("assignment", detail, fields)
+    mirror = fresh_mirror(course_id, "assignments")
+    if mirror is not None:
+        assignments = mirror.assignments(course_id)
+    else:
+        canvas = get_canvas()
+        assignments = [vars(asgn) for asgn in canvas.get_course(course_id).get_assignments(
+            **{k.rstrip("[]"): v for k, v in canvas_params("assignment", keep).items()}
+        )]
+
+    return [project(asgn, "assignment", keep, detail) for asgn in assignments]
 
 @function_tool()
 def edit_assignment(
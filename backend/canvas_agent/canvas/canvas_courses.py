@@ -1,5 +1,6 @@
 # https://canvas.instructure.com/doc/api/courses.html#method.courses.create_file
 from canvas_agent.openai_tools import *
+from canvas_agent.file_upload import UPLOAD_DIR, upload_files
 # —————————————————————————————
 # Account endpoints
 # —————————————————————————————
@@ -11,10 +12,49 @@ from canvas_agent.openai_tools import *
 
 # TODO (low prio): IMPLEMENT ADD_COURSE (CURRENTLY CAN'T BC OF ADMIN LIMITATIONS)
 
-# TODO (medium prio): IMPLEMENT UPLOAD_FILE (it's a longer process) (https://canvas.instructure.com/doc/api/file.file_uploads.html#method.file_uploads.url)
+# https://canvas.instructure.com/doc/api/file.file_uploads.html#method.file_uploads.url
 @function_tool()
-def upload_file(course_id: int):
-    pass
+def upload_file(
+    course_id: int,
+    paths: List[str],
+    folder: Optional[str] = None,
+    on_duplicate: Literal["overwrite", "rename"] = "overwrite",
+) -> Dict[str, Any]:
+    """
+    Upload local files to a course (preflight, streamed upload, confirm).
+
+    Files are streamed from disk, several at a time, so large lecture
+    recordings and datasets can be uploaded without loading them into memory.
+    Only files inside the upload directory (CANVAS_UPLOAD_DIR) can be uploaded.
+
+    Args:
+        course_id (int): Course ID.
+        paths (List[str]): File paths inside the upload directory (relative to it).
+        folder (str, optional): Folder path in the course files, e.g. "Lectures/Week 3"
+            (created if missing; default: the course's root folder).
+        on_duplicate (str): 'overwrite' an existing file of the same name, or 'rename' the new one.
+
+    Returns:
+        Dict[str, Any]: {
+            'files': [{'path', 'id', 'display_name', 'size', 'url', 'seconds', 'mb_per_s'}
+                      or {'path', 'error'}],
+            'sent_bytes', 'total_bytes', 'percent', 'files_done', 'seconds', 'mb_per_s'
+        }
+    """
+    errors, allowed = {}, []
+    for path in paths:
+        full = path_within(UPLOAD_DIR, path)
+        if full is None:
+            errors[path] = "Outside the upload directory"
+        elif not os.path.isfile(full):
+            errors[path] = "Not a file"
+        else:
+            allowed.append(full)
+    result = upload_files(f"courses/{course_id}", allowed, folder, on_duplicate)
+    uploaded = iter(result["files"])
+    result["files"] = [{"path": p, "error": errors[p]} if p in errors
+                       else {**next(uploaded), "path": p} for p in paths]
+    return result
 
 """
 full list:
@@ -29,4 +29,48 @@ Usage Rights
 Set usage rights
 Remove usage rights
 List licenses
-"""
\ No newline at end of file
+"""
+import os
+from typing import Any, Dict, Optional
+
+from canvas_agent.file_sync import FILES_DIR, sync_files
+from canvas_agent.openai_tools import function_tool, path_within
+
+
+@function_tool()
+def sync_course_files(
+    course_id: int,
+    dest: Optional[str] = None,
+    folder: Optional[str] = None,
+    prune: bool = False,
+    limit: int = 50,
+) -> Dict[str, Any]:
+    """
+    Download a course's files into a local directory, fetching only what changed.
+
+    Unchanged files (same size and updated_at, intact local copy) are skipped,
+    interrupted downloads resume where they stopped, and a manifest of every
+    local file (path, size, updated_at, sha256) is written next to them.
+
+    Args:
+        course_id (int): Course ID.
+        dest (str, optional): Directory inside CANVAS_FILES_DIR, relative to it
+            (default: "<course_id>").
+        folder (str, optional): Only sync this folder, e.g. "Lectures/Week 3".
+        prune (bool): Delete local files that were removed from Canvas.
+        limit (int): Maximum number of file entries to list in the result (default 50;
+            changed files first).  The manifest always lists every file.
+
+    Returns:
+        Dict[str, Any]: {'dest', 'manifest', 'files', 'downloaded', 'resumed', 'skipped',
+        'failed', 'removed', 'bytes', 'seconds', 'mb_per_s',
+        'entries': [{'path', 'id', 'size', 'status'}]}, or {'error'} if `dest`
+        is outside CANVAS_FILES_DIR
+    """
+    target = path_within(FILES_DIR, dest or str(course_id))
+    if target is None or target == os.path.realpath(FILES_DIR):
+        return {"error": "dest must be a directory inside the course files directory"}
+    result = sync_files(course_id, target, folder, prune)
+    result["entries"].sort(key=lambda e: e["status"] == "unchanged")
+    result["entries"] = result["entries"][:limit]
+    return result
@@ -0,0 +1,380 @@
+"""
+GRADEBOOK ANALYTICS TOOLS
+=========================
+
+Numeric summaries of a course gradebook computed locally with pandas/NumPy,
+so the agent gets exact statistics instead of doing arithmetic in tokens.
+
+All tools share one load of the course (enrollments, assignments and every
+submission) into DataFrames:
+
+* `students`  – one row per active student: name (from the roster index),
+  current/final score
+* `scores`    – students × assignments matrix of percentage scores
+* `subs`      – long table of submissions with late / missing flags
+
+The load comes from the local course mirror when it is fresh, otherwise from
+Canvas (one paginated multi-student submissions listing), and is reused for
+`FRAME_TTL` seconds so several analytics calls in one turn cost one fetch.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from canvas_agent.openai_tools import (
+    function_tool,
+    canvas_paginate,
+)
+from canvas_agent.course_mirror import fresh_mirror
+from canvas_agent.roster import roster_for
+
+FRAME_TTL = 60.0
+PERCENTILES = [10, 25, 50, 75, 90]
+
+_frames: Dict[int, Tuple[float, Dict[str, pd.DataFrame]]] = {}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# H E L P E R S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def _fetch(course_id: int) -> Tuple[List[dict], List[dict], List[dict]]:
+    mirror = fresh_mirror(course_id, "submissions")
+    if mirror is not None and mirror.is_fresh(course_id, "enrollments"):
+        return (mirror.enrollments(course_id), mirror.assignments(course_id),
+                mirror.submissions(course_id))
+    enrollments = list(canvas_paginate(
+        f"courses/{course_id}/enrollments",
+        params={"type[]": "StudentEnrollment", "state[]": "active", "include[]": "grades"}))
+    assignments = list(canvas_paginate(
+        f"courses/{course_id}/assignments",
+        params={"exclude_response_fields[]": ["description", "rubric"]}))
+    submissions = list(canvas_paginate(
+        f"courses/{course_id}/students/submissions", params={"student_ids[]": "all"}))
+    return enrollments, assignments, submissions
+
+
+def load_gradebook(course_id: int) -> Dict[str, pd.DataFrame]:
+    """
+    Load (or reuse) the course's gradebook DataFrames.
+
+    Returns:
+        Dict[str, pd.DataFrame]: 'students', 'assignments', 'subs' and 'scores'.
+    """
+    cached = _frames.get(course_id)
+    if cached and time.time() - cached[0] < FRAME_TTL:
+        return cached[1]
+
+    enrollments, assignments, submissions = _fetch(course_id)
+    people = roster_for(course_id).resolve(e["user_id"] for e in enrollments)
+
+    students = pd.DataFrame([{
+        "user_id": e["user_id"],
+        "name": (people.get(e["user_id"]) or {}).get("name"),
+        "current_score": (e.get("grades") or {}).get("current_score"),
+        "final_score": (e.get("grades") or {}).get("final_score"),
+    } for e in enrollments], columns=["user_id", "name", "current_score", "final_score"])
+    students = students.drop_duplicates("user_id").set_index("user_id")
+    students[["current_score", "final_score"]] = students[
+        ["current_score", "final_score"]].astype(float)
+
+    asgn = pd.DataFrame([{
+        "assignment_id": a["id"],
+        "name": a.get("name"),
+        "points_possible": a.get("points_possible"),
+        "due_at": a.get("due_at"),
+    } for a in assignments], columns=["assignment_id", "name", "points_possible", "due_at"])
+    asgn = asgn.set_index("assignment_id")
+    asgn["points_possible"] = asgn["points_possible"].astype(float)
+
+    subs = pd.DataFrame([{
+        "user_id": s["user_id"],
+        "assignment_id": s["assignment_id"],
+        "score": s.get("score"),
+        "workflow_state": s.get("workflow_state"),
+        "late": bool(s.get("late")),
+        "missing": bool(s.get("missing")),
+        "excused": bool(s.get("excused")),
+    } for s in submissions], columns=["user_id", "assignment_id", "score", "workflow_state",
+                                      "late", "missing", "excused"])
+    subs = subs[subs["user_id"].isin(students.index) & subs["assignment_id"].isin(asgn.index)]
+    subs = subs.astype({"late": bool, "missing": bool, "excused": bool})  # object when empty
+    subs["score"] = subs["score"].astype(float)
+    points = asgn["points_possible"].reindex(subs["assignment_id"]).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        subs["percent"] = np.where(points > 0, 100 * subs["score"].to_numpy() / points, np.nan)
+
+    scores = subs.pivot_table(index="user_id", columns="assignment_id",
+                              values="percent", aggfunc="last")
+    scores = scores.reindex(index=students.index, columns=asgn.index)
+
+    frames = {"students": students, "assignments": asgn, "subs": subs, "scores": scores}
+    _frames[course_id] = (time.time(), frames)
+    return frames
+
+
+def invalidate_gradebook(course_id: int) -> None:
+    """Drop the course's loaded DataFrames so the next call reloads them."""
+    _frames.pop(course_id, None)
+
+
+def _num(value: Any) -> Optional[float]:
+    """NumPy scalar / NaN → JSON-friendly rounded float or None."""
+    if value is None or pd.isna(value):
+        return None
+    return round(float(value), 2)
+
+
+def _describe(values: pd.Series) -> Dict[str, Any]:
+    arr = values.dropna().to_numpy(dtype=float)
+    if arr.size == 0:
+        return {"count": 0}
+    pct = np.percentile(arr, PERCENTILES)
+    return {
+        "count": int(arr.size),
+        "mean": _num(arr.mean()),
+        "std": _num(arr.std(ddof=1)) if arr.size > 1 else 0.0,
+        "min": _num(arr.min()),
+        "max": _num(arr.max()),
+        "percentiles": {f"p{p}": _num(v) for p, v in zip(PERCENTILES, pct)},
+    }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# T O O L   F U N C T I O N S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+@function_tool()
+def grade_distribution(course_id: int, bin_width: int = 10) -> Dict[str, Any]:
+    """
+    Distribution of current course scores for all active students.
+
+    Args:
+        course_id (int): Canvas course ID.
+        bin_width (int): Width of histogram bins in percentage points (default 10).
+
+    Returns:
+        Dict[str, Any]: {
+            'count', 'mean', 'std', 'min', 'max',
+            'percentiles': {'p10', 'p25', 'p50', 'p75', 'p90'},
+            'histogram': {'0-10': n, ..., '90-100': n},
+            'ungraded': number of students with no current score
+        }
+    """
+    students = load_gradebook(course_id)["students"]
+    current = students["current_score"]
+    summary = _describe(current)
+
+    width = max(1, bin_width)
+    edges = np.arange(0, 100 + width, width, dtype=float)
+    counts, _ = np.histogram(current.dropna().clip(0, 100), bins=edges)
+    summary["histogram"] = {f"{int(lo)}-{int(hi)}": int(n)
+                            for lo, hi, n in zip(edges[:-1], edges[1:], counts)}
+    summary["ungraded"] = int(current.isna().sum())
+    return summary
+
+
+@function_tool()
+def assignment_statistics(
+    course_id: int, assignment_ids: Optional[List[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Per-assignment score statistics, hardest (lowest mean) first.
+
+    Args:
+        course_id (int): Canvas course ID.
+        assignment_ids (List[int], optional): Limit to these assignments.
+
+    Returns:
+        List[Dict[str, Any]]: One row per assignment with keys:
+            assignment_id, name, points_possible, graded, mean, median, std,
+            min, max (all percentages), submitted_rate, late_rate, missing_rate
+    """
+    frames = load_gradebook(course_id)
+    asgn, subs, scores = frames["assignments"], frames["subs"], frames["scores"]
+    if assignment_ids:
+        keep = [a for a in assignment_ids if a in asgn.index]
+        asgn, scores = asgn.loc[keep], scores[keep]
+        subs = subs[subs["assignment_id"].isin(keep)]
+
+    flags = subs.assign(submitted=subs["workflow_state"].isin(["submitted", "graded"]))
+    rates = flags.groupby("assignment_id")[["submitted", "late", "missing"]].mean()
+    table = pd.DataFrame({
+        "name": asgn["name"],
+        "points_possible": asgn["points_possible"],
+        "graded": scores.count(),
+        "mean": scores.mean(),
+        "median": scores.median(),
+        "std": scores.std(),
+        "min": scores.min(),
+        "max": scores.max(),
+    }).join(rates.rename(columns=lambda c: f"{c}_rate"))
+    table = table.sort_values("mean", na_position="last")
+
+    return [{"assignment_id": int(aid),
+             "name": row["name"],
+             "graded": int(row["graded"]),
+             **{k: _num(row[k]) for k in ("points_possible", "mean", "median", "std", "min",
+                                          "max", "submitted_rate", "late_rate", "missing_rate")}}
+            for aid, row in table.iterrows()]
+
+
+@function_tool()
+def student_zscores(
+    course_id: int, threshold: float = 1.5, limit: int = 15
+) -> Dict[str, Any]:
+    """
+    Students whose performance is unusually low or high relative to the class.
+
+    Each assignment is standardised (z-score per column), then averaged per
+    student, so harder assignments do not dominate.
+
+    Args:
+        course_id (int): Canvas course ID.
+        threshold (float): |z| at or above which a student is reported (default 1.5).
+        limit (int): Maximum students returned per side (default 15).
+
+    Returns:
+        Dict[str, Any]: {
+            'low':  [{'user_id', 'name', 'mean_z', 'current_score', 'graded'}...],
+            'high': [...same keys...],
+            'students': total students considered
+        }
+    """
+    frames = load_gradebook(course_id)
+    students, scores = frames["students"], frames["scores"]
+    std = scores.std(ddof=0).replace(0, np.nan)
+    z = (scores - scores.mean()) / std
+    table = pd.DataFrame({
+        "name": students["name"],
+        "current_score": students["current_score"],
+        "mean_z": z.mean(axis=1),
+        "graded": scores.count(axis=1),
+    }).dropna(subset=["mean_z"])
+
+    def rows(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        return [{"user_id": int(uid), "name": r["name"], "mean_z": _num(r["mean_z"]),
+                 "current_score": _num(r["current_score"]), "graded": int(r["graded"])}
+                for uid, r in frame.head(limit).iterrows()]
+
+    return {
+        "low": rows(table[table["mean_z"] <= -threshold].sort_values("mean_z")),
+        "high": rows(table[table["mean_z"] >= threshold].sort_values("mean_z", ascending=False)),
+        "students": int(len(table)),
+    }
+
+
+@function_tool()
+def assignment_correlations(course_id: int, top: int = 10) -> Dict[str, Any]:
+    """
+    How assignment scores relate to each other and to the overall course score.
+
+    Args:
+        course_id (int): Canvas course ID.
+        top (int): Number of most / least correlated assignment pairs to return.
+
+    Returns:
+        Dict[str, Any]: {
+            'with_course_score': [{'assignment_id', 'name', 'r'}...] (highest first),
+            'most_correlated_pairs':  [{'a', 'b', 'r'}...],
+            'least_correlated_pairs': [{'a', 'b', 'r'}...]
+        }
+    """
+    frames = load_gradebook(course_id)
+    asgn, scores, students = frames["assignments"], frames["scores"], frames["students"]
+    scores = scores.loc[:, scores.count() >= 3]
+
+    with_total = scores.corrwith(students["current_score"]).dropna().sort_values(ascending=False)
+    corr = scores.corr(min_periods=3).to_numpy()
+    ids = scores.columns.to_numpy()
+    upper = np.triu_indices_from(corr, k=1)
+    pairs = pd.DataFrame({"a": ids[upper[0]], "b": ids[upper[1]], "r": corr[upper]}).dropna()
+    pairs = pairs.sort_values("r", ascending=False)
+
+    def pair_rows(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        return [{"a": int(p.a), "b": int(p.b), "r": _num(p.r)} for p in frame.itertuples()]
+
+    return {
+        "with_course_score": [{"assignment_id": int(aid), "name": asgn.at[aid, "name"],
+                               "r": _num(r)} for aid, r in with_total.items()],
+        "most_correlated_pairs": pair_rows(pairs.head(top)),
+        "least_correlated_pairs": pair_rows(pairs.tail(top).iloc[::-1]),
+    }
+
+
+@function_tool()
+def missing_work_report(
+    course_id: int,
+    due_after: Optional[str] = None,
+    include_late: bool = True,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """
+    Who is missing what: missing and late work per student and per assignment.
+
+    Counts come from one load of the course's submissions (see `load_gradebook`)
+    and are computed in a single grouped pass; excused submissions never count.
+
+    Args:
+        course_id (int): Canvas course ID.
+        due_after (str, optional): ISO date; only assignments due on or after it
+            (e.g. the start of this week).
+        include_late (bool): Also count late submissions (default True).
+        limit (int): Maximum students and assignments returned (default 20).
+
+    Returns:
+        Dict[str, Any]: {
+            'students_considered', 'assignments_considered', 'total_missing',
+            'total_late', 'students_with_missing',
+            'students': [{'user_id', 'name', 'current_score', 'missing', 'late',
+                          'missing_assignment_ids'}...] (most missing first),
+            'assignments': [{'assignment_id', 'name', 'due_at', 'missing', 'late',
+                             'missing_rate', 'late_rate'}...] (most missing first)
+        }
+    """
+    frames = load_gradebook(course_id)
+    students, asgn, subs = frames["students"], frames["assignments"], frames["subs"]
+    if due_after:
+        due = pd.to_datetime(asgn["due_at"], utc=True, errors="coerce")
+        asgn = asgn[due >= pd.Timestamp(due_after, tz="UTC")]
+    subs = subs[subs["assignment_id"].isin(asgn.index) & ~subs["excused"]]
+    flags = subs[["user_id", "assignment_id", "missing", "late"]].copy()
+    if not include_late:
+        flags["late"] = False
+
+    per_student = flags.groupby("user_id")[["missing", "late"]].sum()
+    per_student = per_student.reindex(students.index, fill_value=0)
+    per_student = per_student.join(students[["name", "current_score"]])
+    per_student = per_student[(per_student["missing"] > 0) | (per_student["late"] > 0)]
+    per_student = per_student.sort_values(["missing", "late", "current_score"],
+                                          ascending=[False, False, True])
+    missing_ids = flags[flags["missing"]].groupby("user_id")["assignment_id"].agg(list)
+
+    per_assignment = flags.groupby("assignment_id")[["missing", "late"]].agg(["sum", "mean"])
+    per_assignment.columns = ["missing", "missing_rate", "late", "late_rate"]
+    per_assignment = per_assignment.join(asgn[["name", "due_at"]])
+    per_assignment = per_assignment[(per_assignment["missing"] > 0)
+                                    | (per_assignment["late"] > 0)]
+    per_assignment = per_assignment.sort_values(["missing", "late"], ascending=False)
+
+    return {
+        "students_considered": int(len(students)),
+        "assignments_considered": int(len(asgn)),
+        "total_missing": int(flags["missing"].sum()),
+        "total_late": int(flags["late"].sum()),
+        "students_with_missing": int((per_student["missing"] > 0).sum()),
+        "students": [{"user_id": int(uid), "name": r["name"],
+                      "current_score": _num(r["current_score"]),
+                      "missing": int(r["missing"]), "late": int(r["late"]),
+                      "missing_assignment_ids": [int(a) for a in missing_ids.get(uid, [])]}
+                     for uid, r in per_student.head(limit).iterrows()],
+        "assignments": [{"assignment_id": int(aid), "name": r["name"], "due_at": r["due_at"],
+                         "missing": int(r["missing"]), "late": int(r["late"]),
+                         "missing_rate": _num(r["missing_rate"]),
+                         "late_rate": _num(r["late_rate"])}
+                        for aid, r in per_assignment.head(limit).iterrows()],
+    }
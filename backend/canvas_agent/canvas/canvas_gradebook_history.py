@@ -4,52 +4,276 @@ Canvas Gradebook History API
 This module provides functions to interact with the Canvas Gradebook History API.
 https://canvas.instructure.com/doc/api/gradebook_history.html
 """
+from datetime import datetime
+from typing import Literal
+
 from canvas_agent.openai_tools import *
+from canvas_agent.course_mirror import CourseMirror, fresh_mirror
+from canvas_agent.grade_history import slim_event
+from canvas_agent.grade_timeline import course_zone, day_bounds, timeline_for
+from canvas_agent.roster import roster_for
 
 
-# not being used rly
 @function_tool()
-def get_grade_history_for_course(course_id: int) -> List[Dict[str, Any]]:
+def get_grade_history_for_course(
+    course_id: int,
+    user_id: Optional[int] = None,
+    assignment_id: Optional[int] = None,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
     """
-    Fetch the full grade change history for a specific course.
+    Fetch recent grade change history for a course, newest first.
 
-    This function queries the Canvas API to retrieve all recorded grade change 
-    events in a course's gradebook. Each event contains information such as 
-    who changed a grade, which student's grade was affected, what the old 
-    and new grades were, and when the change occurred.
+    This function reads the course's gradebook history feed (following pagination
+    only as far as needed) and returns slim grade-change events: who changed a
+    grade, which student's grade was affected, what the old and new grades were,
+    and when the change occurred.
 
     Args:
         course_id (int): The Canvas course ID to retrieve grade history from.
+        user_id (int, optional): Only changes to this student's grades.
+        assignment_id (int, optional): Only changes on this assignment.
+        limit (int): Maximum number of events to return (default 100).
 
     Returns:
         List[Dict[str, Any]]: A list of dictionaries, each representing a 
-        grade change event. Fields in each event may include:
-            - 'user_id': ID of the student whose grade was changed
-            - 'grader_id': ID of the person who changed the grade
-            - 'assignment_id': ID of the assignment whose grade changed
-            - 'grade_before' / 'grade_after': Old and new grades
+        grade change event, with keys:
+            - 'submission_id', 'assignment_id', 'assignment_name'
+            - 'user_id', 'user_name': the student whose grade changed
+            - 'grader_id', 'grader': who changed it
+            - 'previous_grade' / 'new_grade' / 'current_grade'
             - 'graded_at': Timestamp of when the grade change occurred
-            - Other metadata related to the grade change
 
     Raises:
-        Exception: If the API request fails (non-200 status code).
+        RuntimeError: If the API request fails.
 
     Note:
         - This will only return grade changes that are *recorded* by Canvas.
-        - If no grades were changed, the returned list will be empty.
+        - Served from the local course mirror when it is fresh.
+    """
+    mirror = fresh_mirror(course_id, "grade_events")
+    if mirror is not None:
+        return [slim_event({**e, "id": e["submission_id"]}) for e in mirror.grade_events(
+            course_id, user_id=user_id, assignment_id=assignment_id, limit=limit)]
+
+    params: Dict[str, Any] = {}
+    if user_id is not None:
+        params["user_id"] = user_id
+    if assignment_id is not None:
+        params["assignment_id"] = assignment_id
+    events = []
+    for event in canvas_paginate(f"courses/{course_id}/gradebook_history/feed", params=params):
+        events.append(slim_event(event))
+        if len(events) >= limit:
+            break
+    return events
+
+
+def _grading_days(mirror: CourseMirror, course_id: int) -> Dict[str, Dict[int, Dict[str, Any]]]:
+    """day -> grader_id -> {'id', 'name', 'assignments'} from the mirrored feed."""
+    zone = course_zone(course_id)
+    days: Dict[str, Dict[int, Dict[str, Any]]] = {}
+    for e in mirror.grade_events(course_id):
+        graded = datetime.fromisoformat(e["graded_at"].replace("Z", "+00:00"))
+        grader = days.setdefault(graded.astimezone(zone).date().isoformat(), {}).setdefault(
+            e["grader_id"], {"id": e["grader_id"], "name": e["grader"], "assignments": set()})
+        grader["assignments"].add(e["assignment_id"])
+    return days
+
+
+@function_tool()
+def list_grading_days(course_id: int, limit: int = 30) -> List[Dict[str, Any]]:
+    """
+    List the days on which grades were changed, with the graders active each day.
+
+    Args:
+        course_id (int): Canvas course ID.
+        limit (int): Maximum number of days to return, most recent first (default 30).
+
+    Returns:
+        List[Dict[str, Any]]: [{'date': 'YYYY-MM-DD',
+                                'graders': [{'id', 'name', 'assignments': [ids]}]}]
+    """
+    mirror = fresh_mirror(course_id, "grade_events")
+    if mirror is not None:
+        days = _grading_days(mirror, course_id)
+        return [{"date": day,
+                 "graders": [{**g, "assignments": sorted(g["assignments"])}
+                             for g in days[day].values()]}
+                for day in sorted(days, reverse=True)[:limit]]
+
+    out = []
+    for day in canvas_paginate(f"courses/{course_id}/gradebook_history/days"):
+        out.append(day)
+        if len(out) >= limit:
+            break
+    return out
+
+
+@function_tool()
+def get_grading_day(course_id: int, date: str) -> List[Dict[str, Any]]:
+    """
+    Graders who changed grades on one day and the assignments they touched.
+
+    Args:
+        course_id (int): Canvas course ID.
+        date (str): Day in 'YYYY-MM-DD' format.
+
+    Returns:
+        List[Dict[str, Any]]: [{'id': grader_id, 'name', 'assignments': [ids]}]
+    """
+    mirror = fresh_mirror(course_id, "grade_events")
+    if mirror is not None:
+        graders = _grading_days(mirror, course_id).get(date, {})
+        return [{**g, "assignments": sorted(g["assignments"])} for g in graders.values()]
+    return canvas_get(f"courses/{course_id}/gradebook_history/{date}")
+
+
+@function_tool()
+def get_grading_day_submissions(
+    course_id: int, date: str, grader_id: int, assignment_id: int
+) -> List[Dict[str, Any]]:
+    """
+    Grade changes one grader made on one assignment on one day.
+
+    Args:
+        course_id (int): Canvas course ID.
+        date (str): Day in 'YYYY-MM-DD' format.
+        grader_id (int): Grader's user ID.
+        assignment_id (int): Assignment ID.
+
+    Returns:
+        List[Dict[str, Any]]: Slim grade-change events (same keys as
+        get_grade_history_for_course), newest first.
+    """
+    mirror = fresh_mirror(course_id, "grade_events")
+    if mirror is not None:
+        since, until = day_bounds(date, course_zone(course_id))
+        return [slim_event({**e, "id": e["submission_id"]}) for e in mirror.grade_events(
+            course_id, assignment_id=assignment_id, grader_id=grader_id,
+            since=since, until=until)]
+
+    history = canvas_get(f"courses/{course_id}/gradebook_history/{date}"
+                         f"/graders/{grader_id}/assignments/{assignment_id}/submissions")
+    events = [slim_event(v) for sub in history for v in sub.get("versions", [])]
+    return sorted(events, key=lambda e: e["graded_at"] or "", reverse=True)
+
+
+@function_tool()
+def get_grade_timeline(course_id: int, user_id: int, assignment_id: int) -> Dict[str, Any]:
+    """
+    Every grade change for one student on one assignment, oldest first.
+
+    Args:
+        course_id (int): Canvas course ID.
+        user_id (int): Student's user ID.
+        assignment_id (int): Assignment ID.
+
+    Returns:
+        Dict[str, Any]: {'changes': n, 'current_grade',
+                         'timeline': [{'graded_at', 'previous_grade', 'new_grade',
+                                       'grader_id', 'grader'}]}
+    """
+    timeline = timeline_for(course_id).history(course_id, user_id, assignment_id)
+    return {
+        "changes": len(timeline),
+        "current_grade": timeline[-1]["new_grade"] if timeline else None,
+        "timeline": timeline,
+    }
+
+
+@function_tool()
+def get_grade_as_of(course_id: int, user_id: int, assignment_id: int, at: str) -> Dict[str, Any]:
+    """
+    What a student's grade on an assignment was at a point in time, e.g. just
+    before a regrade.
+
+    Args:
+        course_id (int): Canvas course ID.
+        user_id (int): Student's user ID.
+        assignment_id (int): Assignment ID.
+        at (str): ISO timestamp, or 'YYYY-MM-DD' for the end of that day.
+
+    Returns:
+        Dict[str, Any]: {'grade': grade in effect at `at` (None if not graded yet),
+                         'graded_at', 'grader_id', 'grader'}
+    """
+    event = timeline_for(course_id).grade_as_of(course_id, user_id, assignment_id, at)
+    if event is None:
+        return {"grade": None, "graded_at": None, "grader_id": None, "grader": None}
+    return {"grade": event["new_grade"], "graded_at": event["graded_at"],
+            "grader_id": event["grader_id"], "grader": event["grader"]}
+
+
+@function_tool()
+def get_top_graders(
+    course_id: int,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Graders ranked by how many grade changes they made in a time window.
+
+    Args:
+        course_id (int): Canvas course ID.
+        since (str, optional): Start, ISO timestamp or 'YYYY-MM-DD' (default: beginning).
+        until (str, optional): End, inclusive; a bare date covers the whole day.
+        limit (int): Maximum number of graders to return (default 5).
+
+    Returns:
+        List[Dict[str, Any]]: [{'grader_id', 'grader', 'changes', 'students', 'assignments'}]
+    """
+    return timeline_for(course_id).grader_counts(course_id, since, until)[:limit]
+
+
+@function_tool()
+def get_grading_activity(
+    course_id: int,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    bucket: Literal["day", "week"] = "day",
+    grader_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Grade changes per grader per day or week.
+
+    Args:
+        course_id (int): Canvas course ID.
+        since (str, optional): Start, ISO timestamp or 'YYYY-MM-DD'.
+        until (str, optional): End, inclusive; a bare date covers the whole day.
+        bucket (str): 'day' or 'week' (weeks start on Monday).
+        grader_id (int, optional): Only this grader.
+
+    Returns:
+        List[Dict[str, Any]]: [{'bucket', 'grader_id', 'grader', 'changes',
+                                'students', 'assignments'}], oldest bucket first.
     """
-    canvas = get_canvas()
+    return timeline_for(course_id).grader_counts(course_id, since, until, bucket, grader_id)
 
-    url = f"{CANVAS_API_URL}/api/v1/courses/{course_id}/gradebook_history/feed"
-    headers = {"Authorization": f"Bearer {CANVAS_API_TOKEN}"}
 
-    response = requests.get(url, headers=headers)
+@function_tool()
+def get_regrades(
+    course_id: int,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """
+    Grade changes that replaced an existing grade with a different one, newest first.
 
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching grade history: {response.status_code} - {response.text}")
+    Args:
+        course_id (int): Canvas course ID.
+        since (str, optional): Start, ISO timestamp or 'YYYY-MM-DD'.
+        until (str, optional): End, inclusive; a bare date covers the whole day.
+        limit (int): Maximum number of regrades to return (default 20).
 
-    return response.json()
+    Returns:
+        List[Dict[str, Any]]: [{'graded_at', 'user_id', 'user_name', 'assignment_id',
+                                'assignment_name', 'previous_grade', 'new_grade',
+                                'grader_id', 'grader'}]
+    """
+    return timeline_for(course_id).regrades(course_id, since, until, limit)
 
 
 @function_tool()
@@ -60,7 +284,8 @@ def get_student_grades(course_id: int) -> List[Dict[str, Any]]:
     This function queries the Canvas API to get a list of all active student enrollments 
     in a course, along with each student's current grade and score. 
     It organizes the returned data into a clean, structured format, including 
-    the student's name, user ID, and grade details.
+    the student's name and section (from the course roster index), user ID,
+    and grade details.
 
     Args:
         course_id (int): The Canvas course ID from which to fetch student grades.
@@ -68,52 +293,50 @@ def get_student_grades(course_id: int) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: A list of dictionaries, one per student, each containing:
             - 'user_id': The Canvas user ID of the student
-            - 'user': A dictionary with:
-                - 'id': User ID (redundant but available)
-                - 'name': Full name of the student
+            - 'user_name': Full name of the student
+            - 'sortable_name': "Last, First"
+            - 'section': Section name
             - 'grades': A dictionary with:
                 - 'current_grade': The student's current letter grade (e.g., "B+")
                 - 'current_score': The student's current percentage score (e.g., 88.5)
 
     Raises:
-        Exception: If the API request fails (non-200 status code).
+        RuntimeError: If the API request fails.
 
     Note:
         - Only active enrollments (not dropped or inactive students) are included.
         - If a student does not have a grade yet, 'current_grade' and 'current_score' may be null.
+        - Served from the local course mirror when it is fresh.
     """
-    canvas = get_canvas()
+    mirror = fresh_mirror(course_id, "enrollments")
+    if mirror is not None:
+        enrollments = mirror.enrollments(course_id)
+    else:
+        # Direct API request to include grades
+        enrollments = canvas_paginate(
+            f"courses/{course_id}/enrollments",
+            params={
+                "type[]": "StudentEnrollment",
+                "state[]": "active",
+                "include[]": "grades",
+            },
+        )
 
-    # Direct API request to include grades
-    url = f"{CANVAS_API_URL}/api/v1/courses/{course_id}/enrollments"
-    headers = {"Authorization": f"Bearer {CANVAS_API_TOKEN}"}
-    params = {
-        "type[]": "StudentEnrollment",
-        "state[]": "active",
-        "include[]": "grades"
-    }
-
-    response = requests.get(url, headers=headers, params=params)
-
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching enrollments: {response.status_code} - {response.text}")
-
-    enrollments = response.json()
+    enrollments = list(enrollments)
+    roster = roster_for(course_id)
+    people = roster.resolve(e["user_id"] for e in enrollments)
 
     # Process and format the enrollment data
     formatted_enrollments = []
     for enrollment in enrollments:
-        # Extract relevant user information
-        user_info = {
-            "id": enrollment["user"]["id"],
-            "name": enrollment["user"]["name"],
-        }
+        person = people.get(enrollment["user_id"]) or {}
         # Extract grade information
         grades = enrollment.get("grades", {})
         formatted_enrollment = {
             "user_id": enrollment["user_id"],
-            "user": user_info,
+            "user_name": person.get("name") or (enrollment.get("user") or {}).get("name"),
+            "sortable_name": person.get("sortable_name"),
+            "section": roster.sections.get(enrollment.get("course_section_id")),
             "grades": {
                 "current_grade": grades.get("current_grade"),
                 "current_score": grades.get("current_score"),
@@ -5,28 +5,235 @@ This module provides functions to interact with the Canvas Groups API.
 https://canvas.instructure.com/doc/api/groups.html
 
 It includes functionality to:
-- List groups in a context (course/account)
+- List groups in a context (course/account), with their members
 - Get a single group
 - Create a group
 - List group users
-- Manage group memberships
+- Manage group memberships (one user, or many concurrently)
+- Read a group's activity stream
 """
-import requests
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
-from dotenv import load_dotenv
-from canvasapi import Canvas
-from agents import function_tool
-
-# Load environment variables
-load_dotenv()
-CANVAS_API_URL = os.getenv(
-    'CANVAS_API_URL''https://canvas.instructure.com/api/v1')
-CANVAS_API_TOKEN = os.getenv('canvas_token')
-
-
-def get_canvas():
-    """Get a Canvas API client instance."""
-    if not CANVAS_API_TOKEN:
-        raise ValueError("Canvas API token not found in environment variables")
-    return Canvas(CANVAS_API_URL, CANVAS_API_TOKEN)
+from typing import Any, Dict, List, Literal, Optional
+
+from canvas_agent.html_text import html_to_text
+from canvas_agent.openai_tools import (
+    DEFAULT_COURSE_ID,
+    canvas_get,
+    canvas_map,
+    canvas_paginate,
+    canvas_request,
+    function_tool,
+)
+
+# Group set new course groups go into when no group_category_id is given
+# (the one Canvas itself uses for student-organized groups).
+DEFAULT_CATEGORY = "Student Groups"
+
+_GROUP_FIELDS = ("id", "name", "description", "join_level", "members_count",
+                 "group_category_id", "context_type", "course_id", "account_id")
+_CONTEXTS = {"course": "courses", "account": "accounts"}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# H E L P E R S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def _group(group: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: group.get(k) for k in _GROUP_FIELDS if k in group}
+
+
+def _member(user: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": user["id"], "name": user.get("name"),
+            "sortable_name": user.get("sortable_name")}
+
+
+def group_members(group_id: int) -> List[Dict[str, Any]]:
+    """Every user in the group (`{'id', 'name', 'sortable_name'}`)."""
+    return [_member(u) for u in canvas_paginate(f"groups/{group_id}/users")]
+
+
+def _category_for(context_type: str, context_id: int) -> int:
+    """Id of the context's DEFAULT_CATEGORY group set, created on first use."""
+    path = f"{_CONTEXTS[context_type]}/{context_id}/group_categories"
+    for category in canvas_paginate(path):
+        if category.get("name") == DEFAULT_CATEGORY:
+            return category["id"]
+    return canvas_request("POST", path, json={"name": DEFAULT_CATEGORY}).json()["id"]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# T O O L S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+@function_tool()
+def list_groups_in_context(
+    context_type: Literal["course", "account"] = "course",
+    context_id: int = DEFAULT_COURSE_ID,
+    include_members: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    List the groups of a course or account, with their members.
+
+    Memberships of all groups are fetched concurrently, so listing 40 project
+    groups costs about as long as listing one.
+
+    Args:
+        context_type (str): "course" or "account".
+        context_id (int): Course or account ID.
+        include_members (bool): Also return each group's members.
+
+    Returns:
+        List[Dict[str, Any]]: [{'id', 'name', 'description', 'join_level',
+        'members_count', 'group_category_id', 'members': [{'id', 'name',
+        'sortable_name'}]}]
+    """
+    groups = [_group(g) for g in
+              canvas_paginate(f"{_CONTEXTS[context_type]}/{context_id}/groups")]
+    if include_members:
+        for group, members in zip(groups, canvas_map(group_members,
+                                                     [g["id"] for g in groups])):
+            group["members"] = members
+            group["members_count"] = len(members)
+    return groups
+
+
+@function_tool()
+def get_group(group_id: int) -> Dict[str, Any]:
+    """
+    Get a single group.
+
+    Args:
+        group_id (int): Canvas group ID.
+
+    Returns:
+        Dict[str, Any]: {'id', 'name', 'description', 'join_level', 'members_count',
+        'group_category_id', 'context_type', 'course_id' or 'account_id'}
+    """
+    return _group(canvas_get(f"groups/{group_id}"))
+
+
+@function_tool()
+def create_group(
+    name: str,
+    context_type: Literal["course", "account"] = "course",
+    context_id: int = DEFAULT_COURSE_ID,
+    description: Optional[str] = None,
+    join_level: Literal["invitation_only", "parent_context_auto_join",
+                        "parent_context_request"] = "invitation_only",
+    group_category_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Create a group in a course or account.
+
+    Args:
+        name (str): Group name.
+        context_type (str): "course" or "account".
+        context_id (int): Course or account ID.
+        description (str, optional): Group description.
+        join_level (str): Who may join without an invitation.
+        group_category_id (int, optional): Group set to create the group in
+            (default: the context's "Student Groups" set, created if missing).
+
+    Returns:
+        Dict[str, Any]: The new group, as returned by `get_group`.
+    """
+    if group_category_id is None:
+        group_category_id = _category_for(context_type, context_id)
+    body = {"name": name, "join_level": join_level}
+    if description is not None:
+        body["description"] = description
+    return _group(canvas_request("POST", f"group_categories/{group_category_id}/groups",
+                                 json=body).json())
+
+
+@function_tool()
+def list_group_users(group_id: int) -> List[Dict[str, Any]]:
+    """
+    List the users in a group.
+
+    Args:
+        group_id (int): Canvas group ID.
+
+    Returns:
+        List[Dict[str, Any]]: [{'id', 'name', 'sortable_name'}]
+    """
+    return group_members(group_id)
+
+
+@function_tool()
+def add_user_to_group(group_id: int, user_id: int) -> Dict[str, Any]:
+    """
+    Add one user to a group.
+
+    Args:
+        group_id (int): Canvas group ID.
+        user_id (int): Canvas user ID.
+
+    Returns:
+        Dict[str, Any]: The membership: {'id', 'group_id', 'user_id', 'workflow_state'}
+    """
+    membership = canvas_request("POST", f"groups/{group_id}/memberships",
+                                json={"user_id": user_id}).json()
+    return {k: membership.get(k) for k in ("id", "group_id", "user_id", "workflow_state")}
+
+
+@function_tool()
+def add_users_to_group(group_id: int, user_ids: List[int]) -> Dict[str, Any]:
+    """
+    Add many users to a group at once.
+
+    One membership is created per new user, concurrently; existing members
+    (and anyone who joins meanwhile) are never touched.
+
+    Args:
+        group_id (int): Canvas group ID.
+        user_ids (List[int]): Canvas user IDs to add.
+
+    Returns:
+        Dict[str, Any]: {'group_id', 'added': [ids], 'already_members': [ids],
+        'not_added': [{'user_id', 'error'}], 'members_count'}
+    """
+    current = {m["id"] for m in group_members(group_id)}
+    wanted = list(dict.fromkeys(int(u) for u in user_ids))
+    new = [u for u in wanted if u not in current]
+
+    def join(user_id: int) -> Optional[str]:
+        try:
+            canvas_request("POST", f"groups/{group_id}/memberships", json={"user_id": user_id})
+        except RuntimeError as exc:
+            return str(exc)
+        return None
+
+    errors = dict(zip(new, canvas_map(join, new)))
+    added = [u for u in new if errors[u] is None]
+    return {
+        "group_id": group_id,
+        "added": added,
+        "already_members": [u for u in wanted if u in current],
+        "not_added": [{"user_id": u, "error": e} for u, e in errors.items() if e is not None],
+        "members_count": len(current) + len(added),
+    }
+
+
+@function_tool()
+def get_group_activity_stream(group_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Recent activity (discussions, announcements, messages) in a group.
+
+    Args:
+        group_id (int): Canvas group ID.
+        limit (int): Maximum number of items.
+
+    Returns:
+        List[Dict[str, Any]]: [{'id', 'type', 'title', 'created_at', 'updated_at',
+        'message' (plain text, first 500 characters)}]
+    """
+    items = []
+    for item in canvas_paginate(f"groups/{group_id}/activity_stream"):
+        items.append({"id": item.get("id"), "type": item.get("type"),
+                      "title": item.get("title"), "created_at": item.get("created_at"),
+                      "updated_at": item.get("updated_at"),
+                      "message": html_to_text(item.get("message"))[:500]})
+        if len(items) >= limit:
+            break
+    return items
@@ -22,4 +22,194 @@ Module Assignment
 Overrides	
 List a module's overrides
 Update a module's overrides
-"""
\ No newline at end of file
+"""
+import os
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel
+
+from canvas_agent.canvas_cache import DiskCache
+from canvas_agent.openai_tools import (
+    function_tool,
+    canvas_map,
+    canvas_paginate,
+    canvas_request,
+)
+
+# Modules also change outside the agent, so cached trees expire after this many seconds.
+MODULE_TREE_TTL = float(os.getenv("CANVAS_MODULE_TREE_TTL", "300"))
+
+_tree_cache = DiskCache("module_trees")
+
+
+class ModuleUpdate(BaseModel):
+    """Fields to change on a module."""
+
+    name: Optional[str] = None
+    position: Optional[int] = None
+    unlock_at: Optional[str] = None
+    published: Optional[bool] = None
+    require_sequential_progress: Optional[bool] = None
+
+    model_config = {"extra": "forbid"}
+
+
+class ModuleItemCreate(BaseModel):
+    """A new module item.  `content_id` is required for File, Discussion, Assignment and Quiz."""
+
+    type: Literal["File", "Page", "Discussion", "Assignment", "Quiz",
+                  "SubHeader", "ExternalUrl", "ExternalTool"]
+    title: Optional[str] = None
+    content_id: Optional[int] = None
+    page_url: Optional[str] = None  # Page items
+    external_url: Optional[str] = None  # ExternalUrl / ExternalTool items
+    position: Optional[int] = None
+    indent: Optional[int] = None
+    new_tab: Optional[bool] = None
+
+    model_config = {"extra": "forbid"}
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# H E L P E R S
+# ────────────────────────────────────────────────────────────────────────────────
+
+_ITEM_FIELDS = ("id", "title", "type", "position", "indent", "content_id", "page_url",
+                "external_url")
+_DETAIL_FIELDS = ("due_at", "points_possible", "unlock_at", "lock_at", "locked_for_user")
+_MODULE_FIELDS = ("id", "name", "position", "unlock_at", "require_sequential_progress",
+                  "prerequisite_module_ids", "state")
+
+
+def _compact_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    row = {k: item[k] for k in _ITEM_FIELDS if item.get(k) not in (None, "", 0)}
+    details = item.get("content_details") or {}
+    row.update({k: details[k] for k in _DETAIL_FIELDS if details.get(k) not in (None, False)})
+    if item.get("published") is False:
+        row["published"] = False
+    return row
+
+
+def _compact_module(module: Dict[str, Any],
+                    items: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    row = {k: module[k] for k in _MODULE_FIELDS if module.get(k) not in (None, [], False)}
+    row["published"] = module.get("published")
+    if items is not None:
+        row["items"] = [_compact_item(i) for i in items]
+    return row
+
+
+def invalidate_module_tree(course_id: int) -> None:
+    """Forget the cached tree after a module write."""
+    _tree_cache.delete(str(course_id))
+
+
+def fetch_module_tree(course_id: int, refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Every module of the course with its items, from one paginated listing.
+
+    Canvas leaves `items` out of the listing when a course has very many; those
+    modules' items are then fetched concurrently.  The tree is cached per
+    course until a module write or `MODULE_TREE_TTL`.
+    """
+    key = str(course_id)
+    tree = None if refresh else _tree_cache.get(key, max_age=MODULE_TREE_TTL)
+    if tree is not None:
+        return tree
+    include = {"include[]": ["items", "content_details"]}
+    modules = list(canvas_paginate(f"courses/{course_id}/modules", params=include))
+    missing = [m for m in modules if "items" not in m]
+    fetched = canvas_map(
+        lambda m: list(canvas_paginate(f"courses/{course_id}/modules/{m['id']}/items",
+                                       params={"include[]": ["content_details"]})),
+        missing)
+    items = {m["id"]: m["items"] for m in modules if "items" in m}
+    items.update({m["id"]: rows for m, rows in zip(missing, fetched)})
+    tree = [_compact_module(m, items[m["id"]]) for m in modules]
+    _tree_cache.put(key, tree)
+    return tree
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# T O O L   F U N C T I O N S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+@function_tool()
+def get_module_tree(
+    course_id: int,
+    search: Optional[str] = None,
+    module_id: Optional[int] = None,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    The course structure: every module with its items, in one compact result.
+
+    Args:
+        course_id (int): Course ID.
+        search (str, optional): Keep modules whose name, or any item title, contains
+            this text (case-insensitive), e.g. "week 5".  Matching items are kept
+            with their whole module.
+        module_id (int, optional): Only this module.
+        refresh (bool): Re-read Canvas instead of using the cached tree.
+
+    Returns:
+        Dict[str, Any]: {'course_id', 'module_count', 'item_count',
+            'modules': [{'id', 'name', 'position', 'unlock_at', 'published',
+                         'prerequisite_module_ids',
+                         'items': [{'id', 'title', 'type', 'position', 'indent',
+                                    'content_id' / 'page_url' / 'external_url',
+                                    'due_at', 'points_possible', ...}]}]}
+        Empty fields are left out; items carry 'published': False only when unpublished.
+    """
+    tree = fetch_module_tree(course_id, refresh)
+    if module_id is not None:
+        tree = [m for m in tree if m["id"] == module_id]
+    if search:
+        needle = search.lower()
+        tree = [m for m in tree if needle in m["name"].lower()
+                or any(needle in (i.get("title") or "").lower() for i in m["items"])]
+    return {
+        "course_id": course_id,
+        "module_count": len(tree),
+        "item_count": sum(len(m["items"]) for m in tree),
+        "modules": tree,
+    }
+
+
+@function_tool()
+def update_module(course_id: int, module_id: int, module: ModuleUpdate) -> Dict[str, Any]:
+    """
+    Rename, move, publish/unpublish or reschedule a module.
+
+    Args:
+        course_id (int): Course ID.
+        module_id (int): Module ID.
+        module (ModuleUpdate): Fields to change.
+
+    Returns:
+        Dict[str, Any]: The updated module (id, name, position, unlock_at, published).
+    """
+    resp = canvas_request("PUT", f"courses/{course_id}/modules/{module_id}",
+                          json={"module": module.model_dump(exclude_none=True)})
+    invalidate_module_tree(course_id)
+    return _compact_module(resp.json())
+
+
+@function_tool()
+def create_module_item(course_id: int, module_id: int, item: ModuleItemCreate) -> Dict[str, Any]:
+    """
+    Add an item (assignment, quiz, page, file, link, header...) to a module.
+
+    Args:
+        course_id (int): Course ID.
+        module_id (int): Module ID.
+        item (ModuleItemCreate): The item to add.
+
+    Returns:
+        Dict[str, Any]: The new item (id, title, type, position, ...).
+    """
+    resp = canvas_request("POST", f"courses/{course_id}/modules/{module_id}/items",
+                          json={"module_item": item.model_dump(exclude_none=True)})
+    invalidate_module_tree(course_id)
+    return _compact_item(resp.json())
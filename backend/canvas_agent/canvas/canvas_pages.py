@@ -10,4 +10,131 @@ Delete page**
 List revisions
 Show revision**
 Revert to revision*
-"""
\ No newline at end of file
+"""
+import os
+from typing import Any, Dict, List, Optional
+
+from canvas_agent.canvas_cache import DiskCache
+from canvas_agent.html_text import html_to_text
+from canvas_agent.openai_tools import (
+    function_tool,
+    canvas_get,
+    canvas_map,
+    canvas_paginate,
+)
+
+# How long the page listing (titles + updated_at) is trusted before re-listing.
+PAGE_LIST_TTL = float(os.getenv("CANVAS_PAGE_LIST_TTL", "300"))
+
+_list_cache = DiskCache("page_lists")
+# "<course>:<page_id>" -> {'updated_at', 'text'}; replaced when the page's updated_at moves.
+_text_cache = DiskCache("page_text")
+
+_SUMMARY_FIELDS = ("page_id", "url", "title", "updated_at", "published", "front_page")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# H E L P E R S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def list_pages(course_id: int, refresh: bool = False) -> List[Dict[str, Any]]:
+    """Title, url and updated_at of every page in the course (cached for `PAGE_LIST_TTL`)."""
+    key = str(course_id)
+    pages = None if refresh else _list_cache.get(key, max_age=PAGE_LIST_TTL)
+    if pages is None:
+        pages = [{k: p.get(k) for k in _SUMMARY_FIELDS}
+                 for p in canvas_paginate(f"courses/{course_id}/pages", params={"sort": "title"})]
+        _list_cache.put(key, pages)
+    return pages
+
+
+def invalidate_page_list(course_id: int) -> None:
+    """Forget the cached page listing (page texts are keyed by `updated_at` and stay)."""
+    _list_cache.delete(str(course_id))
+
+
+def page_texts(course_id: int, pages: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Plain text of each page, by url.
+
+    Only pages whose `updated_at` differs from the cached copy are fetched
+    (concurrently) and converted; everything else comes from the cache.
+    """
+    texts, stale = {}, []
+    for page in pages:
+        cached = _text_cache.get(f"{course_id}:{page['page_id']}")
+        if cached and cached["updated_at"] == page["updated_at"]:
+            texts[page["url"]] = cached["text"]
+        else:
+            stale.append(page)
+
+    def fetch(page: Dict[str, Any]) -> str:
+        full = canvas_get(f"courses/{course_id}/pages/{page['url']}")
+        text = html_to_text(full.get("body"))
+        _text_cache.put(f"{course_id}:{page['page_id']}",
+                        {"updated_at": full.get("updated_at") or page["updated_at"], "text": text},
+                        permanent=True)
+        return text
+
+    for page, text in zip(stale, canvas_map(fetch, stale)):
+        texts[page["url"]] = text
+    return texts
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# T O O L   F U N C T I O N S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+@function_tool()
+def get_course_pages(
+    course_id: int,
+    search: Optional[str] = None,
+    urls: Optional[List[str]] = None,
+    include_text: bool = True,
+    max_chars: int = 4000,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Read the course's pages (syllabus, policies, resources...) as plain text.
+
+    Page bodies are converted from HTML once and cached until the page changes,
+    so repeated questions about course policy cost no extra Canvas calls.
+
+    Args:
+        course_id (int): Course ID.
+        search (str, optional): Keep pages whose title or text contains this
+            (case-insensitive), e.g. "late".
+        urls (List[str], optional): Only these pages (page url slugs, e.g. "syllabus").
+        include_text (bool): Include page text (default True).  False returns just the index.
+        max_chars (int): Truncate each page's text to this many characters (default 4000).
+        refresh (bool): Re-list the pages now instead of trusting the recent listing.
+
+    Returns:
+        Dict[str, Any]: {'course_id', 'count',
+            'pages': [{'title', 'url', 'updated_at', 'published', 'front_page',
+                       'chars', 'text', 'truncated'}]}
+    """
+    pages = list_pages(course_id, refresh)
+    if urls:
+        wanted = set(urls)
+        pages = [p for p in pages if p["url"] in wanted]
+    needle = (search or "").lower()
+    texts: Dict[str, str] = {}
+    if include_text or needle:
+        texts = page_texts(course_id, pages)
+    if needle:
+        pages = [p for p in pages
+                 if needle in (p["title"] or "").lower() or needle in texts[p["url"]].lower()]
+
+    rows = []
+    for page in pages:
+        row = {k: page[k] for k in ("title", "url", "updated_at", "published", "front_page")}
+        if page["url"] in texts:
+            text = texts[page["url"]]
+            row["chars"] = len(text)
+            if include_text:
+                row["text"] = text[:max_chars]
+                row["truncated"] = len(text) > max_chars
+        rows.append(row)
+    return {"course_id": course_id, "count": len(rows), "pages": rows}
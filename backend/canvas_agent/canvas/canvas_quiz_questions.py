@@ -1,14 +1,30 @@
 from __future__ import annotations
+import csv
+import os
+import zipfile
 from typing import List, Literal, Dict, Any
+from xml.etree import ElementTree as ET
 from pydantic import BaseModel, Field
 from canvas_agent.openai_tools import (
     function_tool,
     get_canvas,
     CANVAS_API_URL,
     CANVAS_API_TOKEN,
+    canvas_map,
+    canvas_paginate,
+    canvas_request,
+    path_within,
 )
-from typing import List, Optional, Literal, Dict, Any
+from canvas_agent.projection import Detail, fields_error, select_fields, project
+from canvas_agent.question_bank import CHOICE_TYPES, EXTENSIONS, load_question_bank
+from canvas_agent.canvas.canvas_quizzes import reorder_items
+from typing import List, Optional, Literal, Dict, Any, Tuple
+from pydantic import ValidationError
 import requests
+import time
+
+# The only directory `import_quiz_questions` may read question banks from.
+IMPORT_DIR = os.getenv("CANVAS_IMPORT_DIR", "imports")
 
 # ───────────────────────────────────────────────────────────────────────────────
 # P Y D A N T I C   M O D E L S (all forbid extras)
@@ -79,12 +95,162 @@ class QuizQuestionUpdate(BaseModel):
 QuizQuestionUpdate.model_rebuild()
 
 
-@function_tool()
+class QuizGroupCreate(BaseModel):
+    """A question group: Canvas shows `pick_count` random questions from it."""
+    name: str
+    pick_count: Optional[int] = None
+    question_points: Optional[float] = None
+
+
+class BulkQuizQuestion(QuizQuestionCreate):
+    """A question for bulk import; `group` names a group to place it in."""
+    points_possible: Optional[float] = None
+    group: Optional[str] = None
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# B U L K   I M P O R T
+# ───────────────────────────────────────────────────────────────────────────────
+
+
+def _validate(questions: List[BulkQuizQuestion], groups: List[QuizGroupCreate]) -> List[str]:
+    """Every problem with the batch, so nothing is created from a bad bank."""
+    errors = []
+    members: Dict[str, int] = {}
+    for i, q in enumerate(questions, start=1):
+        label = f"question {i}"
+        answers = q.answers or []
+        correct = sum(1 for a in answers if a.weight)
+        if not q.question_text.strip() and q.question_type != "text_only_question":
+            errors.append(f"{label}: question_text is empty")
+        if q.question_type in CHOICE_TYPES:
+            if len(answers) < 2:
+                errors.append(f"{label}: needs at least two answers")
+            if correct == 0:
+                errors.append(f"{label}: no answer is marked correct")
+            if correct > 1 and q.question_type != "multiple_answers_question":
+                errors.append(f"{label}: {correct} correct answers on a single-answer question")
+        if q.question_type == "true_false_question" and len(answers) != 2:
+            errors.append(f"{label}: true/false needs exactly two answers")
+        if q.question_type == "short_answer_question" and not answers:
+            errors.append(f"{label}: short answer needs at least one accepted answer")
+        if q.points_possible is not None and q.points_possible < 0:
+            errors.append(f"{label}: negative points_possible")
+        if q.group and q.quiz_group_id:
+            errors.append(f"{label}: give either group or quiz_group_id, not both")
+        if q.group:
+            members[q.group] = members.get(q.group, 0) + 1
+    for g in groups:
+        if g.pick_count is not None and not 1 <= g.pick_count <= members.get(g.name, 0):
+            errors.append(f"group {g.name!r}: pick_count {g.pick_count} but "
+                          f"{members.get(g.name, 0)} questions")
+    return errors
+
+
+def _current_order(course_id: int, quiz_id: int) -> List[Dict[str, Any]]:
+    """Order items for the quiz's existing questions, groups collapsed to one item."""
+    order, seen = [], set()
+    existing = sorted(canvas_paginate(f"courses/{course_id}/quizzes/{quiz_id}/questions"),
+                      key=lambda q: q.get("position") or 0)
+    for q in existing:
+        item = ({"id": q["quiz_group_id"], "type": "group"} if q.get("quiz_group_id")
+                else {"id": q["id"], "type": "question"})
+        if (item["type"], item["id"]) not in seen:
+            seen.add((item["type"], item["id"]))
+            order.append(item)
+    return order
+
+
+def bulk_import_questions(
+    course_id: int,
+    quiz_id: int,
+    questions: List[BulkQuizQuestion],
+    groups: List[QuizGroupCreate],
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Validate, then create groups and questions concurrently and reorder once.
+
+    Groups referenced by name but not listed are created with Canvas defaults.
+    New items are appended after the quiz's existing questions, in input order.
+    A group Canvas rejects is reported in `failed_groups` and its questions are
+    skipped (listed in `failed`), so nothing lands outside its intended group.
+    """
+    started = time.time()
+    groups = list(groups)
+    known = {g.name for g in groups}
+    for q in questions:
+        if q.group and q.group not in known:
+            groups.append(QuizGroupCreate(name=q.group))
+            known.add(q.group)
+
+    errors = _validate(questions, groups)
+    if errors or dry_run:
+        return {"created": 0, "questions": len(questions), "groups": len(groups),
+                "errors": errors, "dry_run": dry_run}
+
+    order = _current_order(course_id, quiz_id)
+
+    def create_group(group: QuizGroupCreate) -> Tuple[Optional[int], Optional[str]]:
+        try:
+            resp = canvas_request("POST", f"courses/{course_id}/quizzes/{quiz_id}/groups",
+                                  json={"quiz_groups": [group.model_dump(exclude_none=True)]})
+        except RuntimeError as exc:
+            return None, str(exc)
+        return resp.json()["quiz_groups"][0]["id"], None
+
+    group_results = dict(zip([g.name for g in groups], canvas_map(create_group, groups)))
+    group_ids = {name: gid for name, (gid, _) in group_results.items() if gid is not None}
+
+    def create_question(q: BulkQuizQuestion) -> Tuple[Optional[int], Optional[str]]:
+        if q.group and q.group not in group_ids:
+            return None, f"group {q.group!r} was not created"
+        fields = q.model_dump(exclude_none=True, exclude={"group", "position"})
+        if q.group:
+            fields["quiz_group_id"] = group_ids[q.group]
+        try:
+            resp = canvas_request("POST", f"courses/{course_id}/quizzes/{quiz_id}/questions",
+                                  json={"question": fields})
+        except RuntimeError as exc:
+            return None, str(exc)
+        return resp.json()["id"], None
+
+    results = canvas_map(create_question, questions)
+
+    placed = set()
+    for q, (question_id, _) in zip(questions, results):
+        if question_id is None:
+            continue
+        if q.group or q.quiz_group_id:
+            gid = group_ids[q.group] if q.group else q.quiz_group_id
+            if gid not in placed:
+                placed.add(gid)
+                order.append({"id": gid, "type": "group"})
+        else:
+            order.append({"id": question_id, "type": "question"})
+    reorder_items(course_id, quiz_id, order)
+
+    return {
+        "created": sum(1 for qid, _ in results if qid is not None),
+        "question_ids": [qid for qid, _ in results],
+        "groups": group_ids,
+        "failed": [{"index": i, "question_name": q.question_name, "error": err}
+                   for i, (q, (_, err)) in enumerate(zip(questions, results), start=1) if err],
+        "failed_groups": [{"name": name, "error": err}
+                          for name, (_, err) in group_results.items() if err],
+        "errors": [],
+        "seconds": round(time.time() - started, 2),
+    }
+
+
+@function_tool(failure_error_function=fields_error)
 def list_quiz_questions(
     course_id: int,
     quiz_id: int,
     quiz_submission_id: int,
     quiz_submission_attempt: int,
+    detail: Detail = "standard",
+    fields: Optional[List[str]] = None,
 ) -> List[Dict[str, Any]]:
     """
     List questions for a quiz or a specific submission.
@@ -94,29 +260,25 @@ def list_quiz_questions(
         quiz_id (int): The ID of the quiz.
         quiz_submission_id (int): ID of the quiz submission. Pass 0 to skip.
         quiz_submission_attempt (int): Attempt number for the submission. Pass 0 to skip.
+        detail (str): "minimal" (no text/answers), "standard" (default; answers
+            trimmed to id/text/weight) or "full" (feedback comments and full answers).
+        fields (List[str], optional): Explicit fields to return; overrides `detail`.
 
     Returns:
         List[dict]: List of slim quiz question objects.
     """
-    canvas = get_canvas()
-    url = f"{CANVAS_API_URL}/api/v1/courses/{course_id}/quizzes/{quiz_id}/questions"
-    headers = {"Authorization": f"Bearer {CANVAS_API_TOKEN}"}
-
     params = {}
     if quiz_submission_id != 0:
         params["quiz_submission_id"] = quiz_submission_id
     if quiz_submission_attempt != 0:
         params["quiz_submission_attempt"] = quiz_submission_attempt
 
-    response = requests.get(url, headers=headers, params=params)
-
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching quiz questions: {response.status_code} - {response.text}"
-        )
-
-    questions = response.json()
-    return questions
+    keep = select_fields("quiz_question", detail, fields)
+    return [
+        project(q, "quiz_question", keep, detail)
+        for q in canvas_paginate(
+            f"courses/{course_id}/quizzes/{quiz_id}/questions", params=params)
+    ]
 
 
 @function_tool()
@@ -259,3 +421,71 @@ def delete_quiz_question(
         "id": question_id,
         "deleted": True
     }
+
+
+@function_tool()
+def import_quiz_questions(
+    course_id: int,
+    quiz_id: int,
+    questions: Optional[List[BulkQuizQuestion]] = None,
+    groups: Optional[List[QuizGroupCreate]] = None,
+    source_path: Optional[str] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Add many questions (and question groups) to a quiz in one call.
+
+    Everything is validated before anything is created.  Questions are then
+    created concurrently and the quiz is reordered once at the end, with the new
+    items after the existing ones in the order given.
+
+    Args:
+        course_id (int): Course ID.
+        quiz_id (int): Quiz ID.
+        questions (List[BulkQuizQuestion], optional): Questions to add; set
+            `group` to a group name to place a question in that group.
+        groups (List[QuizGroupCreate], optional): Groups with pick_count /
+            question_points.  Groups only referenced by name are created too.
+        source_path (str, optional): A question bank file in the import directory
+            (CANVAS_IMPORT_DIR, relative to it) to import as well: Markdown (.md),
+            CSV (.csv) or QTI (.xml / .zip).
+        dry_run (bool): Only parse and validate; create nothing.
+
+    Returns:
+        Dict[str, Any]: {'created', 'question_ids', 'groups': {name: id},
+                         'failed': [{'index', 'question_name', 'error'}],
+                         'failed_groups': [{'name', 'error'}] (their questions are skipped),
+                         'errors': validation errors (nothing created if any),
+                         'seconds'}
+    """
+    questions = list(questions or [])
+    groups = list(groups or [])
+    errors: List[str] = []
+    if source_path:
+        # Errors name the file and question number only: never echo its content.
+        path = path_within(IMPORT_DIR, source_path)
+        name = os.path.basename(source_path)
+        if path is None:
+            return {"created": 0, "errors": [f"{name}: outside the import directory"]}
+        if os.path.splitext(path)[1].lower() not in EXTENSIONS:
+            return {"created": 0, "errors": [f"{name}: unsupported question bank format"]}
+        try:
+            bank_groups, bank_questions = load_question_bank(path)
+        except OSError:
+            return {"created": 0, "errors": [f"{name}: not found or not readable"]}
+        except (ValueError, ET.ParseError, csv.Error, zipfile.BadZipFile) as exc:
+            return {"created": 0,
+                    "errors": [f"{name}: not a valid question bank ({type(exc).__name__})"]}
+        try:
+            groups += [QuizGroupCreate(**g) for g in bank_groups]
+        except ValidationError:
+            return {"created": 0, "errors": [f"{name}: invalid question group"]}
+        for i, q in enumerate(bank_questions, start=1):
+            try:
+                questions.append(BulkQuizQuestion(**q))
+            except ValidationError as exc:
+                errors.append(f"{name} question {i}: " + "; ".join(
+                    f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()))
+    if errors:
+        return {"created": 0, "errors": errors}
+    return bulk_import_questions(course_id, quiz_id, questions, groups, dry_run)
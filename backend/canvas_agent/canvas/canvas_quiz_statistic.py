@@ -1,3 +1,262 @@
 """
 https://canvas.instructure.com/doc/api/quiz_statistics.html
-"""
\ No newline at end of file
+
+QUIZ STATISTICS TOOLS
+=====================
+
+Item analysis for a quiz without paging through quiz submissions:
+
+* Canvas' `/quizzes/:id/statistics` report is fetched once and cached per quiz
+  and attempt version (latest attempts vs all attempts) for `QUIZ_STATS_TTL`
+* Difficulty, discrimination (upper − lower 27 % groups), point-biserial of the
+  correct answer and distractor rates are computed with NumPy for all
+  questions at once
+* When Canvas has no question statistics for the quiz, the same metrics are
+  computed from submission-level data (`submission_history` answers)
+"""
+
+import os
+import re
+import warnings
+from typing import Any, Dict, List, Literal, Optional
+
+import numpy as np
+
+from canvas_agent.canvas_cache import DiskCache
+from canvas_agent.openai_tools import (
+    function_tool,
+    canvas_get,
+    canvas_paginate,
+)
+
+QUIZ_STATS_TTL = float(os.getenv("CANVAS_QUIZ_STATS_TTL", "600"))
+GROUP_FRACTION = 0.27
+
+_stats_cache = DiskCache("quiz_statistics")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# H E L P E R S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def _plain(html: Optional[str], width: int = 80) -> str:
+    text = re.sub(r"\s+", " ", re.sub(r"<[^>]+>", " ", html or "")).strip()
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def _round(value: Any) -> Optional[float]:
+    if value is None or not np.isfinite(value):
+        return None
+    return round(float(value), 3)
+
+
+def fetch_quiz_statistics(course_id: int, quiz_id: int, all_versions: bool = False) -> Dict[str, Any]:
+    """Canvas' QuizStatistics report for the quiz (cached)."""
+    key = f"{course_id}:{quiz_id}:{'all' if all_versions else 'latest'}"
+    stats = _stats_cache.get(key, max_age=QUIZ_STATS_TTL)
+    if stats is None:
+        resp = canvas_get(f"courses/{course_id}/quizzes/{quiz_id}/statistics",
+                          params={"all_versions": str(all_versions).lower()})
+        stats = (resp.get("quiz_statistics") or [{}])[0]
+        _stats_cache.put(key, stats)
+    return stats
+
+
+def _items_from_statistics(stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Item metrics from Canvas' per-question counts, vectorised over questions."""
+    qs = [q for q in stats.get("question_statistics") or [] if q.get("answers")]
+    if not qs:
+        return []
+
+    def column(name: str) -> np.ndarray:
+        return np.array([q.get(name) or 0 for q in qs], dtype=float)
+
+    answered = column("answered_student_count")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        difficulty = column("correct_student_count") / answered
+        discrimination = (column("correct_top_student_count") / column("top_student_count")
+                          - column("correct_bottom_student_count") / column("bottom_student_count"))
+
+    items = []
+    for i, q in enumerate(qs):
+        pbis = {str(p.get("answer_id")): p.get("point_biserial")
+                for p in q.get("point_biserials") or []}
+        correct_pbis = [v for a in q["answers"] if a.get("correct")
+                        for v in [pbis.get(str(a.get("id")))] if v is not None]
+        items.append({
+            "question_id": int(q["id"]),
+            "position": q.get("position"),
+            "question": _plain(q.get("question_text")),
+            "answered": int(answered[i]),
+            "difficulty": _round(difficulty[i]),
+            "discrimination": _round(discrimination[i]),
+            "point_biserial": _round(correct_pbis[0]) if correct_pbis else None,
+            "answers": [{
+                "id": int(a["id"]),
+                "text": _plain(a.get("text"), 40),
+                "correct": bool(a.get("correct")),
+                "rate": _round((a.get("responses") or 0) / answered[i]) if answered[i] else None,
+            } for a in q["answers"]],
+        })
+    return items
+
+
+def _items_from_submissions(
+    course_id: int, quiz: Dict[str, Any], all_versions: bool
+) -> List[Dict[str, Any]]:
+    """Item metrics computed from each attempt's `submission_data` answers."""
+    questions = sorted(canvas_paginate(f"courses/{course_id}/quizzes/{quiz['id']}/questions"),
+                       key=lambda q: q.get("position") or 0)
+    subs = canvas_paginate(f"courses/{course_id}/assignments/{quiz['assignment_id']}/submissions",
+                           params={"include[]": "submission_history"})
+    attempts = [h["submission_data"] for s in subs
+                for h in (s.get("submission_history") or [])[(None if all_versions else -1):]
+                if h.get("submission_data")]
+    if not questions or not attempts:
+        return []
+
+    col = {q["id"]: j for j, q in enumerate(questions)}
+    n, k = len(attempts), len(questions)
+    points = np.full((n, k), np.nan)
+    correct = np.full((n, k), np.nan)
+    choice = np.zeros((n, k), dtype=np.int64)
+    for i, answers in enumerate(attempts):
+        for a in answers:
+            j = col.get(a.get("question_id"))
+            if j is None:
+                continue
+            points[i, j] = a.get("points") or 0.0
+            correct[i, j] = 1.0 if a.get("correct") is True else 0.0
+            choice[i, j] = a.get("answer_id") or 0
+
+    total = np.nansum(points, axis=1)
+    order = np.argsort(total, kind="stable")
+    g = max(1, int(round(GROUP_FRACTION * n)))
+    low, high = order[:g], order[-g:]
+    # Questions nobody answered get NaN metrics (reported as None), not warnings.
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        answered = (~np.isnan(correct)).sum(axis=0)
+        difficulty = np.nanmean(correct, axis=0)
+        discrimination = np.nanmean(correct[high], axis=0) - np.nanmean(correct[low], axis=0)
+        # Point-biserial of each item against the total of the *other* items.
+        rest = total[:, None] - np.nan_to_num(points)
+        c = np.nan_to_num(correct)
+        c = c - c.mean(axis=0)
+        r = rest - rest.mean(axis=0)
+        pbis = (c * r).sum(axis=0) / np.sqrt((c ** 2).sum(axis=0) * (r ** 2).sum(axis=0))
+
+    items = []
+    for j, q in enumerate(questions):
+        ids, counts = np.unique(choice[:, j][choice[:, j] > 0], return_counts=True)
+        picked = dict(zip(ids.tolist(), counts.tolist()))
+        items.append({
+            "question_id": q["id"],
+            "position": q.get("position"),
+            "question": _plain(q.get("question_text")),
+            "answered": int(answered[j]),
+            "difficulty": _round(difficulty[j]),
+            "discrimination": _round(discrimination[j]),
+            "point_biserial": _round(pbis[j]),
+            "answers": [{
+                "id": a["id"],
+                "text": _plain(a.get("text"), 40),
+                "correct": bool(a.get("weight")),
+                "rate": _round(picked.get(a["id"], 0) / answered[j]) if answered[j] else None,
+            } for a in q.get("answers") or []],
+        })
+    return items
+
+
+def _flags(item: Dict[str, Any]) -> List[str]:
+    flags = []
+    p, d = item["difficulty"], item["discrimination"]
+    if p is not None and p < 0.3:
+        flags.append("very hard")
+    if p is not None and p > 0.9:
+        flags.append("very easy")
+    if d is not None and d < 0:
+        flags.append("negative discrimination")
+    elif d is not None and d < 0.2:
+        flags.append("weak discrimination")
+    right = max((a["rate"] or 0 for a in item["answers"] if a["correct"]), default=0)
+    for a in item["answers"]:
+        if a["correct"] or a["rate"] is None:
+            continue
+        if a["rate"] > right:
+            flags.append(f"distractor {a['id']} chosen more than the key")
+        elif a["rate"] < 0.05:
+            flags.append(f"distractor {a['id']} non-functional")
+    return flags
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# T O O L   F U N C T I O N S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+@function_tool()
+def get_quiz_statistics(
+    course_id: int,
+    quiz_id: int,
+    all_versions: bool = False,
+    sort_by: Literal["difficulty", "discrimination", "position"] = "difficulty",
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """
+    Quiz score summary and per-question item analysis.
+
+    Args:
+        course_id (int): Canvas course ID.
+        quiz_id (int): Quiz ID.
+        all_versions (bool): Include every attempt, not only each student's latest.
+        sort_by (str): 'difficulty' (hardest first), 'discrimination' (weakest first)
+            or 'position'.
+        limit (int): Maximum number of questions to return (default 20).
+
+    Returns:
+        Dict[str, Any]: {
+            'quiz_id', 'title', 'source': 'canvas' or 'submissions', 'generated_at',
+            'submissions': {'count', 'mean', 'high', 'low', 'stdev', 'duration_average'},
+            'questions': [{'question_id', 'position', 'question', 'answered',
+                           'difficulty' (share correct), 'discrimination' (upper − lower
+                           group), 'point_biserial',
+                           'answers': [{'id', 'text', 'correct', 'rate'}],
+                           'flags': ['very hard', 'weak discrimination', ...]}]
+        }
+    """
+    quiz = canvas_get(f"courses/{course_id}/quizzes/{quiz_id}")
+    stats = fetch_quiz_statistics(course_id, quiz_id, all_versions)
+    sub_stats = stats.get("submission_statistics") or {}
+    items = _items_from_statistics(stats)
+    source = "canvas"
+    if not items and quiz.get("assignment_id"):
+        key = f"{course_id}:{quiz_id}:{'all' if all_versions else 'latest'}:items"
+        items = _stats_cache.get(key, max_age=QUIZ_STATS_TTL)
+        if items is None:
+            items = _items_from_submissions(course_id, quiz, all_versions)
+            _stats_cache.put(key, items)
+        source = "submissions"
+
+    for item in items:
+        item["flags"] = _flags(item)
+    if sort_by == "position":
+        items.sort(key=lambda i: i["position"] or 0)
+    else:
+        items.sort(key=lambda i: (i[sort_by] is None, i[sort_by] or 0))
+
+    return {
+        "quiz_id": quiz_id,
+        "title": quiz.get("title"),
+        "source": source,
+        "generated_at": stats.get("generated_at"),
+        "submissions": {
+            "count": sub_stats.get("unique_count"),
+            "mean": _round(sub_stats.get("score_average")),
+            "high": sub_stats.get("score_high"),
+            "low": sub_stats.get("score_low"),
+            "stdev": _round(sub_stats.get("score_stdev")),
+            "duration_average": _round(sub_stats.get("duration_average")),
+        },
+        "questions": items[:limit],
+    }
@@ -3,15 +3,28 @@ QUIZ-SUBMISSION TOOLS  — strict‐schema compliant
 """
 
 from __future__ import annotations
-from typing import List, Literal, Dict, Any
+import csv
+import os
+import statistics
+from datetime import datetime
+from typing import List, Literal, Dict, Any, Iterator, Optional
 from pydantic import BaseModel, Field
 from canvas_agent.openai_tools import (
     function_tool,
     get_canvas,
-    CANVAS_API_URL,
-    CANVAS_API_TOKEN,
+    canvas_request,
+    canvas_pages,
 )
-import requests
+from canvas_agent.roster import roster_for
+
+EXPORT_DIR = os.getenv("CANVAS_EXPORT_DIR", "exports")
+
+EXPORT_COLUMNS = [
+    "quiz_submission_id", "user_id", "user_name", "sortable_name", "sis_user_id",
+    "attempt", "score", "kept_score", "fudge_points", "workflow_state",
+    "started_at", "finished_at", "duration_seconds",
+    "submission_id", "grade", "submitted_at", "late", "missing",
+]
 
 # ───────────────────────────────────────────────────────────────────────────────
 # P Y D A N T I C   M O D E L S (all forbid extras)
@@ -57,17 +70,132 @@ class QuizSubmissionComplete(BaseModel, _Config):
 # ───────────────────────────────────────────────────────────────────────────────
 
 def _api_request(
-    method: str, path: str, json: dict | None = None
+    method: str, path: str, json: dict | None = None, params: dict | None = None
+) -> Dict[str, Any]:
+    return canvas_request(method, path, params=params, json=json).json()
+
+
+def _include(include: List[str]) -> Dict[str, Any] | None:
+    """
+    `include` as Canvas expects it on a GET: repeated `include[]` query params.
+
+    'user' is never sent: names come from the course roster index instead.
+    """
+    include = [i for i in include if i != "user"]
+    return {"include[]": include} if include else None
+
+
+def _fetch_quiz_submission(
+    course_id: int, quiz_id: int, submission_id: int, include: List[str] = ()
 ) -> Dict[str, Any]:
-    url = f"{CANVAS_API_URL}/api/v1/{path.lstrip('/')}"
-    headers = {
-        "Authorization": f"Bearer {CANVAS_API_TOKEN}",
-        "Content-Type": "application/json",
+    resp = _api_request(
+        "GET",
+        f"courses/{course_id}/quizzes/{quiz_id}/submissions/{submission_id}",
+        params=_include(include),
+    )
+    brief = _brief(resp["quiz_submissions"][0])
+    brief["user_name"] = roster_for(course_id).resolve([brief["user_id"]]).get(
+        brief["user_id"], {}).get("name")
+    return brief
+
+
+def _seconds_between(start: str | None, end: str | None) -> Optional[float]:
+    if not start or not end:
+        return None
+    parse = lambda t: datetime.fromisoformat(t.replace("Z", "+00:00"))
+    return (parse(end) - parse(start)).total_seconds()
+
+
+def iter_quiz_submissions(
+    course_id: int, quiz_id: int, include: List[str] = ("user", "submission")
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every quiz submission, page by page, joined with the assignment
+    submissions Canvas side-loads on the same page and (with 'user') the
+    course roster index.
+
+    Each row is a raw quiz submission plus '_user' (roster person: 'name',
+    'sortable_name', 'sis_user_id', 'section'...) and '_submission' (or None).
+    """
+    roster = roster_for(course_id) if "user" in include else None
+    for page in canvas_pages(f"courses/{course_id}/quizzes/{quiz_id}/submissions",
+                             params=_include(include)):
+        rows = page.get("quiz_submissions") or []
+        people = roster.resolve(qs.get("user_id") for qs in rows) if roster else {}
+        subs = {s["id"]: s for s in page.get("submissions") or []}
+        for qs in rows:
+            yield {**qs, "_user": people.get(qs.get("user_id")),
+                   "_submission": subs.get(qs.get("submission_id"))}
+
+
+def _export_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    user = row["_user"] or {}
+    sub = row["_submission"] or {}
+    return {
+        "quiz_submission_id": row.get("id"),
+        "user_id": row.get("user_id"),
+        "user_name": user.get("name"),
+        "sortable_name": user.get("sortable_name"),
+        "sis_user_id": user.get("sis_user_id"),
+        "attempt": row.get("attempt"),
+        "score": row.get("score"),
+        "kept_score": row.get("kept_score"),
+        "fudge_points": row.get("fudge_points"),
+        "workflow_state": row.get("workflow_state"),
+        "started_at": row.get("started_at"),
+        "finished_at": row.get("finished_at"),
+        "duration_seconds": _seconds_between(row.get("started_at"), row.get("finished_at")),
+        "submission_id": row.get("submission_id"),
+        "grade": sub.get("grade"),
+        "submitted_at": sub.get("submitted_at"),
+        "late": sub.get("late"),
+        "missing": sub.get("missing"),
     }
-    r = requests.request(method, url, headers=headers, json=json)
-    if r.status_code >= 400:
-        raise RuntimeError(f"Canvas API error {r.status_code}: {r.text}")
-    return r.json()
+
+
+class _CsvSink:
+    def __init__(self, path: str):
+        self.file = open(path, "x", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=EXPORT_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self.writer.writerows(rows)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class _ParquetSink:
+    """One row group per flushed batch, so memory stays bounded by the batch size."""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Parquet export requires the 'pyarrow' package") from exc
+        self.pa = pa
+        self.schema = pa.schema([
+            ("quiz_submission_id", pa.int64()), ("user_id", pa.int64()),
+            ("user_name", pa.string()), ("sortable_name", pa.string()),
+            ("sis_user_id", pa.string()), ("attempt", pa.int64()),
+            ("score", pa.float64()), ("kept_score", pa.float64()),
+            ("fudge_points", pa.float64()), ("workflow_state", pa.string()),
+            ("started_at", pa.string()), ("finished_at", pa.string()),
+            ("duration_seconds", pa.float64()), ("submission_id", pa.int64()),
+            ("grade", pa.string()), ("submitted_at", pa.string()),
+            ("late", pa.bool_()), ("missing", pa.bool_()),
+        ])
+        self.file = open(path, "xb")
+        self.writer = pq.ParquetWriter(self.file, self.schema)
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+        self.file.close()
 
 
 def _brief(qs) -> Dict[str, Any]:
@@ -119,15 +247,20 @@ def list_quiz_submissions(
         include (List[str]): 'submission','quiz','user'; pass [] to skip.
 
     Returns:
-        List[dict]: Brief quiz-submission objects.
+        List[dict]: Brief quiz-submission objects (every page).  With 'user'
+        each also has 'user_name'; with 'submission' it has 'submission':
+        {'grade', 'submitted_at', 'late', 'missing'}.
     """
-    params = {"include": include} if include else None
-    resp = _api_request(
-        "GET",
-        f"courses/{course_id}/quizzes/{quiz_id}/submissions",
-        json=params,
-    )
-    return [_brief(s) for s in resp["quiz_submissions"]]
+    out = []
+    for row in iter_quiz_submissions(course_id, quiz_id, include):
+        brief = _brief(row)
+        if "user" in include:
+            brief["user_name"] = (row["_user"] or {}).get("name")
+        if "submission" in include:
+            sub = row["_submission"] or {}
+            brief["submission"] = {k: sub.get(k) for k in ("grade", "submitted_at", "late", "missing")}
+        out.append(brief)
+    return out
 
 
 @function_tool()
@@ -147,11 +280,10 @@ def get_my_quiz_submission(
     Returns:
         dict: Brief submission.
     """
-    params = {"include": include} if include else None
     resp = _api_request(
         "GET",
         f"courses/{course_id}/quizzes/{quiz_id}/submission",
-        json=params,
+        params=_include(include),
     )
     return _brief(resp["quiz_submissions"][0])
 
@@ -173,15 +305,9 @@ def get_quiz_submission(
         include (List[str]): 'submission','quiz','user'; pass [] to skip.
 
     Returns:
-        dict: Brief submission.
+        dict: Brief submission with the student's 'user_name' (from the course roster).
     """
-    params = {"include": include} if include else None
-    resp = _api_request(
-        "GET",
-        f"courses/{course_id}/quizzes/{quiz_id}/submissions/{submission_id}",
-        json=params,
-    )
-    return _brief(resp["quiz_submissions"][0])
+    return _fetch_quiz_submission(course_id, quiz_id, submission_id, include)
 
 
 @function_tool()
@@ -260,7 +386,7 @@ def update_quiz_submission(
         f"courses/{course_id}/quizzes/{quiz_id}/submissions/{submission_id}",
         json=payload,
     )
-    return get_quiz_submission(course_id, quiz_id, submission_id)
+    return _fetch_quiz_submission(course_id, quiz_id, submission_id)
 
 
 @function_tool()
@@ -298,7 +424,7 @@ def complete_quiz_submission(
         f"courses/{course_id}/quizzes/{quiz_id}/submissions/{submission_id}/complete",
         json={"quiz_submissions": [payload]},
     )
-    return get_quiz_submission(course_id, quiz_id, submission_id)
+    return _fetch_quiz_submission(course_id, quiz_id, submission_id)
 
 
 @function_tool()
@@ -320,3 +446,84 @@ def quiz_submission_time(
         "GET",
         f"courses/{course_id}/quizzes/{quiz_id}/submissions/{submission_id}/time",
     )
+
+
+@function_tool()
+def export_quiz_submissions(
+    course_id: int,
+    quiz_id: int,
+    file_format: Literal["csv", "parquet"] = "csv",
+    filename: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Export every submission of a quiz, joined with student and gradebook data,
+    to a CSV or Parquet file in the export directory, and return a short summary.
+
+    Rows are written page by page as they arrive, so large quizzes are never
+    held in memory.  Existing exports are never overwritten.
+
+    Args:
+        course_id (int): Canvas course ID.
+        quiz_id (int): Quiz ID.
+        file_format (str): 'csv' (default) or 'parquet' (needs pyarrow).
+        filename (str, optional): Name of the file in the export directory
+            (CANVAS_EXPORT_DIR); directories are ignored.  Defaults to
+            `quiz_<course>_<quiz>_<timestamp>.<format>`.
+
+    Returns:
+        Dict[str, Any]: {'path', 'rows', 'students', 'by_state': {workflow_state: n},
+                         'score': {'mean', 'median', 'min', 'max'},
+                         'median_duration_minutes', 'late'}, or {'error'} if the
+                         file already exists
+    """
+    name = os.path.basename(filename or "")
+    if name in ("", ".", ".."):
+        name = f"quiz_{course_id}_{quiz_id}_{datetime.now():%Y%m%d-%H%M%S}"
+    if not name.endswith(f".{file_format}"):
+        name += f".{file_format}"
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_DIR, name)
+    try:
+        sink = _ParquetSink(path) if file_format == "parquet" else _CsvSink(path)
+    except FileExistsError:
+        return {"error": f"{name} already exists in the export directory; choose another filename"}
+
+    rows, students, late = 0, set(), 0
+    by_state: Dict[str, int] = {}
+    scores: List[float] = []
+    durations: List[float] = []
+    batch: List[Dict[str, Any]] = []
+    try:
+        for raw in iter_quiz_submissions(course_id, quiz_id):
+            row = _export_row(raw)
+            batch.append(row)
+            rows += 1
+            students.add(row["user_id"])
+            late += bool(row["late"])
+            by_state[row["workflow_state"]] = by_state.get(row["workflow_state"], 0) + 1
+            if row["kept_score"] is not None:
+                scores.append(row["kept_score"])
+            if row["duration_seconds"] is not None:
+                durations.append(row["duration_seconds"])
+            if len(batch) >= 500:
+                sink.write(batch)
+                batch = []
+        if batch:
+            sink.write(batch)
+    finally:
+        sink.close()
+
+    return {
+        "path": os.path.abspath(path),
+        "rows": rows,
+        "students": len(students),
+        "by_state": by_state,
+        "score": {
+            "mean": round(statistics.fmean(scores), 2) if scores else None,
+            "median": statistics.median(scores) if scores else None,
+            "min": min(scores) if scores else None,
+            "max": max(scores) if scores else None,
+        },
+        "median_duration_minutes": round(statistics.median(durations) / 60, 1) if durations else None,
+        "late": late,
+    }
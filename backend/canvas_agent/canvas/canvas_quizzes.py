@@ -11,7 +11,10 @@ Canvas *quizzes*.  The same overall shape and design choices are preserved:
 * Direct use of the Canvas API endpoints when needed
 """
 
-from typing import Optional, List, Literal, Dict, Any
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Optional, List, Literal, Dict, Any, Callable, Tuple
 import requests
 from pydantic import BaseModel
 
@@ -20,7 +23,12 @@ from canvas_agent.openai_tools import (
     get_canvas,
     CANVAS_API_URL,
     CANVAS_API_TOKEN,
+    canvas_get,
+    canvas_map,
+    canvas_paginate,
+    canvas_request,
 )
+from canvas_agent.course_mirror import fresh_mirror
 
 # ────────────────────────────────────────────────────────────────────────────────
 # P Y D A N T I C   M O D E L S
@@ -71,6 +79,17 @@ class QuizEdit(QuizCreate):
     title: Optional[str] = None
 
 
+class CloneTarget(BaseModel):
+    """Where to copy a quiz: a course, optionally limited to some of its sections."""
+
+    course_id: int
+    days_offset: Optional[int] = None  # overrides the call's days_offset
+    section_ids: Optional[List[int]] = None  # one due-date override per section
+    assignment_group_id: Optional[int] = None
+
+    model_config = {"extra": "forbid"}
+
+
 # ────────────────────────────────────────────────────────────────────────────────
 # H E L P E R S
 # ────────────────────────────────────────────────────────────────────────────────
@@ -90,8 +109,42 @@ def _request(
     return resp.json()
 
 
+def reorder_items(course_id: int, quiz_id: int, order: List[Dict[str, Any]]) -> None:
+    """POST a full question/group order (Canvas answers 204 No Content)."""
+    canvas_request("POST", f"courses/{course_id}/quizzes/{quiz_id}/reorder",
+                   json={"order": order})
+
+
+# Quiz settings copied by clone_quiz (everything in QuizCreate that is not
+# specific to the source course).
+_CLONE_QUIZ_FIELDS = [f for f in QuizCreate.model_fields if f not in ("assignment_group_id",)]
+_QUIZ_DATE_FIELDS = ("due_at", "lock_at", "unlock_at",
+                     "show_correct_answers_at", "hide_correct_answers_at")
+# Question fields that identify the source copy rather than describe the question.
+_QUESTION_ID_FIELDS = ("id", "quiz_id", "quiz_group_id", "position", "assessment_question_id")
+
+
+def _shift(timestamp: Optional[str], days: int) -> Optional[str]:
+    if not timestamp or not days:
+        return timestamp
+    moved = datetime.fromisoformat(timestamp.replace("Z", "+00:00")) + timedelta(days=days)
+    return moved.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _attempt(fn: Callable[[Any], Any]) -> Callable[[Any], Tuple[Any, Optional[str]]]:
+    """Wrap `fn` so a failed Canvas call is reported instead of aborting the fan-out."""
+    def run(arg: Any) -> Tuple[Any, Optional[str]]:
+        try:
+            return fn(arg), None
+        except RuntimeError as exc:
+            return None, str(exc)
+    return run
+
+
 def _simplify_quiz(q) -> Dict[str, Any]:
     """Return only the most relevant quiz fields for list / get."""
+    if isinstance(q, dict):
+        q = SimpleNamespace(**q)
     return {
         "id": q.id,
         "title": q.title,
@@ -120,8 +173,11 @@ def list_quizzes(course_id: int) -> List[Dict[str, Any]]:
         List[Dict[str, Any]]: Each item has keys:
             id, title, quiz_type, points_possible, due_at, published, html_url
     """
-    canvas = get_canvas()
-    quizzes = canvas.get_course(course_id).get_quizzes()
+    mirror = fresh_mirror(course_id, "quizzes")
+    if mirror is not None:
+        quizzes = mirror.quizzes(course_id)
+    else:
+        quizzes = get_canvas().get_course(course_id).get_quizzes()
     return [_simplify_quiz(q) for q in quizzes]
 
 
@@ -219,9 +275,7 @@ def reorder_quiz_items(
     Returns:
         str: "Successfully reordered quiz items."
     """
-    payload = {"order": [item.model_dump() for item in order]}
-    _request(
-        "POST", f"courses/{course_id}/quizzes/{quiz_id}/reorder", json=payload)
+    reorder_items(course_id, quiz_id, [item.model_dump() for item in order])
     return "Successfully reordered quiz items."
 
 
@@ -248,3 +302,152 @@ def validate_quiz_access_code(
     )
     # Canvas returns {'valid': true/false, ...}
     return bool(resp.get("valid", False))
+
+
+@function_tool()
+def clone_quiz(
+    course_id: int,
+    quiz_id: int,
+    targets: List[CloneTarget],
+    days_offset: int = 0,
+    title: Optional[str] = None,
+    publish: bool = False,
+) -> Dict[str, Any]:
+    """
+    Copy a quiz with all its questions and question groups into other courses.
+
+    All targets are processed in parallel: quizzes are created first, then every
+    group, then every question, then each copy is reordered to match the source.
+
+    Args:
+        course_id (int): Source course ID.
+        quiz_id (int): Source quiz ID.
+        targets (List[CloneTarget]): Target courses.  Each may set its own
+            days_offset, restrict the copy to section_ids (one due-date override
+            per section, quiz visible only to those sections), and set the
+            assignment_group_id to file it under.
+        days_offset (int): Days to shift due/lock/unlock and answer-visibility
+            dates by (e.g. 119 for the same week next term).
+        title (str, optional): Title for the copies (default: source title).
+        publish (bool): Publish the copies (default False).
+
+    Returns:
+        Dict[str, Any]: {'source_quiz_id', 'questions', 'groups', 'seconds',
+            'targets': [{'course_id', 'quiz_id', 'html_url', 'due_at',
+                         'question_ids': {old_id: new_id}, 'group_ids': {old_id: new_id},
+                         'override_ids': [...], 'errors': [...]}]}
+    """
+    started = time.time()
+    source = canvas_get(f"courses/{course_id}/quizzes/{quiz_id}")
+    questions = sorted(canvas_paginate(f"courses/{course_id}/quizzes/{quiz_id}/questions"),
+                       key=lambda q: q.get("position") or 0)
+    group_ids = list(dict.fromkeys(q["quiz_group_id"] for q in questions if q.get("quiz_group_id")))
+    groups = canvas_map(
+        lambda gid: canvas_get(f"courses/{course_id}/quizzes/{quiz_id}/groups/{gid}"), group_ids)
+
+    results = [{"course_id": t.course_id, "quiz_id": None, "html_url": None, "due_at": None,
+                "question_ids": {}, "group_ids": {}, "override_ids": [], "errors": []}
+               for t in targets]
+
+    # 1. One quiz per target
+    def create_quiz_copy(i: int) -> Dict[str, Any]:
+        target = targets[i]
+        offset = days_offset if target.days_offset is None else target.days_offset
+        fields = {f: source.get(f) for f in _CLONE_QUIZ_FIELDS if source.get(f) is not None}
+        fields.update({f: _shift(source.get(f), offset) for f in _QUIZ_DATE_FIELDS
+                       if source.get(f)})
+        fields["title"] = title or source.get("title")
+        fields["published"] = publish
+        if target.assignment_group_id is not None:
+            fields["assignment_group_id"] = target.assignment_group_id
+        if target.section_ids:
+            fields["only_visible_to_overrides"] = True
+        return canvas_request("POST", f"courses/{target.course_id}/quizzes",
+                              json={"quiz": fields}).json()
+
+    for i, (quiz, err) in enumerate(canvas_map(_attempt(create_quiz_copy), range(len(targets)))):
+        if err:
+            results[i]["errors"].append(f"create quiz: {err}")
+        else:
+            results[i].update(quiz_id=quiz["id"], html_url=quiz.get("html_url"),
+                              due_at=quiz.get("due_at"))
+            results[i]["_assignment_id"] = quiz.get("assignment_id")
+    live = [i for i, r in enumerate(results) if r["quiz_id"]]
+
+    # 2. Groups, for every target at once
+    def create_group(job: Tuple[int, Dict[str, Any]]) -> int:
+        i, group = job
+        fields = {k: group.get(k) for k in ("name", "pick_count", "question_points")}
+        resp = canvas_request("POST", f"courses/{targets[i].course_id}/quizzes/"
+                                      f"{results[i]['quiz_id']}/groups",
+                              json={"quiz_groups": [fields]})
+        return resp.json()["quiz_groups"][0]["id"]
+
+    jobs = [(i, g) for i in live for g in groups]
+    for (i, group), (new_id, err) in zip(jobs, canvas_map(_attempt(create_group), jobs)):
+        if err:
+            results[i]["errors"].append(f"group {group['id']}: {err}")
+        else:
+            results[i]["group_ids"][group["id"]] = new_id
+
+    # 3. Questions, for every target at once
+    def create_question(job: Tuple[int, Dict[str, Any]]) -> int:
+        i, question = job
+        fields = {k: v for k, v in question.items() if k not in _QUESTION_ID_FIELDS}
+        fields["answers"] = [{k: v for k, v in a.items() if k != "id"}
+                             for a in question.get("answers") or []]
+        if question.get("quiz_group_id"):
+            fields["quiz_group_id"] = results[i]["group_ids"][question["quiz_group_id"]]
+        resp = canvas_request("POST", f"courses/{targets[i].course_id}/quizzes/"
+                                      f"{results[i]['quiz_id']}/questions",
+                              json={"question": fields})
+        return resp.json()["id"]
+
+    jobs = [(i, q) for i in live for q in questions
+            if not q.get("quiz_group_id") or q["quiz_group_id"] in results[i]["group_ids"]]
+    for (i, question), (new_id, err) in zip(jobs, canvas_map(_attempt(create_question), jobs)):
+        if err:
+            results[i]["errors"].append(f"question {question['id']}: {err}")
+        else:
+            results[i]["question_ids"][question["id"]] = new_id
+
+    # 4. Source order, and section overrides
+    def finish(i: int) -> None:
+        result, target = results[i], targets[i]
+        order, seen = [], set()
+        for q in questions:
+            if q.get("quiz_group_id") in result["group_ids"]:
+                item = {"id": result["group_ids"][q["quiz_group_id"]], "type": "group"}
+            elif q["id"] in result["question_ids"]:
+                item = {"id": result["question_ids"][q["id"]], "type": "question"}
+            else:
+                continue
+            if (item["type"], item["id"]) not in seen:
+                seen.add((item["type"], item["id"]))
+                order.append(item)
+        reorder_items(target.course_id, result["quiz_id"], order)
+
+        assignment_id = result.get("_assignment_id")
+        for section_id in target.section_ids or []:
+            if not assignment_id:
+                result["errors"].append("section overrides need a graded quiz")
+                break
+            override = canvas_request(
+                "POST", f"courses/{target.course_id}/assignments/{assignment_id}/overrides",
+                json={"assignment_override": {"course_section_id": section_id,
+                                              "due_at": result["due_at"]}}).json()
+            result["override_ids"].append(override["id"])
+
+    for i, (_, err) in zip(live, canvas_map(_attempt(finish), live)):
+        if err:
+            results[i]["errors"].append(f"reorder/overrides: {err}")
+
+    for result in results:
+        result.pop("_assignment_id", None)
+    return {
+        "source_quiz_id": quiz_id,
+        "questions": len(questions),
+        "groups": len(groups),
+        "targets": results,
+        "seconds": round(time.time() - started, 2),
+    }
@@ -22,24 +22,35 @@ Mark document annotations as read
 Submission Summary
 """
 from canvas_agent.openai_tools import *
+from canvas_agent.projection import Detail, fields_error, select_fields, project, canvas_params
+from canvas_agent.course_mirror import fresh_mirror
+from canvas_agent.roster import with_names
 
 
-@function_tool()
-def get_submissions(course_id: int, assignment_id: int) -> List[Dict[str, Any]]:
+@function_tool(failure_error_function=fields_error)
+def get_submissions(
+    course_id: int,
+    assignment_id: int,
+    detail: Detail = "standard",
+    fields: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """
     Retrieve all submissions for a specific assignment in a Canvas course.
 
     This function calls the Canvas API to fetch every submission record for 
-    the given assignment. It then returns a clean list of dictionaries containing 
-    the most relevant information about each submission, such as the student’s 
-    user ID, user name, submission status, grade, score, timestamps, and a preview URL.
+    the given assignment (following pagination). It then returns a clean list of
+    dictionaries trimmed to the requested detail level or field set.
 
     Args:
         course_id (int): The Canvas course ID containing the assignment.
         assignment_id (int): The ID of the assignment to fetch submissions for.
+        detail (str): "minimal", "standard" (default) or "full". Only "full"
+            returns the submission `body` HTML and `preview_url`.
+        fields (List[str], optional): Explicit fields to return; overrides `detail`.
 
     Returns:
-        List[Dict[str, Any]]: A list where each item represents one student’s submission:
+        List[Dict[str, Any]]: A list where each item represents one student’s submission,
+        with any of the following keys (depending on `detail` / `fields`):
             - 'submission_id' (int): The unique Canvas submission ID
             - 'user_id' (int): The Canvas user ID of the student
             - 'user_name' (str): The student’s display name
@@ -54,35 +65,30 @@ def get_submissions(course_id: int, assignment_id: int) -> List[Dict[str, Any]]:
             - 'missing' (bool): Whether the submission is missing
             - 'preview_url' (str): URL to preview the submission
     Raises:
-        Exception: If the API request fails (non-200 status code).
+        RuntimeError: If the API request fails.
 
     Notes:
         - Students who have not submitted will appear with workflow_state='unsubmitted'
           and no grade/score.
-        - For large classes, consider paginating or filtering via API parameters.
+        - Names are joined from the course roster index, not side-loaded per submission.
+        - Served from the local course mirror when it is fresh.
     """
-    canvas = get_canvas()
-    url = f"{CANVAS_API_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions"
-    headers = {"Authorization": f"Bearer {CANVAS_API_TOKEN}"}
-    params = {
-        # include additional fields if needed, e.g. include[]=submission_comments
-        "include[]": ["user", "submission"],
-        "per_page": 100
-    }
-
-    response = requests.get(url, headers=headers, params=params)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching submissions: {response.status_code} - {response.text}"
+    keep = select_fields("submission", detail, fields)
+    mirror = fresh_mirror(course_id, "submissions")
+    if mirror is not None:
+        raw = mirror.submissions(course_id, assignment_id)
+    else:
+        raw = canvas_paginate(
+            f"courses/{course_id}/assignments/{assignment_id}/submissions",
+            params=canvas_params("submission", keep),
         )
 
-    raw = response.json()
-    formatted = []
+    records = []
     for sub in raw:
-        formatted.append({
+        records.append({
             "submission_id": sub.get("id"),
             "user_id": sub.get("user_id"),
-            "user_name": sub.get("user", {}).get("name"),
+            "user_name": (sub.get("user") or {}).get("name"),
             "submission_type": sub.get("submission_type"),
             "workflow_state": sub.get("workflow_state"),
             "grade": sub.get("grade"),
@@ -94,5 +100,7 @@ def get_submissions(course_id: int, assignment_id: int) -> List[Dict[str, Any]]:
             "missing": sub.get("missing", False),
             "preview_url": sub.get("preview_url"),
         })
+    if "user_name" in keep and mirror is None:
+        with_names(course_id, records)
 
-    return formatted
+    return [project(record, "submission", keep, detail) for record in records]
@@ -31,14 +31,51 @@ List avatar options
 List user page views
 """
 
-from openai_tools import *
-
-def get_user(user_id: int):
-    # able to get the information about the user (name, sortable name) given the id
-    canvas = get_canvas()
-    canvas.get_user(0)
-    canvas.get_user(user_id)
-    user = canvas.get_user(user_id)
-    print(f"User ID: {user.id}")
-    print(f"Name: {user.name}")
-    print(f"Sortable Name: {user.sortable_name}") 
\ No newline at end of file
+from typing import Any, Dict, List, Optional
+
+from canvas_agent.openai_tools import function_tool, DEFAULT_COURSE_ID
+from canvas_agent.user_directory import get_directory
+
+
+@function_tool()
+def get_user(user_id: int, course_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Look up one user's name and ids.
+
+    Args:
+        user_id (int): Canvas user ID.
+        course_id (int, optional): A course the user is in (default: the agent's course).
+
+    Returns:
+        Dict[str, Any]: {'id', 'name', 'sortable_name', 'short_name', 'sis_user_id',
+        'login_id', 'email'} (fields Canvas does not expose to this token are left out),
+        or {'id', 'error': 'not found'}.
+    """
+    user = get_directory().get(user_id, course_id or DEFAULT_COURSE_ID)
+    return user or {"id": user_id, "error": "not found"}
+
+
+@function_tool()
+def get_users(
+    user_ids: List[int],
+    course_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Resolve many user IDs to names at once (e.g. ids from grade history or analytics).
+
+    Cached users cost nothing; the rest are fetched in batches through the
+    course's user listing, then one by one in parallel.
+
+    Args:
+        user_ids (List[int]): Canvas user IDs.
+        course_id (int, optional): Course the users are in (default: the agent's course).
+
+    Returns:
+        Dict[str, Any]: {'users': [{'id', 'name', 'sortable_name', 'sis_user_id', ...}]
+        in the order given, 'not_found': [ids]}
+    """
+    found = get_directory().lookup(user_ids, course_id or DEFAULT_COURSE_ID)
+    return {
+        "users": [found[u] for u in dict.fromkeys(user_ids) if u in found],
+        "not_found": [u for u in dict.fromkeys(user_ids) if u not in found],
+    }
@@ -0,0 +1,118 @@
+"""
+CANVAS RESPONSE CACHE
+=====================
+
+A small JSON-on-disk cache for Canvas responses that are expensive to fetch
+and rarely (or never) change, e.g. grade distributions of completed terms.
+
+* One file per entry under `CANVAS_CACHE_DIR/<instance>/<namespace>/`, written
+  atomically.  `<instance>` is a hash of `CANVAS_API_URL`, so data from one
+  Canvas (or the offline fake server) is never served for another
+* Entries are either permanent or expire after `max_age` seconds at read time
+* A per-process memory layer avoids re-reading files within one run
+
+    cache = DiskCache("department_grades")
+    counts = cache.get(key, max_age=3600)
+    if counts is None:
+        counts = fetch()
+        cache.put(key, counts, permanent=term_has_ended)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# Absolute, so the cache does not depend on the directory the process starts in
+# (default: `.canvas_cache` next to the `canvas_agent` package).
+CACHE_DIR = os.path.abspath(os.getenv(
+    "CANVAS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".canvas_cache")))
+
+
+def instance_key(base_url: Optional[str] = None) -> str:
+    """Short hash naming the Canvas instance (`CANVAS_API_URL`) a cache belongs to."""
+    url = (base_url if base_url is not None else os.getenv("CANVAS_API_URL", "")).rstrip("/")
+    return hashlib.sha1(url.lower().encode("utf-8")).hexdigest()[:12]
+
+
+class DiskCache:
+    """Namespaced JSON cache.  Safe to share between threads."""
+
+    def __init__(self, namespace: str, directory: Optional[str] = None):
+        self.namespace = namespace
+        self.base = directory or CACHE_DIR
+        self._memory: Dict[str, Tuple[float, bool, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        # Resolved on use: caches are created at import, before `.env` is loaded.
+        return os.path.join(self.base, instance_key(), self.namespace)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _load(self, key: str) -> Optional[Tuple[float, bool, Any]]:
+        path = self._path(key)
+        with self._lock:
+            if path in self._memory:
+                return self._memory[path]
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        loaded = (entry["stored_at"], entry["permanent"], entry["value"])
+        with self._lock:
+            self._memory[path] = loaded
+        return loaded
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        Return the cached value, or None if missing or older than `max_age`.
+
+        Permanent entries never expire.
+        """
+        entry = self._load(key)
+        if entry is None:
+            return None
+        stored_at, permanent, value = entry
+        if not permanent and max_age is not None and time.time() - stored_at > max_age:
+            return None
+        return value
+
+    def put(self, key: str, value: Any, permanent: bool = False) -> None:
+        """Store `value` (JSON-serialisable) under `key`."""
+        entry = {"key": key, "stored_at": time.time(), "permanent": permanent, "value": value}
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        with self._lock:
+            self._memory[path] = (entry["stored_at"], permanent, value)
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        with self._lock:
+            self._memory.pop(path, None)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Drop every entry in this namespace (of the current Canvas instance)."""
+        with self._lock:
+            self._memory.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,39 @@
+"""
+COURSE ANALYTICS REPORTS
+========================
+
+Canvas's per-course analytics reports (`activity`, `assignments`,
+`student_summaries`), shared by the analytics tools and the at-risk engine
+through one disk-cache entry per course and report.  Canvas recomputes them
+periodically, not live, so a report is re-fetched at most once per
+`COURSE_ANALYTICS_TTL` seconds.
+
+    summaries = course_analytics(course_id, "student_summaries")
+"""
+
+import os
+from typing import Any, Dict, List
+
+from canvas_agent.canvas_cache import DiskCache
+from canvas_agent.openai_tools import canvas_get, canvas_paginate
+
+COURSE_ANALYTICS_TTL = float(os.getenv("CANVAS_COURSE_ANALYTICS_TTL", "3600"))
+
+_cache = DiskCache("course_analytics")
+
+
+def course_analytics(course_id: int, report: str) -> List[Dict[str, Any]]:
+    """
+    One course analytics report ('activity', 'assignments' or 'student_summaries'),
+    cached for `COURSE_ANALYTICS_TTL` seconds.
+    """
+    key = f"{course_id}:{report}"
+    rows = _cache.get(key, max_age=COURSE_ANALYTICS_TTL)
+    if rows is None:
+        path = f"courses/{course_id}/analytics/{report}"
+        if report == "student_summaries":
+            rows = list(canvas_paginate(path))
+        else:
+            rows = canvas_get(path)
+        _cache.put(key, rows)
+    return rows
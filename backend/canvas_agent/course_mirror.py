@@ -0,0 +1,550 @@
+"""
+COURSE MIRROR
+=============
+
+A local SQLite copy of one course's assignments, submissions, enrollments,
+quizzes and grade-change events, so the read tools can answer without Canvas
+round trips.
+
+* Indexed tables per resource, rows stored in Canvas' own shape
+* `sync_state` table records when each resource was last refreshed
+* Read tools consult the mirror only when it is configured
+  (`CANVAS_MIRROR_PATH`) and the resource is younger than
+  `CANVAS_MIRROR_MAX_AGE` seconds; otherwise they go to Canvas as before
+
+Build or refresh it from the command line:
+
+    python -m canvas_agent.course_mirror build            # DEFAULT_COURSE_ID
+    python -m canvas_agent.course_mirror build --course 123 --db mirror.db
+    python -m canvas_agent.course_mirror status
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from canvas_agent.openai_tools import (
+    DEFAULT_COURSE_ID,
+    canvas_get,
+    canvas_map,
+    canvas_paginate,
+)
+from canvas_agent.grade_history import GradeHistoryIngester
+
+MIRROR_PATH = os.getenv("CANVAS_MIRROR_PATH", "")
+MIRROR_MAX_AGE = float(os.getenv("CANVAS_MIRROR_MAX_AGE", "900"))
+
+RESOURCES = ("course", "enrollments", "assignments", "submissions", "quizzes", "grade_events")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    account_id INTEGER,
+    start_at TEXT,
+    end_at TEXT
+);
+CREATE TABLE IF NOT EXISTS enrollments (
+    id INTEGER PRIMARY KEY,
+    course_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    name TEXT,
+    sortable_name TEXT,
+    sis_user_id TEXT,
+    section_id INTEGER,
+    enrollment_type TEXT,
+    enrollment_state TEXT,
+    current_score REAL,
+    current_grade TEXT,
+    final_score REAL,
+    final_grade TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_enrollments_user ON enrollments (course_id, user_id);
+CREATE INDEX IF NOT EXISTS ix_enrollments_type
+    ON enrollments (course_id, enrollment_type, enrollment_state);
+CREATE TABLE IF NOT EXISTS assignments (
+    id INTEGER PRIMARY KEY,
+    course_id INTEGER NOT NULL,
+    name TEXT,
+    description TEXT,
+    due_at TEXT,
+    points_possible REAL,
+    submission_types TEXT,
+    is_quiz_assignment INTEGER,
+    quiz_id INTEGER,
+    published INTEGER,
+    html_url TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_assignments_course ON assignments (course_id, due_at);
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    course_id INTEGER NOT NULL,
+    assignment_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    submission_type TEXT,
+    workflow_state TEXT,
+    grade TEXT,
+    score REAL,
+    body TEXT,
+    submitted_at TEXT,
+    graded_at TEXT,
+    late INTEGER,
+    missing INTEGER,
+    excused INTEGER,
+    preview_url TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_submissions_assignment_user
+    ON submissions (assignment_id, user_id);
+CREATE INDEX IF NOT EXISTS ix_submissions_course_user ON submissions (course_id, user_id);
+CREATE INDEX IF NOT EXISTS ix_submissions_course_state ON submissions (course_id, workflow_state);
+CREATE TABLE IF NOT EXISTS quizzes (
+    id INTEGER PRIMARY KEY,
+    course_id INTEGER NOT NULL,
+    title TEXT,
+    quiz_type TEXT,
+    assignment_id INTEGER,
+    points_possible REAL,
+    due_at TEXT,
+    published INTEGER,
+    html_url TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_quizzes_course ON quizzes (course_id);
+CREATE TABLE IF NOT EXISTS grade_events (
+    course_id INTEGER NOT NULL,
+    submission_id INTEGER NOT NULL,
+    assignment_id INTEGER,
+    user_id INTEGER,
+    grader_id INTEGER,
+    previous_grade TEXT,
+    new_grade TEXT,
+    score REAL,
+    graded_at TEXT NOT NULL,
+    PRIMARY KEY (submission_id, graded_at)
+);
+CREATE INDEX IF NOT EXISTS ix_grade_events_course_time
+    ON grade_events (course_id, graded_at, grader_id);
+CREATE INDEX IF NOT EXISTS ix_grade_events_user_assignment
+    ON grade_events (course_id, user_id, assignment_id, graded_at);
+CREATE INDEX IF NOT EXISTS ix_grade_events_grader_time
+    ON grade_events (course_id, grader_id, graded_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    course_id INTEGER NOT NULL,
+    resource TEXT NOT NULL,
+    synced_at REAL,
+    watermark TEXT,
+    cursor TEXT,
+    PRIMARY KEY (course_id, resource)
+);
+"""
+
+
+def name_sql(course_column: str, user_column: str) -> str:
+    """
+    SQL for the name of the user in `user_column`.  A correlated lookup rather
+    than a join: a user with several enrollments must not multiply rows.
+    """
+    return (f"(SELECT e.name FROM enrollments e WHERE e.course_id = {course_column} "
+            f"AND e.user_id = {user_column} LIMIT 1)")
+
+
+def _flag(value: Any) -> Optional[int]:
+    return None if value is None else int(bool(value))
+
+
+def utc_iso(value: Optional[str]) -> Optional[str]:
+    """
+    A timestamp in Canvas' own format (UTC, whole seconds, `Z`), so stored
+    values compare correctly as strings whatever offset or precision they
+    arrived with.  Bare dates and unparseable values are returned unchanged.
+    """
+    if not value or len(value) <= 10:
+        return value
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class CourseMirror:
+    """SQLite-backed mirror of Canvas course data.  Safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    # -- bookkeeping --------------------------------------------------------
+
+    def mark_synced(self, course_id: int, resource: str, watermark: Optional[str] = None,
+                    cursor: Optional[str] = None) -> None:
+        """Record a completed refresh of `resource` (and its incremental watermark)."""
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT INTO sync_state (course_id, resource, synced_at, watermark, cursor) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (course_id, resource) DO UPDATE SET "
+                "synced_at = excluded.synced_at, "
+                "watermark = COALESCE(excluded.watermark, sync_state.watermark), "
+                "cursor = excluded.cursor",
+                (course_id, resource, time.time(), watermark, cursor),
+            )
+
+    def save_cursor(self, course_id: int, resource: str, cursor: Optional[str]) -> None:
+        """Persist a resume cursor without marking the resource as freshly synced."""
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT INTO sync_state (course_id, resource, cursor) VALUES (?, ?, ?) "
+                "ON CONFLICT (course_id, resource) DO UPDATE SET cursor = excluded.cursor",
+                (course_id, resource, cursor),
+            )
+
+    def sync_state(self, course_id: int, resource: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.db.execute(
+                "SELECT * FROM sync_state WHERE course_id = ? AND resource = ?",
+                (course_id, resource),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def watermark(self, course_id: int, resource: str) -> Optional[str]:
+        """
+        Latest Canvas timestamp held for `resource`, used as the `*_since` bound
+        of the next incremental sync.
+        """
+        sql = {
+            "submissions": "SELECT MAX(MAX(COALESCE(submitted_at, ''), COALESCE(graded_at, ''))) "
+                           "FROM submissions WHERE course_id = ?",
+            "assignments": "SELECT MAX(updated_at) FROM assignments WHERE course_id = ?",
+            "enrollments": "SELECT MAX(updated_at) FROM enrollments WHERE course_id = ?",
+            "grade_events": "SELECT MAX(graded_at) FROM grade_events WHERE course_id = ?",
+        }.get(resource)
+        if sql is None:
+            return None
+        with self._lock:
+            value = self.db.execute(sql, (course_id,)).fetchone()[0]
+        return value or None
+
+    def is_fresh(self, course_id: int, resource: str, max_age: Optional[float] = None) -> bool:
+        """True if `resource` was synced less than `max_age` seconds ago."""
+        state = self.sync_state(course_id, resource)
+        limit = MIRROR_MAX_AGE if max_age is None else max_age
+        return bool(state and state["synced_at"] and time.time() - state["synced_at"] <= limit)
+
+    def extend_fresh(self, course_id: int, resources: Iterable[str]) -> List[str]:
+        """
+        Restart the freshness clock of `resources` that are still fresh, for
+        when a change feed (Canvas Live Events) keeps them current.  Expired
+        resources are left alone: what changed while they were stale is only
+        picked up by a sync.
+
+        Returns:
+            List[str]: The resources extended.
+        """
+        now, extended = time.time(), []
+        with self._lock, self.db:
+            for resource in resources:
+                cur = self.db.execute(
+                    "UPDATE sync_state SET synced_at = ? WHERE course_id = ? AND resource = ? "
+                    "AND synced_at >= ?", (now, course_id, resource, now - MIRROR_MAX_AGE))
+                if cur.rowcount:
+                    extended.append(resource)
+        return extended
+
+    # -- writes (Canvas-shaped dicts in) ------------------------------------
+
+    def upsert_course(self, course: Dict[str, Any]) -> None:
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO courses VALUES (?, ?, ?, ?, ?)",
+                (course["id"], course.get("name"), course.get("account_id"),
+                 course.get("start_at"), course.get("end_at")),
+            )
+
+    def upsert_enrollments(self, course_id: int, enrollments: Iterable[Dict[str, Any]]) -> int:
+        rows = []
+        for e in enrollments:
+            user, grades = e.get("user") or {}, e.get("grades") or {}
+            rows.append((e["id"], course_id, e["user_id"], user.get("name"), user.get("sortable_name"),
+                         user.get("sis_user_id"), e.get("course_section_id"), e.get("type"),
+                         e.get("enrollment_state"), grades.get("current_score"),
+                         grades.get("current_grade"), grades.get("final_score"),
+                         grades.get("final_grade"), e.get("updated_at")))
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO enrollments VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def upsert_assignments(self, course_id: int, assignments: Iterable[Dict[str, Any]]) -> int:
+        rows = [(a["id"], course_id, a.get("name"), a.get("description"), a.get("due_at"),
+                 a.get("points_possible"), json.dumps(a.get("submission_types") or []),
+                 _flag(a.get("is_quiz_assignment")), a.get("quiz_id"), _flag(a.get("published")),
+                 a.get("html_url"), a.get("updated_at"))
+                for a in assignments]
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO assignments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def upsert_submissions(self, course_id: int, submissions: Iterable[Dict[str, Any]]) -> int:
+        rows = [(s["id"], course_id, s["assignment_id"], s["user_id"], s.get("submission_type"),
+                 s.get("workflow_state"), s.get("grade"), s.get("score"), s.get("body"),
+                 s.get("submitted_at"), s.get("graded_at"), _flag(s.get("late")),
+                 _flag(s.get("missing")), _flag(s.get("excused")), s.get("preview_url"))
+                for s in submissions]
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO submissions VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def upsert_quizzes(self, course_id: int, quizzes: Iterable[Dict[str, Any]]) -> int:
+        rows = [(q["id"], course_id, q.get("title"), q.get("quiz_type"), q.get("assignment_id"),
+                 q.get("points_possible"), q.get("due_at"), _flag(q.get("published")),
+                 q.get("html_url"))
+                for q in quizzes]
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO quizzes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def upsert_grade_events(self, course_id: int, events: Iterable[Dict[str, Any]]) -> int:
+        rows = [(course_id, ev["id"], ev.get("assignment_id"), ev.get("user_id"),
+                 ev.get("grader_id"), ev.get("previous_grade"), ev.get("new_grade"),
+                 ev.get("score"), utc_iso(ev.get("graded_at") or ev.get("new_graded_at")))
+                for ev in events]
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO grade_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def patch_rows(self, table: str, key_columns: Iterable[str],
+                   rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply partial rows (mirror column names): update the given, non-None
+        columns of the row matching `key_columns`, or insert it if there is none.
+        Unknown columns are ignored.  All rows are applied in one transaction.
+
+        Returns:
+            int: Rows updated or inserted.
+        """
+        keys = list(key_columns)
+        with self._lock, self.db:
+            columns = {r[1] for r in self.db.execute(f"PRAGMA table_info({table})")}
+            n = 0
+            for row in rows:
+                values = {k: v for k, v in row.items()
+                          if k in columns and k not in keys and v is not None}
+                where = " AND ".join(f"{k} = ?" for k in keys)
+                params = tuple(row[k] for k in keys)
+                cur = None
+                if values:
+                    cur = self.db.execute(
+                        f"UPDATE {table} SET {', '.join(f'{k} = ?' for k in values)} "
+                        f"WHERE {where}", tuple(values.values()) + params)
+                if cur is None or cur.rowcount == 0:
+                    if self.db.execute(f"SELECT 1 FROM {table} WHERE {where}",
+                                       params).fetchone() is None:
+                        full = {**values, **{k: row[k] for k in keys}}
+                        try:
+                            self.db.execute(
+                                f"INSERT INTO {table} ({', '.join(full)}) "
+                                f"VALUES ({', '.join('?' for _ in full)})", tuple(full.values()))
+                        except sqlite3.IntegrityError:
+                            continue  # too partial to insert (a NOT NULL column is missing)
+                n += 1
+        return n
+
+    # -- reads (Canvas-shaped dicts out) ------------------------------------
+
+    def has_grade_event(self, submission_id: int, graded_at: str) -> bool:
+        with self._lock:
+            return self.db.execute(
+                "SELECT 1 FROM grade_events WHERE submission_id = ? AND graded_at = ?",
+                (submission_id, graded_at),
+            ).fetchone() is not None
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(r) for r in self.db.execute(sql, params).fetchall()]
+
+    def assignments(self, course_id: int) -> List[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT * FROM assignments WHERE course_id = ? ORDER BY due_at, id", (course_id,))
+        for r in rows:
+            r["submission_types"] = json.loads(r["submission_types"] or "[]")
+            r["is_quiz_assignment"] = bool(r["is_quiz_assignment"])
+            r["published"] = bool(r["published"])
+        return rows
+
+    def submissions(self, course_id: int, assignment_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        sql = (f"SELECT s.*, {name_sql('s.course_id', 's.user_id')} AS user_name "
+               "FROM submissions s WHERE s.course_id = ?")
+        params: tuple = (course_id,)
+        if assignment_id is not None:
+            sql += " AND s.assignment_id = ?"
+            params += (assignment_id,)
+        rows = self._query(sql + " ORDER BY s.assignment_id, s.user_id", params)
+        for r in rows:
+            r["late"], r["missing"] = bool(r["late"]), bool(r["missing"])
+            r["user"] = {"id": r["user_id"], "name": r.pop("user_name")}
+        return rows
+
+    def enrollments(self, course_id: int, enrollment_type: str = "StudentEnrollment",
+                    state: str = "active") -> List[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT * FROM enrollments WHERE course_id = ? AND enrollment_type = ? "
+            "AND enrollment_state = ? ORDER BY sortable_name",
+            (course_id, enrollment_type, state))
+        return [{
+            "id": r["id"],
+            "user_id": r["user_id"],
+            "course_section_id": r["section_id"],
+            "type": r["enrollment_type"],
+            "enrollment_state": r["enrollment_state"],
+            "updated_at": r["updated_at"],
+            "user": {"id": r["user_id"], "name": r["name"], "sortable_name": r["sortable_name"],
+                     "sis_user_id": r["sis_user_id"]},
+            "grades": {"current_score": r["current_score"], "current_grade": r["current_grade"],
+                       "final_score": r["final_score"], "final_grade": r["final_grade"]},
+        } for r in rows]
+
+    def grade_events(self, course_id: int, user_id: Optional[int] = None,
+                     assignment_id: Optional[int] = None, grader_id: Optional[int] = None,
+                     since: Optional[str] = None, until: Optional[str] = None,
+                     limit: int = -1) -> List[Dict[str, Any]]:
+        """
+        Grade-change events, newest first, with names and the current grade joined in.
+
+        `since` / `until` bound `graded_at` (UTC ISO, until exclusive).
+        """
+        sql = (f"SELECT g.*, {name_sql('g.course_id', 'g.user_id')} AS user_name, "
+               f"{name_sql('g.course_id', 'g.grader_id')} AS grader, "
+               "a.name AS assignment_name, s.grade AS current_grade FROM grade_events g "
+               "LEFT JOIN assignments a ON a.id = g.assignment_id "
+               "LEFT JOIN submissions s ON s.id = g.submission_id "
+               "WHERE g.course_id = ?")
+        params: tuple = (course_id,)
+        for column, value in (("user_id", user_id), ("assignment_id", assignment_id),
+                              ("grader_id", grader_id)):
+            if value is not None:
+                sql += f" AND g.{column} = ?"
+                params += (value,)
+        if since is not None:
+            sql += " AND g.graded_at >= ?"
+            params += (since,)
+        if until is not None:
+            sql += " AND g.graded_at < ?"
+            params += (until,)
+        return self._query(sql + " ORDER BY g.graded_at DESC LIMIT ?", params + (limit,))
+
+    def quizzes(self, course_id: int) -> List[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM quizzes WHERE course_id = ? ORDER BY id", (course_id,))
+        for r in rows:
+            r["published"] = bool(r["published"])
+        return rows
+
+    # -- full build ---------------------------------------------------------
+
+    def build(self, course_id: int) -> Dict[str, int]:
+        """
+        Download the whole course into the mirror and mark every resource fresh.
+
+        Submissions are fetched per assignment concurrently.  Each resource's
+        watermark is recorded so later refreshes can be incremental
+        (see `canvas_agent.course_sync`).
+
+        Returns:
+            Dict[str, int]: Row counts per resource.
+        """
+        counts: Dict[str, int] = {}
+        self.upsert_course(canvas_get(f"courses/{course_id}"))
+        self.mark_synced(course_id, "course")
+
+        counts["enrollments"] = self.upsert_enrollments(course_id, canvas_paginate(
+            f"courses/{course_id}/enrollments", params={"include[]": ["grades"]}))
+        self.mark_synced(course_id, "enrollments", self.watermark(course_id, "enrollments"))
+        self.mark_synced(course_id, "roster")
+
+        assignments = list(canvas_paginate(f"courses/{course_id}/assignments"))
+        counts["assignments"] = self.upsert_assignments(course_id, assignments)
+        self.mark_synced(course_id, "assignments", self.watermark(course_id, "assignments"))
+
+        def pull(assignment: Dict[str, Any]) -> int:
+            return self.upsert_submissions(course_id, canvas_paginate(
+                f"courses/{course_id}/assignments/{assignment['id']}/submissions"))
+
+        counts["submissions"] = sum(canvas_map(pull, assignments))
+        self.mark_synced(course_id, "submissions", self.watermark(course_id, "submissions"))
+
+        counts["quizzes"] = self.upsert_quizzes(
+            course_id, canvas_paginate(f"courses/{course_id}/quizzes"))
+        self.mark_synced(course_id, "quizzes")
+
+        counts["grade_events"] = GradeHistoryIngester(self, course_id).run()
+        return counts
+
+
+_mirror: Optional[CourseMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> Optional[CourseMirror]:
+    """Return the process-wide mirror, or None if `CANVAS_MIRROR_PATH` is not set."""
+    global _mirror
+    if not MIRROR_PATH:
+        return None
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = CourseMirror(MIRROR_PATH)
+        return _mirror
+
+
+def fresh_mirror(course_id: int, resource: str) -> Optional[CourseMirror]:
+    """Return the mirror if it holds a fresh copy of `resource`, else None."""
+    mirror = get_mirror()
+    if mirror is not None and mirror.is_fresh(course_id, resource):
+        return mirror
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the local Canvas course mirror.")
+    parser.add_argument("command", choices=["build", "status"])
+    parser.add_argument("--course", type=int, default=DEFAULT_COURSE_ID)
+    parser.add_argument("--db", default=MIRROR_PATH or "canvas_mirror.db")
+    args = parser.parse_args()
+
+    mirror = CourseMirror(args.db)
+    if args.command == "build":
+        started = time.time()
+        counts = mirror.build(args.course)
+        print(f"Mirrored course {args.course} into {args.db} in {time.time() - started:.1f}s")
+        for resource, n in counts.items():
+            print(f"  {resource}: {n}")
+    else:
+        for resource in RESOURCES:
+            state = mirror.sync_state(args.course, resource)
+            if state and state["synced_at"]:
+                print(f"  {resource}: synced {time.time() - state['synced_at']:.0f}s ago")
+            elif state and state["cursor"]:
+                print(f"  {resource}: in progress, resuming from {state['cursor']}")
+            else:
+                print(f"  {resource}: never synced")
+
+
+if __name__ == "__main__":
+    main()
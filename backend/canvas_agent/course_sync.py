@@ -0,0 +1,205 @@
+"""
+INCREMENTAL COURSE SYNC
+=======================
+
+Keeps the local course mirror (`canvas_agent.course_mirror`) current by
+fetching only what changed since the last refresh.  Each resource keeps its
+own watermark in the mirror's `sync_state` table:
+
+* submissions   – `students/submissions` with `submitted_since` and
+                  `graded_since` at the watermark, plus unsubmitted rows of
+                  assignments whose due date passed since the last sync
+                  (they turn `missing` without any timestamp changing)
+* grade events  – the gradebook history feed, continued from its saved
+                  cursor (see `canvas_agent.grade_history`)
+* assignments   – a description-less listing; only rows whose `updated_at`
+                  is past the watermark are re-fetched in full
+* enrollments   – scores are re-read only for students whose submissions
+                  changed; the full roster listing runs at most once per
+                  `ROSTER_MAX_AGE` seconds
+* quizzes       – a single short listing
+
+Everything is applied as upserts, so re-reading a boundary row is harmless.
+
+    python -m canvas_agent.course_sync                 # DEFAULT_COURSE_ID
+    python -m canvas_agent.course_sync --course 123 --db mirror.db
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from canvas_agent.course_mirror import MIRROR_PATH, CourseMirror, get_mirror
+from canvas_agent.grade_history import GradeHistoryIngester
+from canvas_agent.openai_tools import (
+    DEFAULT_COURSE_ID,
+    canvas_get,
+    canvas_map,
+    canvas_paginate,
+)
+
+ROSTER_MAX_AGE = float(os.getenv("CANVAS_ROSTER_MAX_AGE", "86400"))
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class CourseSync:
+    """Incremental refresh of one mirror.  Every `sync_*` method returns a change count."""
+
+    def __init__(self, mirror: CourseMirror):
+        self.mirror = mirror
+
+    def _last(self, course_id: int, resource: str) -> Optional[Dict[str, Any]]:
+        return self.mirror.sync_state(course_id, resource)
+
+    # -- submissions --------------------------------------------------------
+
+    def sync_submissions(self, course_id: int) -> Set[int]:
+        """
+        Upsert submissions submitted or graded since the watermark.
+
+        Returns:
+            Set[int]: User ids whose submissions changed.
+        """
+        state = self._last(course_id, "submissions")
+        since = state and state["watermark"]
+        if not since:
+            return self._full_submissions(course_id)
+
+        changed: Dict[int, Dict[str, Any]] = {}
+        for bound in ("submitted_since", "graded_since"):
+            for sub in canvas_paginate(f"courses/{course_id}/students/submissions",
+                                       params={"student_ids[]": "all", bound: since}):
+                changed[sub["id"]] = sub
+
+        # Assignments that came due since the last sync flip unsubmitted work
+        # to missing without touching submitted_at/graded_at.
+        last_run = datetime.fromtimestamp(state["synced_at"], timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ")
+        now = _utcnow()
+        came_due = [a["id"] for a in self.mirror.assignments(course_id)
+                    if a["due_at"] and last_run < a["due_at"] <= now]
+        if came_due:
+            for sub in canvas_paginate(f"courses/{course_id}/students/submissions",
+                                       params={"student_ids[]": "all",
+                                               "assignment_ids[]": came_due,
+                                               "workflow_state": "unsubmitted"}):
+                changed[sub["id"]] = sub
+
+        self.mirror.upsert_submissions(course_id, changed.values())
+        self.mirror.mark_synced(course_id, "submissions",
+                                self.mirror.watermark(course_id, "submissions"))
+        return {sub["user_id"] for sub in changed.values()}
+
+    def _full_submissions(self, course_id: int) -> Set[int]:
+        assignments = self.mirror.assignments(course_id)
+
+        def pull(assignment: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return list(canvas_paginate(
+                f"courses/{course_id}/assignments/{assignment['id']}/submissions"))
+
+        rows = [sub for page in canvas_map(pull, assignments) for sub in page]
+        self.mirror.upsert_submissions(course_id, rows)
+        self.mirror.mark_synced(course_id, "submissions",
+                                self.mirror.watermark(course_id, "submissions"))
+        return {sub["user_id"] for sub in rows}
+
+    # -- gradebook history --------------------------------------------------
+
+    def sync_grade_events(self, course_id: int) -> int:
+        """Continue the gradebook history feed from its saved cursor."""
+        return GradeHistoryIngester(self.mirror, course_id).run()
+
+    # -- assignments --------------------------------------------------------
+
+    def sync_assignments(self, course_id: int) -> int:
+        """List assignments without descriptions, then re-fetch only the updated ones."""
+        state = self._last(course_id, "assignments")
+        since = (state and state["watermark"]) or ""
+        listing = canvas_paginate(f"courses/{course_id}/assignments",
+                                  params={"exclude_response_fields[]": ["description", "rubric"]})
+        updated = sorted((a for a in listing if (a.get("updated_at") or "") > since),
+                         key=lambda a: a.get("updated_at") or "")
+        full = canvas_map(lambda a: canvas_get(f"courses/{course_id}/assignments/{a['id']}"),
+                          updated)
+        self.mirror.upsert_assignments(course_id, full)
+        self.mirror.mark_synced(course_id, "assignments",
+                                self.mirror.watermark(course_id, "assignments"))
+        return len(full)
+
+    # -- enrollments --------------------------------------------------------
+
+    def sync_enrollments(self, course_id: int, changed_users: Set[int]) -> int:
+        """
+        Refresh grades for `changed_users`; re-list the whole roster only when
+        the last full listing is older than `ROSTER_MAX_AGE`.
+        """
+        roster = self._last(course_id, "roster")
+        if not roster or time.time() - roster["synced_at"] > ROSTER_MAX_AGE:
+            n = self.mirror.upsert_enrollments(course_id, canvas_paginate(
+                f"courses/{course_id}/enrollments", params={"include[]": ["grades"]}))
+            self.mirror.mark_synced(course_id, "roster")
+        else:
+            def pull(user_id: int) -> List[Dict[str, Any]]:
+                return list(canvas_paginate(f"courses/{course_id}/enrollments",
+                                            params={"user_id": user_id,
+                                                    "include[]": ["grades"]}))
+
+            rows = [e for page in canvas_map(pull, sorted(changed_users)) for e in page]
+            n = self.mirror.upsert_enrollments(course_id, rows)
+        self.mirror.mark_synced(course_id, "enrollments",
+                                self.mirror.watermark(course_id, "enrollments"))
+        return n
+
+    # -- quizzes ------------------------------------------------------------
+
+    def sync_quizzes(self, course_id: int) -> int:
+        n = self.mirror.upsert_quizzes(course_id, canvas_paginate(f"courses/{course_id}/quizzes"))
+        self.mirror.mark_synced(course_id, "quizzes")
+        return n
+
+    # -- all ----------------------------------------------------------------
+
+    def refresh(self, course_id: int) -> Dict[str, int]:
+        """
+        Bring every resource of `course_id` up to date.
+
+        Returns:
+            Dict[str, int]: Rows upserted per resource.
+        """
+        counts = {"assignments": self.sync_assignments(course_id)}
+        changed_users = self.sync_submissions(course_id)
+        counts["submissions_users"] = len(changed_users)
+        counts["enrollments"] = self.sync_enrollments(course_id, changed_users)
+        counts["grade_events"] = self.sync_grade_events(course_id)
+        counts["quizzes"] = self.sync_quizzes(course_id)
+        return counts
+
+
+def sync_course(course_id: int, mirror: Optional[CourseMirror] = None) -> Dict[str, int]:
+    """Incrementally refresh `course_id` in `mirror` (default: the configured mirror)."""
+    mirror = mirror or get_mirror()
+    if mirror is None:
+        raise RuntimeError("No course mirror configured; set CANVAS_MIRROR_PATH")
+    return CourseSync(mirror).refresh(course_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally refresh the Canvas course mirror.")
+    parser.add_argument("--course", type=int, default=DEFAULT_COURSE_ID)
+    parser.add_argument("--db", default=MIRROR_PATH or "canvas_mirror.db")
+    args = parser.parse_args()
+
+    started = time.time()
+    counts = sync_course(args.course, CourseMirror(args.db))
+    print(f"Synced course {args.course} in {time.time() - started:.1f}s")
+    for resource, n in counts.items():
+        print(f"  {resource}: {n}")
+
+
+if __name__ == "__main__":
+    main()
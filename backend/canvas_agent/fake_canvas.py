@@ -0,0 +1,1697 @@
+"""
+FAKE CANVAS SERVER
+==================
+
+A local stand-in for the Canvas REST API so the Canvas tools can be
+benchmarked and load-tested without an institution token.
+
+* Synthetic course of configurable size (students, assignments, quizzes)
+* Injected latency with jitter on every request
+* Canvas-style `Link` header pagination (`per_page` / `page`)
+* Canvas-style rate limiting (`X-Rate-Limit-Remaining`, `X-Request-Cost`,
+  403 "Rate Limit Exceeded" once the bucket is empty)
+
+Only the endpoints the tools use are implemented.  Run it with:
+
+    python -m canvas_agent.fake_canvas --students 400 --latency-ms 80 --port 8010
+
+and point the tools at it:
+
+    CANVAS_API_URL=http://127.0.0.1:8010 CANVAS_API_TOKEN=fake
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, get_args, get_origin
+from urllib.parse import urlencode
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+# ────────────────────────────────────────────────────────────────────────────────
+# C O N F I G
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+class FakeCanvasConfig(BaseModel):
+    """Shape of the synthetic course and behaviour of the fake server."""
+
+    seed: int = 42
+    course_id: int = 11883051
+    account_id: int = 1
+    term_id: int = 1
+    past_terms: int = 8
+    # Additional, initially empty courses (e.g. targets for copying content).
+    extra_course_ids: List[int] = []
+    sub_accounts: int = 3
+    students: int = 50
+    assignments: int = 12
+    quizzes: int = 3
+    questions_per_quiz: int = 10
+    sections: int = 2
+    graders: int = 3
+    files: int = 8
+    file_kb: int = 64
+    pages: int = 6
+    # Project groups in the course's "Project Groups" category, students split evenly.
+    groups: int = 6
+    # Extra synthetic courses in the account: a roster with grades and nothing else.
+    account_courses: int = 0
+    # Module lists omit inline items when the course has more module items than this.
+    inline_items_max: int = 500
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+
+    default_per_page: int = 10
+    max_per_page: int = 100
+
+    rate_limit: bool = True
+    bucket_size: float = 700.0
+    leak_per_second: float = 10.0
+    request_cost: float = 1.0
+
+
+FIRST_NAMES = ["Ada", "Alan", "Grace", "Edsger", "Barbara", "Donald", "Ken",
+               "Margaret", "Linus", "Radia", "Tim", "Frances", "John", "Niklaus",
+               "Shafi", "Leslie", "Judea", "Yoshua", "Fei-Fei", "Guido"]
+LAST_NAMES = ["Lovelace", "Turing", "Hopper", "Dijkstra", "Liskov", "Knuth",
+              "Thompson", "Hamilton", "Torvalds", "Perlman", "Berners-Lee",
+              "Allen", "McCarthy", "Wirth", "Goldwasser", "Lamport", "Pearl",
+              "Bengio", "Li", "van Rossum"]
+LOREM = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do "
+         "eiusmod tempor incididunt ut labore et dolore magna aliqua. ")
+
+
+def _iso(dt: Optional[datetime]) -> Optional[str]:
+    if dt is None:
+        return None
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _letter(score: Optional[float]) -> Optional[str]:
+    if score is None:
+        return None
+    for cutoff, letter in ((93, "A"), (90, "A-"), (87, "B+"), (83, "B"),
+                           (80, "B-"), (77, "C+"), (73, "C"), (70, "C-"),
+                           (60, "D")):
+        if score >= cutoff:
+            return letter
+    return "F"
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# S Y N T H E T I C   D A T A
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+class FakeCourse:
+    """In-memory synthetic course.  All records are plain Canvas-shaped dicts."""
+
+    def __init__(self, config: FakeCanvasConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.term_start = datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc)
+        self.now = self.term_start + timedelta(weeks=10)
+        self._next_id = 900000
+
+        self.course: Dict[str, Any] = {}
+        self.sections: List[Dict[str, Any]] = []
+        self.users: Dict[int, Dict[str, Any]] = {}
+        self.enrollments: List[Dict[str, Any]] = []
+        self.assignments: Dict[int, Dict[str, Any]] = {}
+        self.submissions: Dict[tuple, Dict[str, Any]] = {}
+        self.quizzes: Dict[int, Dict[str, Any]] = {}
+        self.questions: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self.quiz_groups: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self.quiz_submissions: Dict[int, List[Dict[str, Any]]] = {}
+        # (quiz_id, user_id) -> Canvas `submission_data` of the latest attempt
+        self.quiz_answers: Dict[tuple, List[Dict[str, Any]]] = {}
+        self.grade_events: List[Dict[str, Any]] = []
+        # submission id -> its grade events, to update `current_*` without a rescan
+        self.grade_events_by_sub: Dict[int, List[Dict[str, Any]]] = {}
+        self.overrides: Dict[int, List[Dict[str, Any]]] = {}
+        self.folders: Dict[int, Dict[str, Any]] = {}
+        self.files: Dict[int, Dict[str, Any]] = {}
+        self.file_blobs: Dict[int, bytes] = {}
+        # upload token -> preflight of a file upload that has not arrived yet
+        self.pending_uploads: Dict[str, Dict[str, Any]] = {}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.modules: Dict[int, Dict[str, Any]] = {}
+        # course id -> (course, student enrollments) of the account_courses
+        self.other_courses: Dict[int, tuple] = {}
+        self.module_items: Dict[int, List[Dict[str, Any]]] = {}
+        self.group_categories: Dict[int, Dict[str, Any]] = {}
+        self.groups: Dict[int, Dict[str, Any]] = {}
+        self.group_members: Dict[int, List[int]] = {}
+        self.group_stream: Dict[int, List[Dict[str, Any]]] = {}
+
+        self._build()
+
+    def next_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    # -- generation ---------------------------------------------------------
+
+    def _build(self) -> None:
+        cfg, rng = self.config, self.rng
+        self.course = {
+            "id": cfg.course_id,
+            "name": f"Fake Course {cfg.course_id}",
+            "course_code": "FAKE 101",
+            "account_id": cfg.account_id,
+            "root_account_id": cfg.account_id,
+            "enrollment_term_id": cfg.term_id,
+            "workflow_state": "available",
+            "start_at": _iso(self.term_start),
+            "end_at": _iso(self.term_start + timedelta(weeks=16)),
+            "total_students": cfg.students,
+        }
+        self.sections = [
+            {"id": 7000 + i, "name": f"Section {i + 1}", "course_id": cfg.course_id}
+            for i in range(max(cfg.sections, 1))
+        ]
+
+        staff = [("TeacherEnrollment", 1)] + [("TaEnrollment", cfg.graders)]
+        uid = 1000
+        for etype, count in staff + [("StudentEnrollment", cfg.students)]:
+            for _ in range(count):
+                uid += 1
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                section = rng.choice(self.sections)
+                self.users[uid] = {
+                    "id": uid,
+                    "name": f"{first} {last}",
+                    "sortable_name": f"{last}, {first}",
+                    "short_name": first,
+                    "sis_user_id": f"A{uid:08d}",
+                    "login_id": f"{first.lower()}.{last.lower()}{uid}",
+                }
+                state = "inactive" if rng.random() < 0.03 else "active"
+                self.enrollments.append({
+                    "id": 50000 + uid,
+                    "user_id": uid,
+                    "course_id": cfg.course_id,
+                    "course_section_id": section["id"],
+                    "type": etype,
+                    "role": etype,
+                    "enrollment_state": state,
+                    "created_at": _iso(self.term_start - timedelta(days=7)),
+                    "updated_at": _iso(self.term_start - timedelta(days=rng.randint(0, 7))),
+                    "last_activity_at": _iso(self.now - timedelta(hours=rng.randint(1, 300))),
+                })
+        self.graders = [e["user_id"] for e in self.enrollments
+                        if e["type"] in ("TeacherEnrollment", "TaEnrollment")]
+
+        quiz_slots = set(rng.sample(range(cfg.assignments),
+                                    min(cfg.quizzes, cfg.assignments)))
+        for i in range(cfg.assignments):
+            aid = 5000 + i
+            due = self.term_start + timedelta(weeks=i, days=4)
+            is_quiz = i in quiz_slots
+            self.assignments[aid] = {
+                "id": aid,
+                "course_id": cfg.course_id,
+                "name": f"{'Quiz' if is_quiz else 'Homework'} {i + 1}",
+                "description": "<p>" + LOREM * 20 + "</p>",
+                "position": i + 1,
+                "assignment_group_id": 3000 + (1 if is_quiz else 0),
+                "due_at": _iso(due),
+                "points_possible": 10.0 if is_quiz else float(rng.choice([20, 50, 100])),
+                "grading_type": "points",
+                "submission_types": ["online_quiz"] if is_quiz else ["online_text_entry"],
+                "is_quiz_assignment": is_quiz,
+                "quiz_id": None,
+                "published": True,
+                "html_url": f"https://fake.instructure.com/courses/{cfg.course_id}/assignments/{aid}",
+                "created_at": _iso(self.term_start - timedelta(days=10)),
+                "updated_at": _iso(min(due, self.now) - timedelta(days=rng.randint(1, 5))),
+            }
+            if is_quiz:
+                self._build_quiz(self.assignments[aid])
+
+        for aid, asgn in self.assignments.items():
+            for enr in self.enrollments:
+                if enr["type"] == "StudentEnrollment":
+                    self._build_submission(asgn, enr["user_id"])
+
+        self._recompute_grades()
+
+        # Separate stream so the course data above does not depend on `files`.
+        frng = random.Random(f"{cfg.seed}:files")
+        folders = ["", "Lectures", "Lectures/Week 1", "Datasets"]
+        for i in range(cfg.files):
+            size = frng.randint(cfg.file_kb * 512, cfg.file_kb * 1536)
+            self.add_file(cfg.course_id, f"file_{i + 1}.bin", frng.randbytes(size),
+                          "application/octet-stream", folders[i % len(folders)],
+                          when=self.term_start + timedelta(days=i))
+
+        titles = ["Syllabus", "Late Work Policy", "Academic Integrity", "Office Hours",
+                  "Grading Scale", "Course Resources"]
+        for i in range(cfg.pages):
+            title = titles[i] if i < len(titles) else f"Page {i + 1}"
+            body = (f"<h2>{title}</h2><p>{LOREM * 3}</p><ul>"
+                    + "".join(f"<li>Rule {j + 1}: {LOREM[:60]}</li>" for j in range(4))
+                    + f"</ul><p>See <a href=\"https://example.com/{i}\">details</a>.</p>"
+                    + "<script>trackPageView();</script>")
+            self.add_page(title, body, front_page=(i == 0),
+                          when=self.term_start - timedelta(days=cfg.pages - i))
+
+        crng = random.Random(f"{cfg.seed}:account_courses")
+        depts = ["MATH", "CHEM", "HIST", "ECON", "BIOL", "PHYS", "ENGL", "PSYC"]
+        for i in range(cfg.account_courses):
+            cid = 12_000_000 + i
+            mean, students = crng.uniform(65, 92), crng.randint(0, 300)
+            enrollments = []
+            for k in range(students):
+                uid = 3_000_000 + i * 1000 + k
+                score = None if crng.random() < 0.05 else round(
+                    max(0.0, min(110.0, crng.gauss(mean, 11))), 2)
+                enrollments.append({
+                    "id": 6_000_000 + i * 1000 + k, "user_id": uid, "course_id": cid,
+                    "type": "StudentEnrollment", "role": "StudentEnrollment",
+                    "enrollment_state": "active",
+                    "user": {"id": uid, "name": f"Student {uid}", "sortable_name": f"{uid}, Student"},
+                    "grades": {"current_score": score, "current_grade": _letter(score),
+                               "final_score": score, "final_grade": _letter(score)},
+                })
+            course = {"id": cid, "name": f"{depts[i % len(depts)]} {101 + i}",
+                      "course_code": f"{depts[i % len(depts)]}{101 + i}",
+                      "account_id": cfg.account_id, "enrollment_term_id": cfg.term_id,
+                      "workflow_state": "available", "total_students": students}
+            self.other_courses[cid] = (course, enrollments)
+
+        grng = random.Random(f"{cfg.seed}:groups")
+        if cfg.groups:
+            category = self.add_group_category("Project Groups")
+            students = self.students()
+            grng.shuffle(students)
+            for i in range(cfg.groups):
+                group = self.add_group(category["id"], f"Project Team {i + 1}")
+                self.group_members[group["id"]] = sorted(students[i::cfg.groups])
+                for k in range(grng.randint(0, 4)):
+                    self.group_stream[group["id"]].append({
+                        "id": self.next_id(), "type": "DiscussionTopic",
+                        "title": f"Team {i + 1} standup {k + 1}",
+                        "message": f"<p>{LOREM[:80]}</p>",
+                        "created_at": _iso(self.now - timedelta(days=k)),
+                        "updated_at": _iso(self.now - timedelta(days=k)),
+                    })
+
+        # One module per week: overview header, a reading link, the week's assignment.
+        for i, asgn in enumerate(self.assignments.values()):
+            mid = 8000 + i
+            self.modules[mid] = {
+                "id": mid, "name": f"Week {i + 1}", "position": i + 1,
+                "unlock_at": _iso(self.term_start + timedelta(weeks=i)),
+                "require_sequential_progress": False, "published": True,
+                "prerequisite_module_ids": [mid - 1] if i else [],
+                "items_url": f"/api/v1/courses/{cfg.course_id}/modules/{mid}/items",
+            }
+            self.module_items[mid] = []
+            self.add_module_item(mid, {"type": "SubHeader", "title": f"Week {i + 1} overview"})
+            self.add_module_item(mid, {"type": "ExternalUrl", "title": f"Reading {i + 1}",
+                                       "external_url": f"https://example.com/reading/{i + 1}"})
+            quiz_id = asgn.get("quiz_id")
+            self.add_module_item(mid, {"type": "Quiz" if quiz_id else "Assignment",
+                                       "title": asgn["name"],
+                                       "content_id": quiz_id or asgn["id"]})
+
+    def _build_quiz(self, asgn: Dict[str, Any]) -> None:
+        cfg, rng = self.config, self.rng
+        qid = 20000 + asgn["id"]
+        asgn["quiz_id"] = qid
+        self.quizzes[qid] = {
+            "id": qid,
+            "course_id": cfg.course_id,
+            "title": asgn["name"],
+            "description": "<p>" + LOREM * 5 + "</p>",
+            "quiz_type": "assignment",
+            "assignment_id": asgn["id"],
+            "points_possible": asgn["points_possible"],
+            "question_count": cfg.questions_per_quiz,
+            "due_at": asgn["due_at"],
+            "lock_at": None,
+            "unlock_at": None,
+            "time_limit": 30,
+            "allowed_attempts": 1,
+            "published": True,
+            "html_url": f"https://fake.instructure.com/courses/{cfg.course_id}/quizzes/{qid}",
+        }
+        self.questions[qid] = {}
+        self.quiz_groups[qid] = {}
+        for n in range(cfg.questions_per_quiz):
+            question_id = qid * 100 + n
+            answers = [{"id": question_id * 10 + k, "text": f"Option {k + 1}",
+                        "weight": 100 if k == 0 else 0, "comments": ""}
+                       for k in range(4)]
+            rng.shuffle(answers)
+            self.questions[qid][question_id] = {
+                "id": question_id,
+                "quiz_id": qid,
+                "quiz_group_id": None,
+                "position": n + 1,
+                "question_name": f"Question {n + 1}",
+                "question_type": "multiple_choice_question",
+                "question_text": "<p>" + LOREM * 3 + "</p>",
+                "points_possible": round(asgn["points_possible"] / cfg.questions_per_quiz, 2),
+                "correct_comments": "",
+                "incorrect_comments": "",
+                "neutral_comments": "",
+                "answers": answers,
+            }
+        self.quiz_submissions[qid] = []
+
+    def _build_submission(self, asgn: Dict[str, Any], user_id: int) -> None:
+        rng = self.rng
+        due = datetime.fromisoformat(asgn["due_at"].replace("Z", "+00:00"))
+        sub = {
+            "id": self.next_id(),
+            "user_id": user_id,
+            "assignment_id": asgn["id"],
+            "course_id": self.config.course_id,
+            "attempt": None,
+            "body": None,
+            "grade": None,
+            "score": None,
+            "entered_score": None,
+            "submission_type": None,
+            "workflow_state": "unsubmitted",
+            "submitted_at": None,
+            "graded_at": None,
+            "grader_id": None,
+            "late": False,
+            "missing": False,
+            "excused": False,
+            "preview_url": f"https://fake.instructure.com/courses/{self.config.course_id}"
+                           f"/assignments/{asgn['id']}/submissions/{user_id}?preview=1",
+        }
+        self.submissions[(asgn["id"], user_id)] = sub
+        if due > self.now:
+            return
+        if rng.random() < 0.08:
+            sub["missing"] = True
+            return
+
+        submitted = due + timedelta(hours=rng.uniform(-72, 30))
+        sub.update({
+            "attempt": 1,
+            "submission_type": asgn["submission_types"][0],
+            "workflow_state": "submitted",
+            "submitted_at": _iso(submitted),
+            "late": submitted > due,
+        })
+        if not asgn["is_quiz_assignment"]:
+            sub["body"] = "<p>" + LOREM * rng.randint(10, 40) + "</p>"
+        graded_at = submitted + timedelta(days=rng.uniform(0.5, 6))
+        if rng.random() < 0.9 and graded_at < self.now:
+            ability = rng.gauss(0.8, 0.12)
+            score = round(max(0.0, min(1.0, ability)) * asgn["points_possible"], 1)
+            self._grade(sub, score, rng.choice(self.graders), graded_at)
+            regraded_at = graded_at + timedelta(days=rng.uniform(1, 3))
+            if rng.random() < 0.05 and regraded_at < self.now:
+                regrade = min(asgn["points_possible"], score + rng.choice([1, 2, 5]))
+                self._grade(sub, regrade, rng.choice(self.graders), regraded_at)
+        if asgn["is_quiz_assignment"]:
+            self._build_quiz_submission(asgn, sub)
+
+    def _build_quiz_submission(self, asgn: Dict[str, Any], sub: Dict[str, Any]) -> None:
+        qid = asgn["quiz_id"]
+        started = datetime.fromisoformat(sub["submitted_at"].replace("Z", "+00:00"))
+        self.quiz_submissions[qid].append({
+            "id": self.next_id(),
+            "quiz_id": qid,
+            "user_id": sub["user_id"],
+            "submission_id": sub["id"],
+            "attempt": 1,
+            "score": sub["score"],
+            "kept_score": sub["score"],
+            "fudge_points": 0,
+            "started_at": _iso(started - timedelta(minutes=self.rng.randint(5, 30))),
+            "finished_at": sub["submitted_at"],
+            "workflow_state": "complete" if sub["score"] is not None else "pending_review",
+            "validation_token": "fake",
+        })
+        self._answer_quiz(qid, sub)
+
+    def _answer_quiz(self, qid: int, sub: Dict[str, Any]) -> None:
+        """Per-question answers consistent-ish with the student's quiz score."""
+        rng = random.Random(f"{self.config.seed}:answers:{sub['id']}")
+        level = sub["score"] / max(self.assignments[sub["assignment_id"]]["points_possible"], 1) \
+            if sub["score"] is not None else rng.uniform(0.5, 0.9)
+        data = []
+        for question in self.questions[qid].values():
+            hardness = random.Random(f"{self.config.seed}:q:{question['id']}").uniform(-0.3, 0.3)
+            correct = rng.random() < max(0.02, min(0.98, level - hardness))
+            answers = question["answers"]
+            right = [a for a in answers if a.get("weight")]
+            wrong = [a for a in answers if not a.get("weight")]
+            if correct or not wrong:
+                choice = right[0]
+            else:
+                # The first distractor is the most tempting one.
+                choice = rng.choices(wrong, weights=[4] + [1] * (len(wrong) - 1))[0]
+            data.append({"question_id": question["id"], "answer_id": choice["id"],
+                         "correct": bool(choice.get("weight")),
+                         "points": question["points_possible"] if choice.get("weight") else 0.0,
+                         "text": ""})
+        self.quiz_answers[(qid, sub["user_id"])] = data
+
+    def quiz_statistics(self, qid: int) -> Dict[str, Any]:
+        """Canvas `QuizStatistics` for the latest attempts, computed from quiz_answers."""
+        quiz = self.quizzes[qid]
+        rows = {uid: answers for (q, uid), answers in self.quiz_answers.items() if q == qid}
+        totals = {uid: sum(a["points"] for a in answers) for uid, answers in rows.items()}
+        ranked = sorted(totals, key=totals.get)
+        cut = max(1, int(0.27 * len(ranked))) if ranked else 0
+        groups = {"bottom": set(ranked[:cut]), "top": set(ranked[-cut:] if cut else []),
+                  "middle": set(ranked[cut:-cut] if cut else [])}
+
+        questions = []
+        for question in sorted(self.questions[qid].values(), key=lambda q: q.get("position") or 0):
+            picks = {uid: next((a for a in answers if a["question_id"] == question["id"]), None)
+                     for uid, answers in rows.items()}
+            picks = {uid: a for uid, a in picks.items() if a}
+            correct = {uid for uid, a in picks.items() if a["correct"]}
+            answered = len(picks)
+            stat = {
+                "id": str(question["id"]),
+                "question_type": question.get("question_type"),
+                "question_text": question.get("question_text"),
+                "position": question.get("position"),
+                "responses": answered,
+                "answered_student_count": answered,
+                "correct_student_count": len(correct),
+                "incorrect_student_count": answered - len(correct),
+                "correct_student_ratio": len(correct) / answered if answered else 0,
+                "incorrect_student_ratio": 1 - len(correct) / answered if answered else 0,
+                "answers": [],
+                "point_biserials": [],
+            }
+            for name, members in groups.items():
+                stat[f"{name}_student_count"] = len(members)
+                stat[f"correct_{name}_student_count"] = len(members & correct)
+            for answer in question.get("answers", []):
+                chose = [uid for uid, a in picks.items() if a["answer_id"] == answer["id"]]
+                stat["answers"].append({"id": str(answer["id"]), "text": answer.get("text"),
+                                        "weight": answer.get("weight"), "responses": len(chose),
+                                        "correct": bool(answer.get("weight"))})
+                indicator = [1.0 if uid in chose else 0.0 for uid in picks]
+                scores = [totals[uid] for uid in picks]
+                try:
+                    r = statistics.correlation(indicator, scores)
+                except statistics.StatisticsError:
+                    r = None
+                stat["point_biserials"].append({
+                    "answer_id": str(answer["id"]), "point_biserial": r,
+                    "correct": bool(answer.get("weight")),
+                    "distractor": not answer.get("weight")})
+            questions.append(stat)
+
+        scores = list(totals.values())
+        durations = [
+            (datetime.fromisoformat(qs["finished_at"].replace("Z", "+00:00"))
+             - datetime.fromisoformat(qs["started_at"].replace("Z", "+00:00"))).total_seconds()
+            for qs in self.quiz_submissions[qid]]
+        return {
+            "id": str(qid),
+            "url": f"https://fake.instructure.com/api/v1/courses/{self.config.course_id}"
+                   f"/quizzes/{qid}/statistics",
+            "generated_at": _iso(self.now),
+            "multiple_attempts_exist": False,
+            "includes_all_versions": False,
+            "points_possible": quiz.get("points_possible"),
+            "anonymous_survey": False,
+            "question_statistics": questions,
+            "submission_statistics": {
+                "unique_count": len(scores),
+                "score_average": statistics.fmean(scores) if scores else None,
+                "score_high": max(scores) if scores else None,
+                "score_low": min(scores) if scores else None,
+                "score_stdev": statistics.pstdev(scores) if scores else None,
+                "duration_average": statistics.fmean(durations) if durations else None,
+            },
+        }
+
+    def _grade(self, sub: Dict[str, Any], score: float, grader_id: int,
+               graded_at: datetime) -> None:
+        asgn = self.assignments[sub["assignment_id"]]
+        previous = sub["grade"]
+        previous_at = sub["graded_at"]
+        previous_grader = sub["grader_id"]
+        sub.update({
+            "score": score,
+            "entered_score": score,
+            "grade": str(score),
+            "workflow_state": "graded",
+            "graded_at": _iso(graded_at),
+            "grader_id": grader_id,
+        })
+        event = {
+            "id": sub["id"],
+            "assignment_id": asgn["id"],
+            "assignment_name": asgn["name"],
+            "user_id": sub["user_id"],
+            "user_name": self.users[sub["user_id"]]["name"],
+            "grader_id": grader_id,
+            "grader": self.users[grader_id]["name"],
+            "previous_grade": previous,
+            "previous_graded_at": previous_at,
+            "previous_grader": self.users[previous_grader]["name"] if previous_grader else None,
+            "new_grade": str(score),
+            "new_graded_at": _iso(graded_at),
+            "new_grader": self.users[grader_id]["name"],
+            "current_grade": str(score),
+            "current_graded_at": _iso(graded_at),
+            "current_grader": self.users[grader_id]["name"],
+            "graded_at": _iso(graded_at),
+            "score": score,
+            "workflow_state": "graded",
+            "submission_type": sub["submission_type"],
+            "grade_matches_current_submission": True,
+        }
+        self.grade_events.append(event)
+        history = self.grade_events_by_sub.setdefault(sub["id"], [])
+        history.append(event)
+        for earlier in history:
+            earlier["current_grade"] = str(score)
+            earlier["current_graded_at"] = _iso(graded_at)
+            earlier["current_grader"] = self.users[grader_id]["name"]
+
+    def _recompute_grades(self) -> None:
+        for enr in self.enrollments:
+            if enr["type"] != "StudentEnrollment":
+                continue
+            earned = possible = 0.0
+            for asgn in self.assignments.values():
+                sub = self.submissions[(asgn["id"], enr["user_id"])]
+                if sub["score"] is not None:
+                    earned += sub["score"]
+                    possible += asgn["points_possible"]
+            current = round(100 * earned / possible, 2) if possible else None
+            enr["grades"] = {
+                "html_url": f"https://fake.instructure.com/courses/{self.config.course_id}"
+                            f"/grades/{enr['user_id']}",
+                "current_score": current,
+                "current_grade": _letter(current),
+                "final_score": current,
+                "final_grade": _letter(current),
+            }
+
+    # -- views --------------------------------------------------------------
+
+    def user_display(self, user_id: int) -> Dict[str, Any]:
+        u = self.users[user_id]
+        return {"id": u["id"], "name": u["name"], "sortable_name": u["sortable_name"],
+                "short_name": u["short_name"], "sis_user_id": u["sis_user_id"],
+                "login_id": u["login_id"]}
+
+    def students(self) -> List[int]:
+        return [e["user_id"] for e in self.enrollments if e["type"] == "StudentEnrollment"]
+
+    def assignment_analytics(self) -> List[Dict[str, Any]]:
+        out = []
+        for asgn in self.assignments.values():
+            subs = [self.submissions[(asgn["id"], uid)] for uid in self.students()]
+            scores = sorted(s["score"] for s in subs if s["score"] is not None)
+
+            def q(p: float) -> Optional[float]:
+                return scores[int(p * (len(scores) - 1))] if scores else None
+
+            out.append({
+                "assignment_id": asgn["id"],
+                "title": asgn["name"],
+                "points_possible": asgn["points_possible"],
+                "due_at": asgn["due_at"],
+                "muted": False,
+                "min_score": scores[0] if scores else None,
+                "max_score": scores[-1] if scores else None,
+                "median": q(0.5),
+                "first_quartile": q(0.25),
+                "third_quartile": q(0.75),
+                "tardiness_breakdown": {
+                    "missing": sum(s["missing"] for s in subs) / max(len(subs), 1),
+                    "late": sum(s["late"] for s in subs) / max(len(subs), 1),
+                    "on_time": sum(1 for s in subs if s["submitted_at"] and not s["late"])
+                    / max(len(subs), 1),
+                    "floating": 0,
+                    "total": len(subs),
+                },
+            })
+        return out
+
+    def student_summaries(self) -> List[Dict[str, Any]]:
+        rng = random.Random(self.config.seed + 1)
+        rows = []
+        for uid in self.students():
+            subs = [self.submissions[(aid, uid)] for aid in self.assignments]
+            rows.append({
+                "id": uid,
+                "page_views": rng.randint(0, 600),
+                "max_page_views": 600,
+                "page_views_level": rng.randint(0, 3),
+                "participations": rng.randint(0, 60),
+                "max_participations": 60,
+                "participations_level": rng.randint(0, 3),
+                "tardiness_breakdown": {
+                    "total": len(subs),
+                    "on_time": sum(1 for s in subs if s["submitted_at"] and not s["late"]),
+                    "late": sum(s["late"] for s in subs),
+                    "missing": sum(s["missing"] for s in subs),
+                    "floating": sum(1 for s in subs if not s["submitted_at"] and not s["missing"]),
+                },
+            })
+        return rows
+
+    def activity(self) -> List[Dict[str, Any]]:
+        rng = random.Random(self.config.seed + 2)
+        days = (self.now - self.term_start).days
+        return [{"date": _iso(self.term_start + timedelta(days=d)),
+                 "views": rng.randint(50, 50 + 20 * self.config.students),
+                 "participations": rng.randint(0, 3 * self.config.students)}
+                for d in range(days)]
+
+    def terms(self) -> List[Dict[str, Any]]:
+        """Past 16-week terms (ids 9001…) followed by the current one (`term_id`)."""
+        rows = []
+        for i in range(self.config.past_terms, 0, -1):
+            start = self.term_start - timedelta(weeks=20 * i)
+            rows.append({"id": 9000 + self.config.past_terms - i + 1,
+                         "name": f"Term -{i}", "workflow_state": "active",
+                         "start_at": _iso(start), "end_at": _iso(start + timedelta(weeks=16))})
+        rows.append({"id": self.config.term_id, "name": "Current Term",
+                     "workflow_state": "active", "start_at": self.course["start_at"],
+                     "end_at": self.course["end_at"]})
+        return rows
+
+    def sub_accounts(self, account_id: int) -> List[Dict[str, Any]]:
+        if account_id != self.config.account_id:
+            return []
+        return [{"id": account_id * 100 + i, "name": f"Department {i}",
+                 "parent_account_id": account_id, "root_account_id": account_id}
+                for i in range(1, self.config.sub_accounts + 1)]
+
+    def department_grades(self, key: str) -> Dict[str, int]:
+        rng = random.Random(f"{self.config.seed}:{key}")
+        counts = [0] * 101
+        for _ in range(rng.randint(800, 3000)):
+            counts[max(0, min(100, int(rng.gauss(rng.uniform(72, 85), 12))))] += 1
+        return {str(i): c for i, c in enumerate(counts)}
+
+    # -- files --------------------------------------------------------------
+
+    def folder_for(self, course_id: int, path: Optional[str]) -> Dict[str, Any]:
+        """The course folder at `path` below "course files", created if missing."""
+        full = "/".join(["course files"] + [p for p in (path or "").split("/") if p])
+        parent = None
+        for depth, name in enumerate(full.split("/")):
+            prefix = "/".join(full.split("/")[:depth + 1])
+            folder = next((f for f in self.folders.values()
+                           if f["course_id"] == course_id and f["full_name"] == prefix), None)
+            if folder is None:
+                fid = self.next_id()
+                folder = {"id": fid, "name": name, "full_name": prefix, "course_id": course_id,
+                          "parent_folder_id": parent["id"] if parent else None}
+                self.folders[fid] = folder
+            parent = folder
+        return parent
+
+    def add_file(self, course_id: int, name: str, content: bytes, content_type: str,
+                 folder_path: Optional[str] = None, on_duplicate: str = "overwrite",
+                 when: Optional[datetime] = None) -> Dict[str, Any]:
+        folder = self.folder_for(course_id, folder_path)
+        existing = next((f for f in self.files.values()
+                         if f["folder_id"] == folder["id"] and f["display_name"] == name), None)
+        if existing and on_duplicate == "rename":
+            stem, dot, ext = name.rpartition(".")
+            name = f"{stem}-1{dot}{ext}" if dot else f"{name}-1"
+            existing = None
+        fid = existing["id"] if existing else self.next_id()
+        stamp = _iso(when or datetime.now(timezone.utc))
+        self.files[fid] = {
+            "id": fid,
+            "folder_id": folder["id"],
+            "display_name": name,
+            "filename": name,
+            "content-type": content_type,
+            "size": len(content),
+            "created_at": existing["created_at"] if existing else stamp,
+            "updated_at": stamp,
+            "modified_at": stamp,
+            "url": f"/files/{fid}/download",
+        }
+        self.file_blobs[fid] = content
+        return self.files[fid]
+
+    # -- pages --------------------------------------------------------------
+
+    def add_page(self, title: str, body: str, front_page: bool = False,
+                 when: Optional[datetime] = None) -> Dict[str, Any]:
+        url = "-".join(title.lower().split())
+        stamp = _iso(when or datetime.now(timezone.utc))
+        self.pages[url] = {
+            "page_id": self.next_id(), "url": url, "title": title, "body": body,
+            "created_at": stamp, "updated_at": stamp, "published": True,
+            "front_page": front_page, "editing_roles": "teachers",
+            "html_url": f"https://fake.instructure.com/courses/{self.config.course_id}/pages/{url}",
+        }
+        return self.pages[url]
+
+    def page(self, url_or_id: str) -> Optional[Dict[str, Any]]:
+        if url_or_id in self.pages:
+            return self.pages[url_or_id]
+        return next((p for p in self.pages.values() if str(p["page_id"]) == url_or_id), None)
+
+    # -- groups -------------------------------------------------------------
+
+    def add_group_category(self, name: str, context_type: str = "Course",
+                           context_id: Optional[int] = None) -> Dict[str, Any]:
+        category = {"id": self.next_id(), "name": name, "role": None,
+                    "self_signup": None, "group_limit": None,
+                    "context_type": context_type,
+                    ("course_id" if context_type == "Course" else "account_id"):
+                        context_id or self.config.course_id}
+        self.group_categories[category["id"]] = category
+        return category
+
+    def add_group(self, category_id: int, name: str, **fields) -> Dict[str, Any]:
+        category = self.group_categories[category_id]
+        group = {"id": self.next_id(), "name": name, "description": None,
+                 "join_level": "invitation_only", "is_public": False,
+                 "group_category_id": category_id, "context_type": category["context_type"],
+                 "course_id": category.get("course_id"), "account_id": category.get("account_id"),
+                 "storage_quota_mb": 50, "avatar_url": None, "role": None, **fields}
+        self.groups[group["id"]] = group
+        self.group_members[group["id"]] = []
+        self.group_stream[group["id"]] = []
+        return group
+
+    def group_view(self, group_id: int) -> Dict[str, Any]:
+        return {**self.groups[group_id], "members_count": len(self.group_members[group_id])}
+
+    # -- modules ------------------------------------------------------------
+
+    def add_module_item(self, module_id: int, fields: Dict[str, Any]) -> Dict[str, Any]:
+        items = self.module_items[module_id]
+        item = {"id": self.next_id(), "module_id": module_id, "position": len(items) + 1,
+                "indent": 0, "published": True, **fields}
+        items.append(item)
+        return item
+
+    def module_item_view(self, item: Dict[str, Any], details: bool) -> Dict[str, Any]:
+        item = dict(item)
+        if details and item["type"] in ("Assignment", "Quiz"):
+            asgn = next((a for a in self.assignments.values()
+                         if a["id"] == item["content_id"] or a.get("quiz_id") == item["content_id"]),
+                        None)
+            if asgn:
+                item["content_details"] = {"points_possible": asgn["points_possible"],
+                                           "due_at": asgn["due_at"], "unlock_at": None,
+                                           "lock_at": None}
+        return item
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# P A G I N A T I O N   &   R A T E   L I M I T S
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+class _LeakyBucket:
+    """Canvas-style per-token throttle: cost fills the bucket, time drains it."""
+
+    def __init__(self, size: float, leak_per_second: float):
+        self.size = size
+        self.leak = leak_per_second
+        self.level: Dict[str, float] = {}
+        self.stamp: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def charge(self, token: str, cost: float) -> float:
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.stamp.get(token, now)
+            level = max(0.0, self.level.get(token, 0.0) - elapsed * self.leak)
+            level += cost
+            self.level[token], self.stamp[token] = level, now
+            return self.size - level
+
+
+def _page_window(request: Request, config: FakeCanvasConfig) -> tuple:
+    """(page, per_page) of the request, clamped the way Canvas clamps them."""
+    per_page = int(request.query_params.get("per_page", config.default_per_page))
+    per_page = max(1, min(per_page, config.max_per_page))
+    page = max(1, int(request.query_params.get("page", 1)))
+    return page, per_page
+
+
+def _paginate(request: Request, items: List[Any], config: FakeCanvasConfig,
+              wrap: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> JSONResponse:
+    page, per_page = _page_window(request, config)
+    last = max(1, -(-len(items) // per_page))
+    chunk = items[(page - 1) * per_page: page * per_page]
+
+    def link(n: int, rel: str) -> str:
+        params = [(k, v) for k, v in request.query_params.multi_items() if k not in ("page", "per_page")]
+        params += [("page", n), ("per_page", per_page)]
+        return f'<{request.url.replace(query=urlencode(params))}>; rel="{rel}"'
+
+    rels = [link(page, "current"), link(1, "first"), link(last, "last")]
+    if page < last:
+        rels.append(link(page + 1, "next"))
+    if page > 1:
+        rels.append(link(page - 1, "prev"))
+
+    body: Any = chunk
+    if wrap:
+        body = {wrap: chunk, **(extra or {})}
+    return JSONResponse(body, headers={"Link": ",".join(rels)})
+
+
+def _since(value: Optional[str], stamp: Optional[str]) -> bool:
+    return value is None or (stamp is not None and stamp >= value)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# A P P
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def create_app(config: Optional[FakeCanvasConfig] = None) -> FastAPI:
+    """Build a FastAPI app serving one synthetic course described by `config`."""
+    config = config or FakeCanvasConfig()
+    data = FakeCourse(config)
+    bucket = _LeakyBucket(config.bucket_size, config.leak_per_second)
+    app = FastAPI(title="Fake Canvas")
+    app.state.config = config
+    app.state.data = data
+
+    @app.middleware("http")
+    async def canvas_behaviour(request: Request, call_next):
+        if request.url.path.startswith("/files_upload/"):
+            # Stands in for the separate upload host, which takes no Canvas token.
+            return await call_next(request)
+        auth = request.headers.get("Authorization", "")
+        if not auth.startswith("Bearer "):
+            return JSONResponse({"errors": [{"message": "Invalid access token."}]}, status_code=401)
+        if config.latency_ms or config.jitter_ms:
+            delay = config.latency_ms + random.uniform(0, config.jitter_ms)
+            await asyncio.sleep(delay / 1000)
+        remaining = bucket.charge(auth, config.request_cost)
+        headers = {"X-Request-Cost": f"{config.request_cost:.4f}",
+                   "X-Rate-Limit-Remaining": f"{max(remaining, 0.0):.4f}"}
+        if config.rate_limit and remaining < 0:
+            return Response("403 Forbidden (Rate Limit Exceeded)", status_code=403, headers=headers)
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+    def course_or_404(course_id: int) -> None:
+        if (course_id != config.course_id and course_id not in config.extra_course_ids
+                and course_id not in data.other_courses):
+            raise HTTPException(404, "The specified resource does not exist.")
+
+    def assignment_or_404(course_id: int, assignment_id: int) -> Dict[str, Any]:
+        course_or_404(course_id)
+        if assignment_id not in data.assignments:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return data.assignments[assignment_id]
+
+    def quiz_or_404(course_id: int, quiz_id: int) -> Dict[str, Any]:
+        course_or_404(course_id)
+        if quiz_id not in data.quizzes or data.quizzes[quiz_id]["course_id"] != course_id:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return data.quizzes[quiz_id]
+
+    def with_user(sub: Dict[str, Any], include: List[str]) -> Dict[str, Any]:
+        if "submission_history" in include:
+            quiz_id = data.assignments[sub["assignment_id"]].get("quiz_id")
+            answers = data.quiz_answers.get((quiz_id, sub["user_id"]))
+            history = {**sub, "submission_data": answers} if answers else dict(sub)
+            sub = {**sub, "submission_history": [history] if sub["attempt"] else []}
+        if "user" in include:
+            return {**sub, "user": data.user_display(sub["user_id"])}
+        return sub
+
+    # -- courses ------------------------------------------------------------
+
+    @app.get("/api/v1/courses")
+    def list_courses(request: Request):
+        return _paginate(request, [data.course], config)
+
+    @app.get("/api/v1/courses/{course_id}")
+    def get_course(course_id: int):
+        course_or_404(course_id)
+        return data.course
+
+    @app.get("/api/v1/accounts/{account_id}")
+    def get_account(account_id: int):
+        if account_id != config.account_id:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return {"id": account_id, "name": "Fake University", "parent_account_id": None,
+                "root_account_id": None, "workflow_state": "active",
+                "default_time_zone": "America/Los_Angeles"}
+
+    @app.get("/api/v1/accounts/{account_id}/courses")
+    def list_account_courses(account_id: int, request: Request):
+        if account_id != config.account_id:
+            return _paginate(request, [], config)
+        main = {**data.course, "enrollment_term_id": config.term_id, "account_id": account_id,
+                "total_students": len(data.students())}
+        courses = [main] + [c for c, _ in data.other_courses.values()]
+        term = request.query_params.get("enrollment_term_id")
+        if term:
+            courses = [c for c in courses if str(c["enrollment_term_id"]) == term]
+        if request.query_params.get("with_enrollments") == "true":
+            courses = [c for c in courses if c["total_students"]]
+        return _paginate(request, courses, config)
+
+    @app.get("/api/v1/accounts/{account_id}/users")
+    def list_account_users(account_id: int, request: Request):
+        users = sorted(data.users) if account_id == config.account_id else []
+        people = [data.user_display(u) for u in users]
+        search = (request.query_params.get("search_term") or "").lower()
+        if search:
+            people = [u for u in people if search in (u.get("name") or "").lower()]
+        return _paginate(request, people, config)
+
+    @app.get("/api/v1/accounts/{account_id}/terms")
+    def list_terms(account_id: int, request: Request):
+        return _paginate(request, data.terms(), config, wrap="enrollment_terms")
+
+    @app.get("/api/v1/accounts/{account_id}/sub_accounts")
+    def list_sub_accounts(account_id: int, request: Request):
+        return _paginate(request, data.sub_accounts(account_id), config)
+
+    # -- enrollments & users ------------------------------------------------
+
+    @app.get("/api/v1/courses/{course_id}/enrollments")
+    def list_enrollments(course_id: int, request: Request):
+        course_or_404(course_id)
+        types = request.query_params.getlist("type[]")
+        states = request.query_params.getlist("state[]")
+        user_id = request.query_params.get("user_id")
+        if course_id in data.other_courses:
+            rows = [e for e in data.other_courses[course_id][1]
+                    if (not types or e["type"] in types)
+                    and (not states or e["enrollment_state"] in states)]
+            return _paginate(request, rows, config)
+        rows = []
+        for enr in data.enrollments:
+            if types and enr["type"] not in types:
+                continue
+            if states and enr["enrollment_state"] not in states:
+                continue
+            if user_id and str(enr["user_id"]) != user_id:
+                continue
+            rows.append({**enr, "user": data.user_display(enr["user_id"])})
+        return _paginate(request, rows, config)
+
+    @app.get("/api/v1/courses/{course_id}/users")
+    def list_course_users(course_id: int, request: Request):
+        course_or_404(course_id)
+        wanted = set(request.query_params.getlist("user_ids[]"))
+        types = request.query_params.getlist("enrollment_type[]")
+        with_enrollments = "enrollments" in request.query_params.getlist("include[]")
+        rows, seen = [], set()
+        for enr in data.enrollments:
+            if wanted and str(enr["user_id"]) not in wanted:
+                continue
+            if types and enr["type"].replace("Enrollment", "").lower() not in types:
+                continue
+            if enr["user_id"] in seen:
+                continue
+            seen.add(enr["user_id"])
+            row = data.user_display(enr["user_id"])
+            if with_enrollments:
+                row["enrollments"] = [e for e in data.enrollments
+                                      if e["user_id"] == enr["user_id"]]
+            rows.append(row)
+        return _paginate(request, rows, config)
+
+    @app.get("/api/v1/courses/{course_id}/sections")
+    def list_sections(course_id: int, request: Request):
+        course_or_404(course_id)
+        return _paginate(request, data.sections if course_id == config.course_id else [], config)
+
+    @app.get("/api/v1/users/{user_id}")
+    def get_user(user_id: int):
+        if user_id not in data.users:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return data.user_display(user_id)
+
+    # -- assignments --------------------------------------------------------
+
+    @app.get("/api/v1/courses/{course_id}/assignments")
+    def list_assignments(course_id: int, request: Request):
+        course_or_404(course_id)
+        exclude = request.query_params.getlist("exclude_response_fields[]")
+        rows = [{k: v for k, v in a.items() if k not in exclude} for a in data.assignments.values()]
+        return _paginate(request, rows, config)
+
+    @app.get("/api/v1/courses/{course_id}/assignments/{assignment_id}")
+    def get_assignment(course_id: int, assignment_id: int):
+        return assignment_or_404(course_id, assignment_id)
+
+    @app.post("/api/v1/courses/{course_id}/assignments")
+    async def create_assignment(course_id: int, request: Request):
+        course_or_404(course_id)
+        body = await request.json()
+        fields = body.get("assignment", body)
+        aid = data.next_id()
+        data.assignments[aid] = {
+            "id": aid, "course_id": course_id, "description": None, "due_at": None,
+            "points_possible": 0.0, "submission_types": ["none"], "is_quiz_assignment": False,
+            "published": False, "quiz_id": None, "position": len(data.assignments) + 1,
+            "html_url": f"https://fake.instructure.com/courses/{course_id}/assignments/{aid}",
+            "created_at": _iso(data.now), "updated_at": _iso(data.now), **fields,
+        }
+        return data.assignments[aid]
+
+    def overridable_or_404(course_id: int, assignment_id: int) -> None:
+        course_or_404(course_id)
+        if assignment_id not in data.assignments and not any(
+                q.get("assignment_id") == assignment_id and q["course_id"] == course_id
+                for q in data.quizzes.values()):
+            raise HTTPException(404, "The specified resource does not exist.")
+
+    @app.get("/api/v1/courses/{course_id}/assignments/{assignment_id}/overrides")
+    def list_overrides(course_id: int, assignment_id: int, request: Request):
+        overridable_or_404(course_id, assignment_id)
+        return _paginate(request, data.overrides.get(assignment_id, []), config)
+
+    @app.post("/api/v1/courses/{course_id}/assignments/{assignment_id}/overrides")
+    async def create_override(course_id: int, assignment_id: int, request: Request):
+        overridable_or_404(course_id, assignment_id)
+        fields = (await request.json()).get("assignment_override", {})
+        override = {"id": data.next_id(), "assignment_id": assignment_id, **fields}
+        data.overrides.setdefault(assignment_id, []).append(override)
+        return override
+
+    @app.put("/api/v1/courses/{course_id}/assignments/{assignment_id}")
+    async def edit_assignment(course_id: int, assignment_id: int, request: Request):
+        asgn = assignment_or_404(course_id, assignment_id)
+        body = await request.json()
+        asgn.update(body.get("assignment", body))
+        asgn["updated_at"] = _iso(datetime.now(timezone.utc))
+        return asgn
+
+    @app.delete("/api/v1/courses/{course_id}/assignments/{assignment_id}")
+    def delete_assignment(course_id: int, assignment_id: int):
+        asgn = assignment_or_404(course_id, assignment_id)
+        del data.assignments[assignment_id]
+        return {**asgn, "workflow_state": "deleted"}
+
+    # -- submissions --------------------------------------------------------
+
+    @app.get("/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions")
+    def list_assignment_submissions(course_id: int, assignment_id: int, request: Request):
+        assignment_or_404(course_id, assignment_id)
+        include = request.query_params.getlist("include[]")
+        rows = [with_user(data.submissions[(assignment_id, uid)], include)
+                for uid in data.students()]
+        return _paginate(request, rows, config)
+
+    @app.put("/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions/{user_id}")
+    async def grade_submission(course_id: int, assignment_id: int, user_id: int, request: Request):
+        asgn = assignment_or_404(course_id, assignment_id)
+        if (assignment_id, user_id) not in data.submissions:
+            raise HTTPException(404, "The specified resource does not exist.")
+        sub = data.submissions[(assignment_id, user_id)]
+        posted = (await request.json()).get("submission", {}).get("posted_grade")
+        if posted is not None:
+            score = float(str(posted).rstrip("%"))
+            if str(posted).endswith("%"):
+                score = score * asgn["points_possible"] / 100
+            data._grade(sub, score, data.graders[0], datetime.now(timezone.utc))
+            data._recompute_grades()
+        return sub
+
+    @app.get("/api/v1/courses/{course_id}/students/submissions")
+    def list_student_submissions(course_id: int, request: Request):
+        course_or_404(course_id)
+        qp = request.query_params
+        include = qp.getlist("include[]")
+        students = qp.getlist("student_ids[]")
+        assignments = qp.getlist("assignment_ids[]")
+        state = qp.get("workflow_state")
+        submitted_since = qp.get("submitted_since")
+        graded_since = qp.get("graded_since")
+        rows = []
+        for (aid, uid), sub in data.submissions.items():
+            if students and "all" not in students and str(uid) not in students:
+                continue
+            if assignments and str(aid) not in assignments:
+                continue
+            if state and sub["workflow_state"] != state:
+                continue
+            if submitted_since and not _since(submitted_since, sub["submitted_at"]):
+                continue
+            if graded_since and not _since(graded_since, sub["graded_at"]):
+                continue
+            rows.append(with_user(sub, include))
+        return _paginate(request, rows, config)
+
+    # -- quizzes ------------------------------------------------------------
+
+    @app.get("/api/v1/courses/{course_id}/quizzes")
+    def list_quizzes(course_id: int, request: Request):
+        course_or_404(course_id)
+        return _paginate(request, [q for q in data.quizzes.values() if q["course_id"] == course_id],
+                         config)
+
+    @app.get("/api/v1/courses/{course_id}/quizzes/{quiz_id}")
+    def get_quiz(course_id: int, quiz_id: int):
+        return quiz_or_404(course_id, quiz_id)
+
+    @app.post("/api/v1/courses/{course_id}/quizzes")
+    async def create_quiz(course_id: int, request: Request):
+        course_or_404(course_id)
+        body = await request.json()
+        qid = data.next_id()
+        data.quizzes[qid] = {
+            "id": qid, "course_id": course_id, "quiz_type": "assignment", "description": None,
+            "due_at": None, "published": False, "points_possible": 0.0, "question_count": 0,
+            "html_url": f"https://fake.instructure.com/courses/{course_id}/quizzes/{qid}",
+            **body.get("quiz", body),
+        }
+        if data.quizzes[qid]["quiz_type"] in ("assignment", "graded_survey"):
+            data.quizzes[qid]["assignment_id"] = data.next_id()
+        data.questions[qid] = {}
+        data.quiz_groups[qid] = {}
+        data.quiz_submissions[qid] = []
+        return data.quizzes[qid]
+
+    @app.put("/api/v1/courses/{course_id}/quizzes/{quiz_id}")
+    async def edit_quiz(course_id: int, quiz_id: int, request: Request):
+        quiz = quiz_or_404(course_id, quiz_id)
+        body = await request.json()
+        quiz.update(body.get("quiz", body))
+        return quiz
+
+    @app.delete("/api/v1/courses/{course_id}/quizzes/{quiz_id}")
+    def delete_quiz(course_id: int, quiz_id: int):
+        quiz = quiz_or_404(course_id, quiz_id)
+        del data.quizzes[quiz_id]
+        return quiz
+
+    @app.get("/api/v1/courses/{course_id}/quizzes/{quiz_id}/questions")
+    def list_questions(course_id: int, quiz_id: int, request: Request):
+        quiz_or_404(course_id, quiz_id)
+        rows = sorted(data.questions[quiz_id].values(), key=lambda q: q.get("position") or 0)
+        return _paginate(request, rows, config)
+
+    @app.get("/api/v1/courses/{course_id}/quizzes/{quiz_id}/questions/{question_id}")
+    def get_question(course_id: int, quiz_id: int, question_id: int):
+        quiz_or_404(course_id, quiz_id)
+        if question_id not in data.questions[quiz_id]:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return data.questions[quiz_id][question_id]
+
+    @app.post("/api/v1/courses/{course_id}/quizzes/{quiz_id}/questions")
+    async def create_question(course_id: int, quiz_id: int, request: Request):
+        quiz = quiz_or_404(course_id, quiz_id)
+        fields = (await request.json()).get("question", {})
+        question_id = data.next_id()
+        answers = [{"id": data.next_id(), **a} for a in fields.pop("answers", None) or []]
+        data.questions[quiz_id][question_id] = {
+            "id": question_id, "quiz_id": quiz_id, "quiz_group_id": None,
+            "position": len(data.questions[quiz_id]) + 1, "points_possible": 0,
+            **fields, "answers": answers,
+        }
+        quiz["question_count"] = len(data.questions[quiz_id])
+        return data.questions[quiz_id][question_id]
+
+    @app.put("/api/v1/courses/{course_id}/quizzes/{quiz_id}/questions/{question_id}")
+    async def update_question(course_id: int, quiz_id: int, question_id: int, request: Request):
+        question = get_question(course_id, quiz_id, question_id)
+        question.update((await request.json()).get("question", {}))
+        return question
+
+    @app.delete("/api/v1/courses/{course_id}/quizzes/{quiz_id}/questions/{question_id}")
+    def delete_question(course_id: int, quiz_id: int, question_id: int):
+        get_question(course_id, quiz_id, question_id)
+        del data.questions[quiz_id][question_id]
+        return Response(status_code=204)
+
+    @app.post("/api/v1/courses/{course_id}/quizzes/{quiz_id}/reorder")
+    async def reorder_quiz(course_id: int, quiz_id: int, request: Request):
+        quiz_or_404(course_id, quiz_id)
+        order = (await request.json()).get("order", [])
+        for position, item in enumerate(order, start=1):
+            if item.get("type") == "question" and item["id"] in data.questions[quiz_id]:
+                data.questions[quiz_id][item["id"]]["position"] = position
+            if item.get("type") == "group" and item["id"] in data.quiz_groups[quiz_id]:
+                data.quiz_groups[quiz_id][item["id"]]["position"] = position
+                for question in data.questions[quiz_id].values():
+                    if question.get("quiz_group_id") == item["id"]:
+                        question["position"] = position
+        return Response(status_code=204)
+
+    @app.post("/api/v1/courses/{course_id}/quizzes/{quiz_id}/groups")
+    async def create_quiz_group(course_id: int, quiz_id: int, request: Request):
+        quiz_or_404(course_id, quiz_id)
+        fields = ((await request.json()).get("quiz_groups") or [{}])[0]
+        group_id = data.next_id()
+        data.quiz_groups[quiz_id][group_id] = {
+            "id": group_id, "quiz_id": quiz_id, "name": None, "pick_count": 1,
+            "question_points": None, "assessment_question_bank_id": None,
+            "position": len(data.quiz_groups[quiz_id]) + 1, **fields,
+        }
+        return {"quiz_groups": [data.quiz_groups[quiz_id][group_id]]}
+
+    @app.get("/api/v1/courses/{course_id}/quizzes/{quiz_id}/groups/{group_id}")
+    def get_quiz_group(course_id: int, quiz_id: int, group_id: int):
+        quiz_or_404(course_id, quiz_id)
+        if group_id not in data.quiz_groups[quiz_id]:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return data.quiz_groups[quiz_id][group_id]
+
+    @app.get("/api/v1/courses/{course_id}/quizzes/{quiz_id}/submissions")
+    def list_quiz_submissions(course_id: int, quiz_id: int, request: Request):
+        quiz_or_404(course_id, quiz_id)
+        include = request.query_params.getlist("include[]")
+        rows = data.quiz_submissions[quiz_id]
+        # Canvas side-loads included objects next to the page of quiz submissions.
+        extra: Dict[str, Any] = {}
+        page, per_page = _page_window(request, config)
+        window = rows[(page - 1) * per_page: page * per_page]
+        if "user" in include:
+            extra["users"] = [data.user_display(qs["user_id"]) for qs in window]
+        if "submission" in include:
+            extra["submissions"] = [data.submissions[(data.quizzes[quiz_id]["assignment_id"], qs["user_id"])]
+                                    for qs in window]
+        if "quiz" in include:
+            extra["quizzes"] = [data.quizzes[quiz_id]]
+        return _paginate(request, rows, config, wrap="quiz_submissions", extra=extra)
+
+    @app.get("/api/v1/courses/{course_id}/quizzes/{quiz_id}/submissions/{submission_id}")
+    def get_quiz_submission(course_id: int, quiz_id: int, submission_id: int):
+        quiz_or_404(course_id, quiz_id)
+        for qs in data.quiz_submissions[quiz_id]:
+            if qs["id"] == submission_id:
+                return {"quiz_submissions": [qs]}
+        raise HTTPException(404, "The specified resource does not exist.")
+
+    @app.get("/api/v1/courses/{course_id}/quizzes/{quiz_id}/statistics")
+    def quiz_statistics(course_id: int, quiz_id: int):
+        quiz_or_404(course_id, quiz_id)
+        return {"quiz_statistics": [data.quiz_statistics(quiz_id)]}
+
+    # -- gradebook history --------------------------------------------------
+
+    def history_days() -> Dict[str, Dict[int, set]]:
+        days: Dict[str, Dict[int, set]] = {}
+        for ev in data.grade_events:
+            day = ev["graded_at"][:10]
+            days.setdefault(day, {}).setdefault(ev["grader_id"], set()).add(ev["assignment_id"])
+        return days
+
+    @app.get("/api/v1/courses/{course_id}/gradebook_history/feed")
+    def history_feed(course_id: int, request: Request):
+        course_or_404(course_id)
+        qp = request.query_params
+        rows = data.grade_events
+        if qp.get("assignment_id"):
+            rows = [e for e in rows if str(e["assignment_id"]) == qp["assignment_id"]]
+        if qp.get("user_id"):
+            rows = [e for e in rows if str(e["user_id"]) == qp["user_id"]]
+        ascending = qp.get("ascending", "false").lower() in ("1", "true")
+        rows = sorted(rows, key=lambda e: e["graded_at"], reverse=not ascending)
+        return _paginate(request, rows, config)
+
+    @app.get("/api/v1/courses/{course_id}/gradebook_history/days")
+    def history_day_list(course_id: int, request: Request):
+        course_or_404(course_id)
+        rows = [{"date": day,
+                 "graders": [{"id": g, "name": data.users[g]["name"], "assignments": sorted(a)}
+                             for g, a in sorted(graders.items())]}
+                for day, graders in sorted(history_days().items(), reverse=True)]
+        return _paginate(request, rows, config)
+
+    @app.get("/api/v1/courses/{course_id}/gradebook_history/{date}")
+    def history_day(course_id: int, date: str):
+        course_or_404(course_id)
+        graders = history_days().get(date, {})
+        return [{"id": g, "name": data.users[g]["name"], "assignments": sorted(a)}
+                for g, a in sorted(graders.items())]
+
+    @app.get("/api/v1/courses/{course_id}/gradebook_history/{date}/graders/{grader_id}"
+             "/assignments/{assignment_id}/submissions")
+    def history_submissions(course_id: int, date: str, grader_id: int, assignment_id: int):
+        course_or_404(course_id)
+        versions: Dict[int, List[Dict[str, Any]]] = {}
+        for ev in data.grade_events:
+            if (ev["graded_at"][:10] == date and ev["grader_id"] == grader_id
+                    and ev["assignment_id"] == assignment_id):
+                versions.setdefault(ev["id"], []).append(ev)
+        return [{"submission_id": sid, "versions": vs} for sid, vs in versions.items()]
+
+    # -- files --------------------------------------------------------------
+
+    def with_url(request: Request, file: Dict[str, Any]) -> Dict[str, Any]:
+        return {**file, "url": str(request.base_url).rstrip("/") + file["url"]}
+
+    @app.post("/api/v1/courses/{course_id}/files")
+    async def preflight_upload(course_id: int, request: Request):
+        course_or_404(course_id)
+        body = await request.json()
+        token = uuid.uuid4().hex
+        data.pending_uploads[token] = {**body, "course_id": course_id}
+        return {"upload_url": f"{str(request.base_url).rstrip('/')}/files_upload/{token}",
+                "upload_params": {"filename": body["name"],
+                                  "content_type": body.get("content_type")},
+                "file_param": "file"}
+
+    @app.post("/files_upload/{token}")
+    async def receive_upload(token: str, request: Request):
+        ticket = data.pending_uploads.pop(token, None)
+        if ticket is None:
+            raise HTTPException(404, "Unknown upload")
+        boundary = request.headers["content-type"].split("boundary=", 1)[1].encode()
+        body = bytearray()
+        async for chunk in request.stream():
+            body += chunk
+        file_part = bytes(body).split(b"--" + boundary)[-2]
+        content = file_part.split(b"\r\n\r\n", 1)[1][:-2]
+        if ticket.get("size") is not None and len(content) != int(ticket["size"]):
+            raise HTTPException(400, "Size does not match preflight")
+        file = data.add_file(ticket["course_id"], ticket["name"], content,
+                             ticket.get("content_type") or "application/octet-stream",
+                             ticket.get("parent_folder_path"),
+                             ticket.get("on_duplicate") or "overwrite")
+        location = f"{str(request.base_url).rstrip('/')}/api/v1/files/{file['id']}/create_success"
+        return Response(status_code=302, headers={"Location": location})
+
+    @app.get("/api/v1/files/{file_id}/create_success")
+    def confirm_upload(file_id: int, request: Request):
+        if file_id not in data.files:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return with_url(request, data.files[file_id])
+
+    @app.get("/api/v1/courses/{course_id}/folders")
+    def list_folders(course_id: int, request: Request):
+        course_or_404(course_id)
+        data.folder_for(course_id, None)
+        return _paginate(request, [f for f in data.folders.values()
+                                   if f["course_id"] == course_id], config)
+
+    @app.get("/api/v1/courses/{course_id}/files")
+    def list_files(course_id: int, request: Request):
+        course_or_404(course_id)
+        ids = {f["id"] for f in data.folders.values() if f["course_id"] == course_id}
+        return _paginate(request, [with_url(request, f) for f in data.files.values()
+                                   if f["folder_id"] in ids], config)
+
+    @app.get("/files/{file_id}/download")
+    def download_file(file_id: int, request: Request):
+        if file_id not in data.files:
+            raise HTTPException(404, "The specified resource does not exist.")
+        blob = data.file_blobs[file_id]
+        headers = {"Accept-Ranges": "bytes"}
+        rng = request.headers.get("range", "")
+        if rng.startswith("bytes="):
+            start = int(rng[6:].split("-", 1)[0] or 0)
+            if start >= len(blob):
+                return Response(status_code=416, headers=headers)
+            headers["Content-Range"] = f"bytes {start}-{len(blob) - 1}/{len(blob)}"
+            return Response(blob[start:], status_code=206, headers=headers,
+                            media_type=data.files[file_id]["content-type"])
+        return Response(blob, headers=headers, media_type=data.files[file_id]["content-type"])
+
+    @app.delete("/api/v1/files/{file_id}")
+    def delete_file(file_id: int, request: Request):
+        if file_id not in data.files:
+            raise HTTPException(404, "The specified resource does not exist.")
+        data.file_blobs.pop(file_id)
+        return with_url(request, data.files.pop(file_id))
+
+    @app.get("/api/v1/files/{file_id}")
+    def get_file(file_id: int, request: Request):
+        if file_id not in data.files:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return with_url(request, data.files[file_id])
+
+    # -- pages --------------------------------------------------------------
+
+    def page_or_404(course_id: int, url_or_id: str) -> Dict[str, Any]:
+        course_or_404(course_id)
+        page = data.page(url_or_id) if course_id == config.course_id else None
+        if page is None:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return page
+
+    @app.get("/api/v1/courses/{course_id}/pages")
+    def list_pages(course_id: int, request: Request):
+        course_or_404(course_id)
+        pages = list(data.pages.values()) if course_id == config.course_id else []
+        if request.query_params.get("sort") == "updated_at":
+            pages.sort(key=lambda p: p["updated_at"],
+                       reverse=request.query_params.get("order") == "desc")
+        else:
+            pages.sort(key=lambda p: p["title"])
+        return _paginate(request, [{k: v for k, v in p.items() if k != "body"} for p in pages],
+                         config)
+
+    @app.get("/api/v1/courses/{course_id}/front_page")
+    def get_front_page(course_id: int):
+        course_or_404(course_id)
+        page = next((p for p in data.pages.values() if p["front_page"]), None)
+        if page is None:
+            raise HTTPException(404, "No front page has been set")
+        return page
+
+    @app.get("/api/v1/courses/{course_id}/pages/{url_or_id}")
+    def get_page(course_id: int, url_or_id: str):
+        return page_or_404(course_id, url_or_id)
+
+    @app.put("/api/v1/courses/{course_id}/pages/{url_or_id}")
+    async def update_page(course_id: int, url_or_id: str, request: Request):
+        page = page_or_404(course_id, url_or_id)
+        page.update((await request.json()).get("wiki_page", {}))
+        page["updated_at"] = _iso(datetime.now(timezone.utc))
+        return page
+
+    # -- modules ------------------------------------------------------------
+
+    def module_or_404(course_id: int, module_id: int) -> Dict[str, Any]:
+        if course_id != config.course_id or module_id not in data.modules:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return data.modules[module_id]
+
+    @app.get("/api/v1/courses/{course_id}/modules")
+    def list_modules(course_id: int, request: Request):
+        course_or_404(course_id)
+        include = request.query_params.getlist("include[]")
+        term = (request.query_params.get("search_term") or "").lower()
+        inline = ("items" in include
+                  and sum(map(len, data.module_items.values())) <= config.inline_items_max)
+        rows = []
+        for mid, module in sorted(data.modules.items(), key=lambda m: m[1]["position"]):
+            items = [data.module_item_view(i, "content_details" in include)
+                     for i in data.module_items[mid]]
+            if term and term not in module["name"].lower() and not any(
+                    term in i["title"].lower() for i in items):
+                continue
+            row = {**module, "items_count": len(items)}
+            if inline:
+                row["items"] = items
+            rows.append(row)
+        return _paginate(request, rows, config)
+
+    @app.get("/api/v1/courses/{course_id}/modules/{module_id}")
+    def get_module(course_id: int, module_id: int):
+        return {**module_or_404(course_id, module_id),
+                "items_count": len(data.module_items[module_id])}
+
+    @app.get("/api/v1/courses/{course_id}/modules/{module_id}/items")
+    def list_module_items(course_id: int, module_id: int, request: Request):
+        module_or_404(course_id, module_id)
+        details = "content_details" in request.query_params.getlist("include[]")
+        return _paginate(request, [data.module_item_view(i, details)
+                                   for i in data.module_items[module_id]], config)
+
+    @app.put("/api/v1/courses/{course_id}/modules/{module_id}")
+    async def update_module(course_id: int, module_id: int, request: Request):
+        module = module_or_404(course_id, module_id)
+        module.update((await request.json()).get("module", {}))
+        return {**module, "items_count": len(data.module_items[module_id])}
+
+    @app.post("/api/v1/courses/{course_id}/modules/{module_id}/items")
+    async def create_module_item(course_id: int, module_id: int, request: Request):
+        module_or_404(course_id, module_id)
+        fields = (await request.json()).get("module_item", {})
+        return data.add_module_item(module_id, fields)
+
+    # -- groups -------------------------------------------------------------
+
+    def group_or_404(group_id: int) -> Dict[str, Any]:
+        if group_id not in data.groups:
+            raise HTTPException(404, "The specified resource does not exist.")
+        return data.groups[group_id]
+
+    def context_groups(context_type: str, context_id: int) -> List[Dict[str, Any]]:
+        key = "course_id" if context_type == "Course" else "account_id"
+        return [g for g in data.groups.values()
+                if g["context_type"] == context_type and g.get(key) == context_id]
+
+    @app.get("/api/v1/courses/{course_id}/groups")
+    def list_course_groups(course_id: int, request: Request):
+        course_or_404(course_id)
+        return _paginate(request, [data.group_view(g["id"])
+                                   for g in context_groups("Course", course_id)], config)
+
+    @app.get("/api/v1/accounts/{account_id}/groups")
+    def list_account_groups(account_id: int, request: Request):
+        return _paginate(request, [data.group_view(g["id"])
+                                   for g in context_groups("Account", account_id)], config)
+
+    @app.get("/api/v1/{context}/{context_id}/group_categories")
+    def list_group_categories(context: str, context_id: int, request: Request):
+        context_type = {"courses": "Course", "accounts": "Account"}.get(context)
+        key = "course_id" if context_type == "Course" else "account_id"
+        return _paginate(request, [c for c in data.group_categories.values()
+                                   if c["context_type"] == context_type
+                                   and c.get(key) == context_id], config)
+
+    @app.post("/api/v1/{context}/{context_id}/group_categories")
+    async def create_group_category(context: str, context_id: int, request: Request):
+        context_type = {"courses": "Course", "accounts": "Account"}.get(context)
+        if context_type is None:
+            raise HTTPException(404, "The specified resource does not exist.")
+        if context_type == "Course":
+            course_or_404(context_id)
+        body = await request.json()
+        return data.add_group_category(body.get("name") or "Group Set", context_type, context_id)
+
+    @app.post("/api/v1/group_categories/{category_id}/groups")
+    async def create_group(category_id: int, request: Request):
+        if category_id not in data.group_categories:
+            raise HTTPException(404, "The specified resource does not exist.")
+        body = await request.json()
+        name = body.pop("name", None) or "Group"
+        group = data.add_group(category_id, name, **{k: v for k, v in body.items()
+                                                     if k in ("description", "join_level",
+                                                              "is_public")})
+        return data.group_view(group["id"])
+
+    @app.get("/api/v1/groups/{group_id}")
+    def get_group(group_id: int):
+        group_or_404(group_id)
+        return data.group_view(group_id)
+
+    @app.put("/api/v1/groups/{group_id}")
+    async def update_group(group_id: int, request: Request):
+        group = group_or_404(group_id)
+        body = await request.json()
+        if "members" in body:
+            data.group_members[group_id] = sorted({int(u) for u in body.pop("members")
+                                                   if int(u) in data.users})
+        group.update({k: v for k, v in body.items()
+                      if k in ("name", "description", "join_level", "is_public")})
+        return data.group_view(group_id)
+
+    @app.get("/api/v1/groups/{group_id}/users")
+    def list_group_users(group_id: int, request: Request):
+        group_or_404(group_id)
+        return _paginate(request, [data.user_display(u) for u in data.group_members[group_id]],
+                         config)
+
+    @app.post("/api/v1/groups/{group_id}/memberships")
+    async def create_membership(group_id: int, request: Request):
+        group_or_404(group_id)
+        user_id = int((await request.json()).get("user_id"))
+        if user_id not in data.users:
+            raise HTTPException(404, "The specified resource does not exist.")
+        members = data.group_members[group_id]
+        if user_id not in members:
+            members.append(user_id)
+        return {"id": data.next_id(), "group_id": group_id, "user_id": user_id,
+                "workflow_state": "accepted", "moderator": False}
+
+    @app.get("/api/v1/groups/{group_id}/activity_stream")
+    def group_activity_stream(group_id: int, request: Request):
+        group_or_404(group_id)
+        return _paginate(request, data.group_stream[group_id], config)
+
+    # -- analytics ----------------------------------------------------------
+
+    @app.get("/api/v1/accounts/{account_id}/analytics/terms/{term_id}/grades")
+    def term_grades(account_id: int, term_id: int):
+        return data.department_grades(f"{account_id}:term:{term_id}")
+
+    @app.get("/api/v1/accounts/{account_id}/analytics/{state}/grades")
+    def state_grades(account_id: int, state: str):
+        if state not in ("current", "completed"):
+            raise HTTPException(404, "The specified resource does not exist.")
+        return data.department_grades(f"{account_id}:{state}")
+
+    @app.get("/api/v1/courses/{course_id}/analytics/activity")
+    def course_activity(course_id: int):
+        course_or_404(course_id)
+        return data.activity()
+
+    @app.get("/api/v1/courses/{course_id}/analytics/assignments")
+    def course_assignment_analytics(course_id: int):
+        course_or_404(course_id)
+        return data.assignment_analytics()
+
+    @app.get("/api/v1/courses/{course_id}/analytics/student_summaries")
+    def course_student_summaries(course_id: int, request: Request):
+        course_or_404(course_id)
+        return _paginate(request, data.student_summaries(), config)
+
+    return app
+
+
+def serve_in_background(config: Optional[FakeCanvasConfig] = None,
+                        host: str = "127.0.0.1", port: int = 8010):
+    """
+    Start the fake server on a daemon thread and block until it accepts requests.
+
+    Returns the uvicorn `Server`; call `server.should_exit = True` to stop it.
+    """
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host=host, port=port,
+                                           log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Canvas API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8010)
+    for name, field in FakeCanvasConfig.model_fields.items():
+        flag = "--" + name.replace("_", "-")
+        if field.annotation is bool:
+            parser.add_argument(flag, type=lambda v: v.lower() in ("1", "true", "yes"),
+                                default=field.default)
+        elif get_origin(field.annotation) is list:
+            parser.add_argument(flag, nargs="*", type=get_args(field.annotation)[0],
+                                default=field.default)
+        else:
+            parser.add_argument(flag, type=field.annotation, default=field.default)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeCanvasConfig(**{k: getattr(args, k) for k in FakeCanvasConfig.model_fields})
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+COURSE FILES SYNC
+=================
+
+Mirrors a course's Files area into a local directory so agents and graders
+can work from a local copy instead of re-fetching:
+
+* The folder tree and the file list are each read once (two paginated
+  listings for the whole course, not one per folder)
+* Files download concurrently, streamed to disk in `CHUNK_SIZE` blocks, and
+  are hashed (SHA-256) once complete
+* A file is skipped when its size and `updated_at` match the manifest and the
+  local copy is intact – checked by mtime, and by re-hashing only when the
+  mtime moved
+* Interrupted downloads are kept as `.part` files and resumed with an HTTP
+  `Range` request on the next attempt (or the next run); a `.part` that turns
+  out oversized or corrupt (416, size mismatch) is deleted and the file
+  fetched again from the start, and 5xx responses are retried with back-off
+* Canvas names never leave `dest`: separators, `.` and `..` are replaced
+* `MANIFEST_NAME` in the target directory records every synced file (id,
+  path, size, updated_at, sha256) and is rewritten atomically after each run
+
+    python -m canvas_agent.file_sync --course 123 --dest ./course_files
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from canvas_agent.openai_tools import (
+    DEFAULT_COURSE_ID,
+    canvas_map,
+    canvas_paginate,
+    canvas_session,
+)
+
+FILES_DIR = os.getenv("CANVAS_FILES_DIR", "course_files")
+MANIFEST_NAME = ".canvas_manifest.json"
+CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_WORKERS = int(os.getenv("CANVAS_DOWNLOAD_WORKERS", "6"))
+DOWNLOAD_ATTEMPTS = 3
+ROOT_FOLDER = "course files"
+
+
+def _safe(name: str) -> str:
+    """One path component from a Canvas name: no separators, never `.` or `..`."""
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", name).strip()
+    return "_" if name in ("", ".", "..") else name
+
+
+def _relative_folder(full_name: str) -> str:
+    parts = full_name.split("/")
+    if parts and parts[0] == ROOT_FOLDER:
+        parts = parts[1:]
+    return "/".join(_safe(p) for p in parts)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(CHUNK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def load_manifest(dest: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(dest, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}}
+
+
+def _write_manifest(dest: str, manifest: Dict[str, Any]) -> str:
+    path = os.path.join(dest, MANIFEST_NAME)
+    fd, tmp = tempfile.mkstemp(dir=dest, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, path)
+    return path
+
+
+class FileSync:
+    """One sync of a course's files into `dest`."""
+
+    def __init__(self, course_id: int, dest: str, folder: Optional[str] = None,
+                 max_workers: int = DOWNLOAD_WORKERS):
+        self.course_id = course_id
+        self.dest = os.path.abspath(dest)
+        self.folder = (folder or "").strip("/")
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+    # -- listing ------------------------------------------------------------
+
+    def remote_files(self) -> List[Dict[str, Any]]:
+        """Every file in the course (under `folder`), with its local relative path."""
+        folders = {f["id"]: _relative_folder(f.get("full_name") or "")
+                   for f in canvas_paginate(f"courses/{self.course_id}/folders")}
+        files = []
+        for f in canvas_paginate(f"courses/{self.course_id}/files"):
+            folder = folders.get(f.get("folder_id"), "")
+            if self.folder and folder != self.folder and not folder.startswith(self.folder + "/"):
+                continue
+            name = _safe(f.get("display_name") or f.get("filename") or str(f["id"]))
+            files.append({**f, "path": f"{folder}/{name}" if folder else name})
+        return files
+
+    # -- decisions ----------------------------------------------------------
+
+    def is_current(self, remote: Dict[str, Any], entry: Optional[Dict[str, Any]]) -> bool:
+        """True if the local copy matches the manifest entry and the entry matches Canvas."""
+        if not entry or entry.get("path") != remote["path"]:
+            return False
+        if entry.get("size") != remote.get("size") or entry.get("updated_at") != remote.get("updated_at"):
+            return False
+        local = os.path.join(self.dest, remote["path"])
+        try:
+            stat = os.stat(local)
+        except OSError:
+            return False
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime != entry.get("mtime"):
+            # Touched since the last sync: only the content hash can tell.
+            if _sha256(local) != entry.get("sha256"):
+                return False
+            entry["mtime"] = stat.st_mtime
+        return True
+
+    # -- downloading --------------------------------------------------------
+
+    def _part_path(self, remote: Dict[str, Any]) -> str:
+        stamp = re.sub(r"\D", "", remote.get("updated_at") or "")
+        head, name = os.path.split(os.path.join(self.dest, remote["path"]))
+        return os.path.join(head, f".{name}.{remote['id']}-{stamp}.part")
+
+    def download(self, remote: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stream one file to disk, resuming a previous `.part` if there is one.
+
+        A `.part` Canvas rejects (416 for a range past the end) or that ends up
+        the wrong size is deleted and the next attempt starts from byte 0;
+        connection errors and 5xx responses are retried with back-off.
+        """
+        target = os.path.join(self.dest, remote["path"])
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        part = self._part_path(remote)
+        resumed = False
+        problem = "no attempt made"
+        for attempt in range(DOWNLOAD_ATTEMPTS):
+            if attempt:
+                time.sleep(0.5 * 2 ** (attempt - 1))
+            offset = os.path.getsize(part) if os.path.exists(part) else 0
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            try:
+                with canvas_session().get(remote["url"], headers=headers, stream=True,
+                                          timeout=60) as resp:
+                    if resp.status_code == 416 and offset == remote.get("size"):
+                        pass  # the part file is already complete
+                    elif resp.status_code == 416:
+                        _discard(part)
+                        problem = f"range {offset}- rejected (416)"
+                        continue
+                    elif resp.status_code >= 500:
+                        problem = f"Canvas API error {resp.status_code}: {resp.text[:200]}"
+                        continue
+                    elif resp.status_code >= 400:
+                        raise RuntimeError(f"Canvas API error {resp.status_code}: {resp.text[:200]}")
+                    else:
+                        partial = resp.status_code == 206 and offset > 0
+                        resumed = resumed or partial
+                        with open(part, "ab" if partial else "wb") as f:
+                            for block in resp.iter_content(CHUNK_SIZE):
+                                f.write(block)
+                                with self._lock:
+                                    self.bytes += len(block)
+            except requests.RequestException as exc:
+                problem = str(exc)
+                continue
+            size = os.path.getsize(part)
+            if remote.get("size") is not None and size != remote["size"]:
+                _discard(part)
+                problem = f"Size mismatch: got {size}, expected {remote['size']}"
+                continue
+            sha = _sha256(part)
+            os.replace(part, target)
+            return {"sha256": sha, "resumed": resumed, "mtime": os.stat(target).st_mtime}
+        raise RuntimeError(f"Download of {remote['path']} failed after "
+                           f"{DOWNLOAD_ATTEMPTS} attempts: {problem}")
+
+    # -- run ----------------------------------------------------------------
+
+    def run(self, prune: bool = False) -> Dict[str, Any]:
+        """
+        Bring `dest` up to date.
+
+        Returns:
+            Dict[str, Any]: {'course_id', 'dest', 'manifest', 'files', 'downloaded',
+            'resumed', 'skipped', 'failed': [{'path', 'error'}], 'removed': [path],
+            'bytes', 'seconds', 'mb_per_s', 'entries': [manifest entries + 'status']}
+        """
+        started = time.time()
+        os.makedirs(self.dest, exist_ok=True)
+        manifest = load_manifest(self.dest)
+        old = manifest.get("files", {})
+        remote = self.remote_files()
+
+        todo, entries = [], {}
+        for f in remote:
+            entry = old.get(str(f["id"]))
+            if self.is_current(f, entry):
+                entries[str(f["id"])] = {**entry, "status": "unchanged"}
+            else:
+                todo.append(f)
+
+        def fetch(f: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                return self.download(f)
+            except (OSError, RuntimeError, requests.RequestException) as exc:
+                return {"error": str(exc)}
+
+        failed = []
+        for f, result in zip(todo, canvas_map(fetch, todo, max_workers=self.max_workers)):
+            if "error" in result:
+                failed.append({"path": f["path"], "error": result["error"]})
+                continue
+            entries[str(f["id"])] = {
+                "id": f["id"], "path": f["path"], "size": f.get("size"),
+                "updated_at": f.get("updated_at"), "content_type": f.get("content-type"),
+                "sha256": result["sha256"], "mtime": result["mtime"],
+                "status": "resumed" if result["resumed"] else "downloaded",
+            }
+
+        live = {str(f["id"]) for f in remote}
+        removed, out_of_scope = [], {}
+        for fid, entry in old.items():
+            if fid in live or fid in entries:
+                continue
+            if self.folder and not entry["path"].startswith(self.folder + "/"):
+                out_of_scope[fid] = entry  # not part of this sync; keep as is
+                continue
+            removed.append(entry["path"])
+            if prune:
+                try:
+                    os.remove(os.path.join(self.dest, entry["path"]))
+                except FileNotFoundError:
+                    pass
+            else:
+                entries[fid] = {**entry, "status": "removed"}
+
+        manifest = {
+            "course_id": self.course_id,
+            "synced_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "files": {**out_of_scope, **{fid: {k: v for k, v in e.items() if k != "status"}
+                                         for fid, e in entries.items()}},
+        }
+        path = _write_manifest(self.dest, manifest)
+        seconds = max(time.time() - started, 1e-9)
+        statuses = [e["status"] for e in entries.values()]
+        return {
+            "course_id": self.course_id,
+            "dest": self.dest,
+            "manifest": path,
+            "files": len(remote),
+            "downloaded": statuses.count("downloaded") + statuses.count("resumed"),
+            "resumed": statuses.count("resumed"),
+            "skipped": statuses.count("unchanged"),
+            "failed": failed,
+            "removed": removed,
+            "bytes": self.bytes,
+            "seconds": round(seconds, 2),
+            "mb_per_s": round(self.bytes / seconds / 1e6, 2),
+            "entries": sorted(({"path": e["path"], "id": e["id"], "size": e.get("size"),
+                                "status": e["status"]} for e in entries.values()),
+                              key=lambda e: e["path"]),
+        }
+
+
+def sync_files(course_id: int, dest: Optional[str] = None, folder: Optional[str] = None,
+               prune: bool = False, max_workers: int = DOWNLOAD_WORKERS) -> Dict[str, Any]:
+    """Sync a course's files into `dest` (default `CANVAS_FILES_DIR/<course_id>`)."""
+    dest = dest or os.path.join(FILES_DIR, str(course_id))
+    return FileSync(course_id, dest, folder, max_workers).run(prune)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download a Canvas course's files.")
+    parser.add_argument("--course", type=int, default=DEFAULT_COURSE_ID)
+    parser.add_argument("--dest", default=None)
+    parser.add_argument("--folder", default=None, help="Only this folder (path below the root).")
+    parser.add_argument("--prune", action="store_true", help="Delete local files removed in Canvas.")
+    parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS)
+    args = parser.parse_args()
+
+    result = sync_files(args.course, args.dest, args.folder, args.prune, args.workers)
+    print(f"Synced {result['files']} files of course {args.course} into {result['dest']} "
+          f"in {result['seconds']}s")
+    print(f"  downloaded: {result['downloaded']} ({result['resumed']} resumed), "
+          f"{result['bytes'] / 1e6:,.1f} MB at {result['mb_per_s']} MB/s")
+    print(f"  unchanged: {result['skipped']}")
+    for f in result["failed"]:
+        print(f"  FAILED {f['path']}: {f['error']}")
+    for path in result["removed"]:
+        print(f"  removed in Canvas: {path}")
+
+
+if __name__ == "__main__":
+    main()
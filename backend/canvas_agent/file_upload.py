@@ -0,0 +1,278 @@
+"""
+FILE UPLOADS
+============
+
+Canvas' three-step file upload
+(https://canvas.instructure.com/doc/api/file.file_uploads.html), streamed
+from disk so lecture recordings and datasets of several hundred MB never sit
+in memory:
+
+1. Preflight – POST the file's name, size and type to the context's `files`
+   endpoint; Canvas answers with an `upload_url` and `upload_params`
+2. Upload    – POST a multipart body (every upload param, then the file last)
+   to `upload_url` *without* the Canvas token.  The body is a `MultipartFile`:
+   a small header, the file read in `CHUNK_SIZE` blocks, and a trailer, with
+   a known length so `requests` sends a Content-Length instead of buffering
+3. Confirm   – follow the 3xx `Location` (or the `location` of a 201 body)
+   with the token to get the Canvas File object
+
+`upload_files` uploads several files at once through `canvas_map`; one
+`UploadProgress` shared by the uploads tracks bytes sent and throughput.
+The `upload_file` tool only uploads files under `CANVAS_UPLOAD_DIR`.
+
+    python -m canvas_agent.file_upload --course 123 --folder "Lectures/Week 3" rec1.mp4 rec2.mp4
+"""
+
+import argparse
+import mimetypes
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from canvas_agent.openai_tools import canvas_map, canvas_request
+
+CHUNK_SIZE = 1024 * 1024
+# Upload concurrency; uploads are bandwidth-bound, so fewer than CANVAS_MAX_WORKERS.
+UPLOAD_WORKERS = int(os.getenv("CANVAS_UPLOAD_WORKERS", "4"))
+PROGRESS_INTERVAL = 1.0
+# The only directory the `upload_file` tool may read from (the CLI is not limited).
+UPLOAD_DIR = os.getenv("CANVAS_UPLOAD_DIR", "uploads")
+
+_local = threading.local()
+
+
+def _upload_session() -> requests.Session:
+    """Per-thread session *without* the Canvas token (the upload host may be S3)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+class UploadProgress:
+    """Bytes sent across a batch of uploads.  Safe to share between threads."""
+
+    def __init__(self, total_bytes: int,
+                 callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 interval: float = PROGRESS_INTERVAL):
+        self.total = total_bytes
+        self.sent = 0
+        self.files_done = 0
+        self.started = time.time()
+        self.callback = callback
+        self.interval = interval
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+
+    def advance(self, n: int) -> None:
+        with self._lock:
+            self.sent += n
+            due = self.callback and time.time() - self._last_report >= self.interval
+            if due:
+                self._last_report = time.time()
+        if due:
+            self.callback(self.snapshot())
+
+    def file_done(self) -> None:
+        with self._lock:
+            self.files_done += 1
+        if self.callback:
+            self.callback(self.snapshot())
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = max(time.time() - self.started, 1e-9)
+        return {
+            "sent_bytes": self.sent,
+            "total_bytes": self.total,
+            "percent": round(100.0 * self.sent / self.total, 1) if self.total else 100.0,
+            "files_done": self.files_done,
+            "seconds": round(elapsed, 2),
+            "mb_per_s": round(self.sent / elapsed / 1e6, 2),
+        }
+
+
+class MultipartFile:
+    """
+    A multipart/form-data body streamed from disk.
+
+    `requests` sends any iterable body with a `__len__` as a sized stream, and
+    `http.client` reads it block by block via `read`.
+    """
+
+    def __init__(self, path: str, fields: Dict[str, Any], file_field: str = "file",
+                 content_type: str = "application/octet-stream",
+                 progress: Optional[UploadProgress] = None):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        head = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode("utf-8")
+            for name, value in fields.items())
+        head += (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+                 f'filename="{os.path.basename(path)}"\r\n'
+                 f"Content-Type: {content_type}\r\n\r\n").encode("utf-8")
+        self._head = head
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        self._size = os.path.getsize(path)
+        self._file = open(path, "rb")
+        self._progress = progress
+        self._stage = 0  # 0 head, 1 file, 2 tail, 3 done
+
+    def __len__(self) -> int:
+        return len(self._head) + self._size + len(self._tail)
+
+    def read(self, size: int = -1) -> bytes:
+        size = CHUNK_SIZE if size is None or size < 0 else size
+        while self._stage < 3:
+            if self._stage == 0:
+                self._stage = 1
+                return self._head
+            if self._stage == 1:
+                block = self._file.read(size)
+                if block:
+                    if self._progress:
+                        self._progress.advance(len(block))
+                    return block
+                self._file.close()
+                self._stage = 2
+            else:
+                self._stage = 3
+                return self._tail
+        return b""
+
+    def __iter__(self) -> Iterator[bytes]:
+        while block := self.read(CHUNK_SIZE):
+            yield block
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def upload_path(
+    context: str,
+    path: str,
+    folder: Optional[str] = None,
+    name: Optional[str] = None,
+    on_duplicate: str = "overwrite",
+    progress: Optional[UploadProgress] = None,
+) -> Dict[str, Any]:
+    """
+    Upload one file from disk into a Canvas context.
+
+    Args:
+        context: API path of the owning context, e.g. "courses/123",
+            "folders/456" or "users/self".
+        path: Local file path.
+        folder: Target folder path in the context (created if missing).
+        name: File name in Canvas (default: the local file name).
+        on_duplicate: "overwrite" or "rename".
+        progress: Shared progress tracker.
+
+    Returns:
+        Dict[str, Any]: The Canvas File object.
+
+    Raises:
+        RuntimeError: If any of the three steps fails.
+    """
+    size = os.path.getsize(path)
+    name = name or os.path.basename(path)
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    preflight = {"name": name, "size": size, "content_type": content_type,
+                 "on_duplicate": on_duplicate}
+    if folder:
+        preflight["parent_folder_path"] = folder
+    ticket = canvas_request("POST", f"{context}/files", json=preflight).json()
+
+    body = MultipartFile(path, ticket.get("upload_params") or {},
+                         file_field=ticket.get("file_param") or "file",
+                         content_type=content_type, progress=progress)
+    try:
+        resp = _upload_session().post(ticket["upload_url"], data=body,
+                                      headers={"Content-Type": body.content_type},
+                                      allow_redirects=False)
+    finally:
+        body.close()
+    if resp.status_code >= 400:
+        raise RuntimeError(f"Canvas upload error {resp.status_code}: {resp.text}")
+
+    if resp.is_redirect:
+        file = canvas_request("GET", resp.headers["Location"]).json()
+    else:
+        file = resp.json() if resp.content else {}
+        if file.get("location") and "id" not in file:
+            file = canvas_request("GET", file["location"]).json()
+    if progress:
+        progress.file_done()
+    return file
+
+
+def upload_files(
+    context: str,
+    paths: List[str],
+    folder: Optional[str] = None,
+    on_duplicate: str = "overwrite",
+    callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    max_workers: int = UPLOAD_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Upload several files concurrently.
+
+    Returns:
+        Dict[str, Any]: {'files': [{'path', 'id', 'display_name', 'size', 'url',
+        'seconds', 'mb_per_s'} or {'path', 'error'}], plus the final
+        `UploadProgress.snapshot()` fields}
+    """
+    progress = UploadProgress(sum(os.path.getsize(p) for p in paths), callback)
+
+    def one(path: str) -> Dict[str, Any]:
+        started = time.time()
+        try:
+            file = upload_path(context, path, folder, on_duplicate=on_duplicate, progress=progress)
+        except (OSError, RuntimeError, requests.RequestException) as exc:
+            return {"path": path, "error": str(exc)}
+        seconds = max(time.time() - started, 1e-9)
+        size = file.get("size") or os.path.getsize(path)
+        return {"path": path, "id": file.get("id"), "display_name": file.get("display_name"),
+                "size": size, "url": file.get("url"), "seconds": round(seconds, 2),
+                "mb_per_s": round(size / seconds / 1e6, 2)}
+
+    files = canvas_map(one, paths, max_workers=max_workers)
+    return {"files": files, **progress.snapshot()}
+
+
+def _print_progress(snap: Dict[str, Any]) -> None:
+    sys.stderr.write(f"\r{snap['percent']:5.1f}%  {snap['sent_bytes'] / 1e6:,.1f}/"
+                     f"{snap['total_bytes'] / 1e6:,.1f} MB  {snap['mb_per_s']:.2f} MB/s  "
+                     f"{snap['files_done']} files done")
+    sys.stderr.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload files to a Canvas course.")
+    parser.add_argument("--course", type=int, required=True)
+    parser.add_argument("--folder", default=None, help="Target folder path in the course.")
+    parser.add_argument("--rename", action="store_true", help="Rename instead of overwriting.")
+    parser.add_argument("--workers", type=int, default=UPLOAD_WORKERS)
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    result = upload_files(f"courses/{args.course}", args.paths, args.folder,
+                          on_duplicate="rename" if args.rename else "overwrite",
+                          callback=_print_progress, max_workers=args.workers)
+    sys.stderr.write("\n")
+    for f in result["files"]:
+        if "error" in f:
+            print(f"  {f['path']}: FAILED {f['error']}")
+        else:
+            print(f"  {f['path']} -> file {f['id']} ({f['mb_per_s']} MB/s)")
+    print(f"Uploaded {result['sent_bytes'] / 1e6:,.1f} MB in {result['seconds']}s "
+          f"({result['mb_per_s']} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+GRADE TIMELINE
+==============
+
+Indexed queries over the mirrored gradebook history (`grade_events`), so the
+agent can ask small questions ("what was this grade before the regrade?",
+"who graded most this week?") without reading the raw feed.
+
+The mirror keeps three indexes on `grade_events` for these lookups:
+
+* `(course_id, user_id, assignment_id, graded_at)` – one student's history on
+  one assignment, and "grade as of <time>" as a single index seek
+* `(course_id, grader_id, graded_at)`            – one grader over a range
+* `(course_id, graded_at, grader_id)`            – per-day / per-week grader
+  counts over a time range, answered from the index alone
+
+Days and weeks are the course's local ones (its Canvas `time_zone`), the
+same days Canvas's gradebook history is organised by: grade times are stored
+in UTC and converted per row by the `local_date` SQL function.
+
+`timeline_for(course_id)` returns a timeline whose events are caught up with
+Canvas: it uses the configured mirror when there is one (continuing the feed
+from its saved cursor when stale), otherwise a process-local in-memory store.
+"""
+
+import threading
+from datetime import date as Date, datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from canvas_agent.course_mirror import CourseMirror, get_mirror, name_sql, utc_iso
+from canvas_agent.grade_history import RESOURCE, GradeHistoryIngester
+from canvas_agent.openai_tools import canvas_get, canvas_paginate
+
+BUCKETS = ("day", "week")
+
+# Course-local date of graded_at, and the Monday of its ISO week.  The zone
+# name is the query's first parameter.
+_DAY = "local_date(g.graded_at, ?)"
+_WEEK = f"date({_DAY}, '-6 days', 'weekday 1')"
+
+_GRADER = name_sql("g.course_id", "g.grader_id")
+_STUDENT = name_sql("g.course_id", "g.user_id")
+
+_memory: Optional[CourseMirror] = None
+_memory_lock = threading.Lock()
+
+_zones: Dict[int, tzinfo] = {}
+
+
+def course_zone(course_id: int) -> tzinfo:
+    """The course's time zone: Canvas's grading days are course-local dates."""
+    if course_id not in _zones:
+        name = canvas_get(f"courses/{course_id}").get("time_zone")
+        try:
+            _zones[course_id] = ZoneInfo(name) if name else timezone.utc
+        except (ZoneInfoNotFoundError, ValueError):
+            _zones[course_id] = timezone.utc
+    return _zones[course_id]
+
+
+def day_bounds(day: str, zone: tzinfo) -> Tuple[str, str]:
+    """UTC [start, end) of a course-local 'YYYY-MM-DD' day."""
+    start = datetime.combine(Date.fromisoformat(day), datetime.min.time(), zone)
+    return utc_iso(start.isoformat()), utc_iso((start + timedelta(days=1)).isoformat())
+
+
+@lru_cache(maxsize=None)
+def _zone_named(name: str) -> tzinfo:
+    return timezone.utc if name == "UTC" else ZoneInfo(name)
+
+
+def _local_date(graded_at: Optional[str], zone: str) -> Optional[str]:
+    """SQL `local_date(graded_at, zone)`: the 'YYYY-MM-DD' date of a stored UTC time in `zone`."""
+    if not graded_at:
+        return None
+    moment = datetime.fromisoformat(graded_at.replace("Z", "+00:00"))
+    return moment.astimezone(_zone_named(zone)).date().isoformat()
+
+
+def _bounds(since: Optional[str], until: Optional[str], zone: tzinfo) -> Tuple[str, str]:
+    """
+    [since, until] as graded_at string bounds (normalized to UTC like the stored
+    values); bare dates are course-local days, and one in `until` covers the
+    whole day.
+    """
+    low = utc_iso(since) or ""
+    high = utc_iso(until) or "9999"
+    if since and len(since) == 10:
+        low = day_bounds(since, zone)[0]
+    if until and len(until) == 10:
+        end = datetime.fromisoformat(day_bounds(until, zone)[1].replace("Z", "+00:00"))
+        high = utc_iso((end - timedelta(seconds=1)).isoformat())
+    return low, high
+
+
+class GradeTimeline:
+    """Point and range queries over one mirror's grade-change events."""
+
+    def __init__(self, mirror: CourseMirror):
+        self.mirror = mirror
+        mirror.db.create_function("local_date", 2, _local_date, deterministic=True)
+
+    def catch_up(self, course_id: int) -> int:
+        """Ingest events graded since the last read; load names if the mirror has none."""
+        added = 0
+        if not self.mirror.is_fresh(course_id, RESOURCE):
+            added = GradeHistoryIngester(self.mirror, course_id).run()
+        if not self.mirror.sync_state(course_id, "enrollments"):
+            self.mirror.upsert_enrollments(course_id, canvas_paginate(
+                f"courses/{course_id}/enrollments", params={"include[]": ["grades"]}))
+            self.mirror.mark_synced(course_id, "enrollments",
+                                    self.mirror.watermark(course_id, "enrollments"))
+        if not self.mirror.sync_state(course_id, "assignments"):
+            self.mirror.upsert_assignments(course_id, canvas_paginate(
+                f"courses/{course_id}/assignments",
+                params={"exclude_response_fields[]": ["description", "rubric"]}))
+            self.mirror.mark_synced(course_id, "assignments",
+                                    self.mirror.watermark(course_id, "assignments"))
+        return added
+
+    # -- per (student, assignment) ------------------------------------------
+
+    def history(self, course_id: int, user_id: int, assignment_id: int) -> List[Dict[str, Any]]:
+        """Every grade change for one student on one assignment, oldest first."""
+        return self.mirror._query(
+            "SELECT g.graded_at, g.previous_grade, g.new_grade, g.grader_id, "
+            f"{_GRADER} AS grader FROM grade_events g "
+            "WHERE g.course_id = ? AND g.user_id = ? AND g.assignment_id = ? "
+            "ORDER BY g.graded_at",
+            (course_id, user_id, assignment_id))
+
+    def grade_as_of(self, course_id: int, user_id: int, assignment_id: int,
+                    at: str) -> Optional[Dict[str, Any]]:
+        """The last grade change at or before `at`, or None if it was not graded yet."""
+        _, high = _bounds(None, at, course_zone(course_id))
+        rows = self.mirror._query(
+            "SELECT g.graded_at, g.previous_grade, g.new_grade, g.grader_id, "
+            f"{_GRADER} AS grader FROM grade_events g "
+            "WHERE g.course_id = ? AND g.user_id = ? AND g.assignment_id = ? "
+            "AND g.graded_at <= ? ORDER BY g.graded_at DESC LIMIT 1",
+            (course_id, user_id, assignment_id, high))
+        return rows[0] if rows else None
+
+    # -- per grader / time bucket -------------------------------------------
+
+    def grader_counts(self, course_id: int, since: Optional[str] = None,
+                      until: Optional[str] = None, bucket: Optional[str] = None,
+                      grader_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Grade changes per grader (and per `bucket` if given) within [since, until].
+
+        Returns:
+            List[Dict[str, Any]]: {'bucket'?, 'grader_id', 'grader', 'changes',
+            'students', 'assignments'} rows, ordered by bucket then changes.
+        """
+        if bucket is not None and bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of {BUCKETS}")
+        zone = course_zone(course_id)
+        low, high = _bounds(since, until, zone)
+        key = {"day": _DAY, "week": _WEEK}.get(bucket or "")
+        where = "g.course_id = ? AND g.graded_at >= ? AND g.graded_at <= ?"
+        params: tuple = (course_id, low, high)
+        if grader_id is not None:
+            where += " AND g.grader_id = ?"
+            params += (grader_id,)
+        select = f"{key} AS bucket, " if key else ""
+        group = "bucket, g.grader_id" if key else "g.grader_id"
+        order = "bucket, changes DESC" if key else "changes DESC"
+        if key:
+            params = (str(zone),) + params
+        return self.mirror._query(
+            f"SELECT {select}g.grader_id, {_GRADER} AS grader, COUNT(*) AS changes, "
+            "COUNT(DISTINCT g.user_id) AS students, "
+            "COUNT(DISTINCT g.assignment_id) AS assignments "
+            "FROM grade_events g "
+            f"WHERE {where} GROUP BY {group} ORDER BY {order}",
+            params)
+
+    def regrades(self, course_id: int, since: Optional[str] = None,
+                 until: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Changes that replaced an existing grade with a different one, newest first."""
+        low, high = _bounds(since, until, course_zone(course_id))
+        return self.mirror._query(
+            f"SELECT g.graded_at, g.user_id, {_STUDENT} AS user_name, g.assignment_id, "
+            "a.name AS assignment_name, g.previous_grade, g.new_grade, g.grader_id, "
+            f"{_GRADER} AS grader FROM grade_events g "
+            "LEFT JOIN assignments a ON a.id = g.assignment_id "
+            "WHERE g.course_id = ? AND g.graded_at >= ? AND g.graded_at <= ? "
+            "AND g.previous_grade IS NOT NULL AND g.previous_grade IS NOT g.new_grade "
+            "ORDER BY g.graded_at DESC LIMIT ?",
+            (course_id, low, high, limit))
+
+
+def timeline_for(course_id: int) -> GradeTimeline:
+    """A timeline over the configured mirror (or an in-memory one), caught up for `course_id`."""
+    global _memory
+    mirror = get_mirror()
+    if mirror is None:
+        with _memory_lock:
+            if _memory is None:
+                _memory = CourseMirror(":memory:")
+            mirror = _memory
+    timeline = GradeTimeline(mirror)
+    timeline.catch_up(course_id)
+    return timeline
@@ -0,0 +1,135 @@
+"""
+HTML TO TEXT
+============
+
+Compact plain text from Canvas rich-content HTML (pages, descriptions,
+announcements) for the model to read: block structure survives as line
+breaks, headings as `#` prefixes, list items as `-` / `1.`, links as
+`text (url)`, tables as ` | `-separated rows.  Scripts, styles and images
+are dropped and whitespace is collapsed, except inside `<pre>`.
+
+    html_to_text("<h2>Late work</h2><ul><li>-10% per day</li></ul>")
+    # '## Late work\n- -10% per day'
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List, Optional
+
+_BLOCKS = {"p", "div", "section", "article", "header", "footer", "blockquote", "pre",
+           "table", "tr", "ul", "ol", "dl", "dt", "dd", "hr", "h1", "h2", "h3", "h4",
+           "h5", "h6", "li", "figure", "figcaption", "address", "details", "summary"}
+_SKIP = {"script", "style", "noscript", "template", "head", "iframe", "svg"}
+
+
+class _TextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self.line: List[str] = []
+        self.skip = 0
+        self.lists: List[List[int]] = []  # [counter] for <ol>, [] for <ul>
+        self.href: Optional[str] = None
+        self.link_text: List[str] = []
+        self.cells = 0
+        self.indent = ""
+        self.bullet = False  # the line holds only a list marker so far
+        self.pre = 0
+        self.pre_text: List[str] = []
+
+    def newline(self) -> None:
+        text = re.sub(r"\s+", " ", "".join(self.line)).strip()
+        if text:
+            self.lines.append(self.indent + text)
+        self.line = []
+        self.indent = ""
+        self.bullet = False
+
+    def flush_pre(self) -> None:
+        text = "".join(self.pre_text).strip("\n").rstrip()
+        if text:
+            self.lines.append(text)
+        self.pre_text = []
+
+    def emit(self, text: str) -> None:
+        (self.pre_text if self.pre else self.line).append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP:
+            self.skip += 1
+            return
+        # <li><p>text</p></li> keeps the text on the marker's line.
+        if tag in _BLOCKS and not (self.bullet and tag not in ("li", "ul", "ol", "pre")):
+            self.newline()
+        if tag == "pre":
+            self.pre += 1
+        elif tag in ("ul", "ol"):
+            self.lists.append([0] if tag == "ol" else [])
+        elif tag == "li":
+            self.indent = "  " * max(len(self.lists) - 1, 0)
+            counter = self.lists[-1] if self.lists else []
+            if counter:
+                counter[0] += 1
+                self.line.append(f"{counter[0]}. ")
+            else:
+                self.line.append("- ")
+            self.bullet = True
+        elif tag[:1] == "h" and tag[1:].isdigit():
+            self.line.append("#" * int(tag[1:]) + " ")
+        elif tag == "br":
+            if self.pre:
+                self.pre_text.append("\n")
+            else:
+                self.newline()
+        elif tag == "tr":
+            self.cells = 0
+        elif tag in ("td", "th"):
+            if self.cells:
+                self.line.append(" | ")
+            self.cells += 1
+        elif tag == "a":
+            self.href = dict(attrs).get("href")
+            self.link_text = []
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP:
+            self.skip = max(self.skip - 1, 0)
+            return
+        if tag == "a" and self.href is not None:
+            text = "".join(self.link_text).strip()
+            href = self.href
+            if href and not href.startswith(("#", "javascript:")) and href != text:
+                self.emit(f" ({href})")
+            self.href = None
+        if tag == "pre" and self.pre:
+            self.pre -= 1
+            if not self.pre:
+                self.flush_pre()
+        if tag in ("ul", "ol") and self.lists:
+            self.lists.pop()
+        if tag in _BLOCKS:
+            self.newline()
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        if data.strip():
+            self.bullet = False
+        self.emit(data)
+        if self.href is not None:
+            self.link_text.append(data)
+
+    def text(self) -> str:
+        self.flush_pre()
+        self.newline()
+        return "\n".join(self.lines)
+
+
+def html_to_text(html: Optional[str]) -> str:
+    """Plain text of an HTML fragment (see module docstring)."""
+    if not html:
+        return ""
+    parser = _TextParser()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
@@ -1,13 +1,18 @@
 from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel, create_model
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, Callable, Iterable, Tuple, TypeVar
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 import os
+import threading
+import time
 import requests
 from dotenv import load_dotenv
-from agents import Agent, RunContextWrapper, function_tool
+from agents import Agent, RunContextWrapper
 from canvasapi import Canvas
 
+from canvas_agent.tool_schemas import function_tool
+
 # —————————————————————————————
 # Pydantic models
 # —————————————————————————————
@@ -24,6 +29,10 @@ load_dotenv()
 
 CANVAS_API_URL = os.getenv('CANVAS_API_URL')
 CANVAS_API_TOKEN = os.getenv('CANVAS_API_TOKEN')
+# The course the agent answers about when the user does not name one.
+DEFAULT_COURSE_ID = int(os.getenv('CANVAS_COURSE_ID', '11883051'))
+# Upper bound on concurrent Canvas requests from one fan-out.
+CANVAS_MAX_WORKERS = int(os.getenv('CANVAS_MAX_WORKERS', '8'))
 
 
 def get_canvas():
@@ -39,3 +48,172 @@ def get_canvas():
     url = os.getenv('CANVAS_API_URL')
     token = os.getenv('CANVAS_API_TOKEN')
     return Canvas(url, token)
+
+
+_local = threading.local()
+
+
+def canvas_session() -> requests.Session:
+    """
+    Return a per-thread `requests.Session` authenticated against Canvas.
+
+    Sessions keep connections alive between calls; one per thread keeps them
+    safe to use from the worker pools that fan out Canvas requests.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["Authorization"] = f"Bearer {CANVAS_API_TOKEN}"
+        _local.session = session
+    return session
+
+
+def canvas_request(
+    method: str,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    json: Optional[Dict[str, Any]] = None,
+    retries: int = 3,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send one request to the Canvas REST API.
+
+    Args:
+        method: HTTP verb.
+        path: Path below `/api/v1/` (e.g. "courses/1/assignments") or a full URL,
+            such as a `Link: rel="next"` URL returned by a previous call.
+        params: Query string parameters. List values repeat the key (`include[]`).
+        json: JSON body.
+        retries: How many times to back off and retry when Canvas throttles
+            (403 "Rate Limit Exceeded" or 429).
+
+    Returns:
+        requests.Response: The successful response.
+
+    Raises:
+        RuntimeError: On any other 4xx/5xx response.
+    """
+    url = path if path.startswith("http") else f"{CANVAS_API_URL}/api/v1/{path.lstrip('/')}"
+    for attempt in range(retries + 1):
+        resp = canvas_session().request(method, url, params=params, json=json, **kwargs)
+        throttled = resp.status_code == 429 or (
+            resp.status_code == 403 and "Rate Limit Exceeded" in resp.text)
+        if not throttled or attempt == retries:
+            break
+        time.sleep(0.5 * 2 ** attempt)
+    if resp.status_code >= 400:
+        raise RuntimeError(f"Canvas API error {resp.status_code}: {resp.text}")
+    return resp
+
+
+def canvas_get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """GET a single Canvas resource and return the decoded JSON."""
+    return canvas_request("GET", path, params=params).json()
+
+
+def canvas_paginate(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    key: Optional[str] = None,
+    per_page: int = 100,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every item of a paginated Canvas list, following `Link: rel="next"`.
+
+    Args:
+        path: Path below `/api/v1/`.
+        params: Query string parameters for the first page.
+        key: For endpoints that wrap the list in an object
+            (e.g. "quiz_submissions"), the key holding the items.
+        per_page: Page size to request (Canvas caps this at 100).
+    """
+    for page in canvas_pages(path, params, per_page):
+        yield from (page[key] if key else page)
+
+
+def canvas_pages(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    per_page: int = 100,
+) -> Iterator[Any]:
+    """
+    Yield the decoded body of every page of a paginated Canvas list.
+
+    Use this instead of `canvas_paginate` when a page carries side-loaded
+    objects next to the list (e.g. quiz submissions with `include[]=user`).
+    """
+    params = {**(params or {}), "per_page": per_page}
+    url: Optional[str] = path
+    while url:
+        resp = canvas_request("GET", url, params=params)
+        yield resp.json()
+        url = resp.links.get("next", {}).get("url")
+        params = None  # the next URL already carries the query string
+
+
+def path_within(base: str, path: str) -> Optional[str]:
+    """
+    Resolve a path the model supplied against a directory the tools may use.
+
+    `path` is taken relative to `base` (absolute paths as they are) and
+    resolved with symlinks and `..` followed.
+
+    Returns:
+        Optional[str]: The resolved path if it lies inside `base`, else None.
+    """
+    root = os.path.realpath(base)
+    full = os.path.realpath(os.path.join(root, path))
+    return full if os.path.commonpath([root, full]) == root else None
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def canvas_map(fn: Callable[[T], R], items: Iterable[T], max_workers: Optional[int] = None) -> List[R]:
+    """
+    Apply `fn` to every item concurrently and return the results in input order.
+
+    Used to fan out independent Canvas requests (one per assignment, quiz, term...).
+    Concurrency is capped at `CANVAS_MAX_WORKERS` so a fan-out stays inside the
+    Canvas rate limit; `canvas_request` backs off if it is hit anyway.
+    """
+    items = list(items)
+    if not items:
+        return []
+    workers = min(max_workers or CANVAS_MAX_WORKERS, len(items))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
+
+
+def canvas_imap(
+    fn: Callable[[T], R], items: Iterable[T], max_workers: Optional[int] = None
+) -> Iterator[Tuple[T, R]]:
+    """
+    Like `canvas_map`, but streaming: `items` is consumed lazily (e.g. straight
+    from `canvas_paginate`) and `(item, result)` pairs are yielded as they
+    complete, in completion order.
+
+    At most `max_workers` calls are in flight at once, so a long listing never
+    queues more work than the limit allows and results can be aggregated while
+    later pages are still being read.
+    """
+    limit = max_workers or CANVAS_MAX_WORKERS
+    source = iter(items)
+    with ThreadPoolExecutor(max_workers=limit) as pool:
+        pending = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < limit:
+                try:
+                    item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[pool.submit(fn, item)] = item
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
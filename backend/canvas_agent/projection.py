@@ -0,0 +1,129 @@
+"""
+FIELD PROJECTION
+================
+
+Shared "detail level" / field-set handling for the heavy Canvas read tools.
+
+Each resource has three named detail levels:
+
+* ``minimal``  – ids, state and numbers only; what the agent needs to count/rank
+* ``standard`` – adds names, dates and short text; the default for tools
+* ``full``     – everything the tool knows how to return, including HTML bodies
+
+A tool can also take an explicit ``fields`` list, which wins over ``detail``;
+unknown names are an error that lists the valid ones (tools pass
+`fields_error` as their ``failure_error_function`` so the model sees it).
+Heavy fields are dropped at the source where Canvas allows it (see
+`canvas_params`) and stripped client-side otherwise (see `project`).
+"""
+
+from typing import Any, Dict, Iterable, List, Literal, Optional
+
+from agents.tool import default_tool_error_function
+
+Detail = Literal["minimal", "standard", "full"]
+
+FIELD_SETS: Dict[str, Dict[str, List[str]]] = {
+    "submission": {
+        "minimal": ["submission_id", "user_id", "workflow_state", "score",
+                    "late", "missing"],
+        "standard": ["submission_id", "user_id", "user_name", "submission_type",
+                     "workflow_state", "grade", "score", "submitted_at",
+                     "graded_at", "late", "missing"],
+        "full": ["submission_id", "user_id", "user_name", "submission_type",
+                 "workflow_state", "grade", "score", "body", "submitted_at",
+                 "graded_at", "late", "missing", "preview_url"],
+    },
+    "assignment": {
+        "minimal": ["id", "name", "due_at", "points_possible", "published"],
+        "standard": ["id", "name", "due_at", "points_possible", "submission_types",
+                     "is_quiz_assignment", "published", "html_url"],
+        "full": ["id", "name", "description", "due_at", "points_possible",
+                 "submission_types", "is_quiz_assignment", "published", "html_url"],
+    },
+    "quiz_question": {
+        "minimal": ["id", "position", "question_name", "question_type",
+                    "points_possible"],
+        "standard": ["id", "position", "quiz_group_id", "question_name",
+                     "question_type", "question_text", "points_possible", "answers"],
+        "full": ["id", "quiz_id", "position", "quiz_group_id", "question_name",
+                 "question_type", "question_text", "points_possible",
+                 "correct_comments", "incorrect_comments", "neutral_comments",
+                 "text_after_answers", "answers"],
+    },
+}
+
+# Below "full", nested lists are trimmed to these keys as well.
+NESTED_FIELDS: Dict[str, Dict[str, List[str]]] = {
+    "quiz_question": {"answers": ["id", "text", "weight"]},
+}
+
+
+class UnknownFieldsError(ValueError):
+    """Raised by `select_fields` for field names the resource does not have."""
+
+
+def fields_error(ctx: Any, error: Exception) -> str:
+    """
+    `failure_error_function` for tools taking `fields`: an `UnknownFieldsError`
+    is shown to the model so it can retry with valid names; anything else gets
+    the SDK's generic message.
+    """
+    if isinstance(error, UnknownFieldsError):
+        return str(error)
+    return default_tool_error_function(ctx, error)
+
+
+def select_fields(
+    resource: str, detail: Detail = "standard", fields: Optional[Iterable[str]] = None
+) -> List[str]:
+    """
+    Resolve the field list for a resource.
+
+    Args:
+        resource: Key into `FIELD_SETS` ("submission", "assignment", ...).
+        detail: Named detail level, used when `fields` is empty.
+        fields: Explicit field names.
+
+    Returns:
+        List[str]: Fields to keep, in the resource's canonical order.
+
+    Raises:
+        UnknownFieldsError: If any of `fields` is not a field of the resource.
+    """
+    known = FIELD_SETS[resource]["full"]
+    if fields:
+        wanted = set(fields)
+        unknown = sorted(wanted - set(known))
+        if unknown:
+            raise UnknownFieldsError(f"Unknown {resource} fields {unknown}; "
+                                     f"valid fields are {known}")
+        return [f for f in known if f in wanted]
+    return list(FIELD_SETS[resource][detail])
+
+
+def project(
+    record: Dict[str, Any], resource: str, fields: List[str], detail: Detail = "standard"
+) -> Dict[str, Any]:
+    """Keep only `fields` of `record`, trimming nested lists unless detail is "full"."""
+    out = {f: record.get(f) for f in fields}
+    if detail != "full":
+        for name, keep in NESTED_FIELDS.get(resource, {}).items():
+            if isinstance(out.get(name), list):
+                out[name] = [{k: item.get(k) for k in keep} for item in out[name]]
+    return out
+
+
+def canvas_params(resource: str, fields: List[str]) -> Dict[str, Any]:
+    """
+    Canvas query parameters that avoid fetching what `fields` does not need.
+
+    * submissions: never side-load `user`; names are joined from the course
+      roster index (`canvas_agent.roster`)
+    * assignments: `exclude_response_fields[]` for the description and rubric
+    """
+    wanted = set(fields)
+    if resource == "assignment":
+        exclude = ["rubric"] + ([] if "description" in wanted else ["description"])
+        return {"exclude_response_fields[]": exclude}
+    return {}
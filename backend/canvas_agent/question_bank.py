@@ -0,0 +1,254 @@
+"""
+QUESTION BANK PARSERS
+=====================
+
+Turn a question bank file into plain Canvas-shaped question dicts for the
+bulk import tool (`canvas_quiz_questions.import_quiz_questions`).
+
+Every parser returns `(groups, questions)`:
+
+* groups    – [{'name', 'pick_count', 'question_points'}]
+* questions – [{'question_name', 'question_text', 'question_type',
+                'points_possible', 'answers': [{'text', 'weight'}], 'group'}]
+
+Supported formats (chosen by file extension):
+
+Markdown (.md)::
+
+    ## Group: Warm-up (pick 2, 1 pts)
+    ### Capital of France [multiple_choice, 1 pts]
+    Which city is the capital of France?
+    - [x] Paris
+    - [ ] Lyon
+
+  Headings at level 2 open a group (`## Group: name`) or close it
+  (`## End group`).  The type/points suffix is optional; the type is inferred
+  from the answers when omitted.
+
+CSV (.csv): columns `question_name, question_type, points_possible, group,
+question_text, answers`, where `answers` is `|`-separated and correct answers
+are prefixed with `*` (e.g. `*Paris|Lyon|Nice`).
+
+QTI (.xml, or a Canvas/QTI 1.2 export .zip): `<item>` elements with Canvas'
+`question_type` / `points_possible` metadata; `<section>` elements with a
+`<selection_number>` become groups.
+"""
+
+import csv
+import io
+import os
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+
+Parsed = Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+
+CHOICE_TYPES = {"multiple_choice_question", "multiple_answers_question", "true_false_question"}
+
+
+def infer_type(answers: List[Dict[str, Any]]) -> str:
+    """Question type implied by a list of answers with 0/100 weights."""
+    if not answers:
+        return "essay_question"
+    correct = sum(1 for a in answers if a.get("weight"))
+    texts = sorted(a["text"].strip().lower() for a in answers)
+    if texts == ["false", "true"]:
+        return "true_false_question"
+    if len(answers) == correct:
+        return "short_answer_question"
+    return "multiple_answers_question" if correct > 1 else "multiple_choice_question"
+
+
+def _type_name(value: str) -> str:
+    value = value.strip().lower().replace(" ", "_").replace("-", "_")
+    return value if value.endswith("_question") else value + "_question"
+
+
+def _points(value: Any) -> Optional[float]:
+    if value in (None, ""):
+        return None
+    return float(str(value).lower().replace("pts", "").replace("pt", "").strip())
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# M A R K D O W N
+# ────────────────────────────────────────────────────────────────────────────────
+
+_GROUP = re.compile(r"^##\s+group:\s*(?P<name>.+?)\s*(\((?P<opts>[^)]*)\))?\s*$", re.I)
+_END_GROUP = re.compile(r"^##\s+end\s+group\s*$", re.I)
+_QUESTION = re.compile(r"^###\s+(?P<name>.+?)\s*(\[(?P<meta>[^\]]*)\])?\s*$")
+_ANSWER = re.compile(r"^\s*[-*]\s+\[(?P<mark>[ xX])\]\s+(?P<text>.+?)\s*$")
+
+
+def parse_markdown(text: str) -> Parsed:
+    groups: List[Dict[str, Any]] = []
+    questions: List[Dict[str, Any]] = []
+    group: Optional[str] = None
+    current: Optional[Dict[str, Any]] = None
+    body: List[str] = []
+
+    def finish() -> None:
+        if current is None:
+            return
+        current["question_text"] = "\n".join(body).strip()
+        if not current["question_type"]:
+            current["question_type"] = infer_type(current["answers"])
+        questions.append(current)
+
+    for line in text.splitlines():
+        if m := _GROUP.match(line):
+            finish()
+            current, body = None, []
+            group = m["name"]
+            opts = m["opts"] or ""
+            pick = re.search(r"pick\s+(\d+)", opts, re.I)
+            pts = re.search(r"([\d.]+)\s*pts?", opts, re.I)
+            groups.append({"name": group, "pick_count": int(pick[1]) if pick else None,
+                           "question_points": float(pts[1]) if pts else None})
+        elif _END_GROUP.match(line):
+            finish()
+            current, body, group = None, [], None
+        elif m := _QUESTION.match(line):
+            finish()
+            qtype, points = None, None
+            for part in (m["meta"] or "").split(","):
+                part = part.strip()
+                if re.match(r"^[\d.]+\s*pts?$", part, re.I):
+                    points = _points(part)
+                elif part:
+                    qtype = _type_name(part)
+            current = {"question_name": m["name"], "question_type": qtype,
+                       "points_possible": points, "answers": [], "group": group}
+            body = []
+        elif current is not None and (m := _ANSWER.match(line)):
+            current["answers"].append({"text": m["text"],
+                                       "weight": 100 if m["mark"].lower() == "x" else 0})
+        elif current is not None:
+            body.append(line)
+    finish()
+    return groups, questions
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# C S V
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def parse_csv(text: str) -> Parsed:
+    groups: Dict[str, Dict[str, Any]] = {}
+    questions = []
+    for row in csv.DictReader(io.StringIO(text)):
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        answers = [{"text": a.strip()[1:].strip() if a.strip().startswith("*") else a.strip(),
+                    "weight": 100 if a.strip().startswith("*") else 0}
+                   for a in row.get("answers", "").split("|") if a.strip()]
+        group = row.get("group") or None
+        if group:
+            groups.setdefault(group, {"name": group, "pick_count": None, "question_points": None})
+        questions.append({
+            "question_name": row.get("question_name") or f"Question {len(questions) + 1}",
+            "question_text": row.get("question_text", ""),
+            "question_type": _type_name(row["question_type"]) if row.get("question_type")
+            else infer_type(answers),
+            "points_possible": _points(row.get("points_possible")),
+            "answers": answers,
+            "group": group,
+        })
+    return list(groups.values()), questions
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Q T I
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def _strip_ns(root: ET.Element) -> ET.Element:
+    for el in root.iter():
+        if isinstance(el.tag, str) and "}" in el.tag:
+            el.tag = el.tag.split("}", 1)[1]
+    return root
+
+
+def _qti_item(item: ET.Element, group: Optional[str]) -> Dict[str, Any]:
+    meta = {f.findtext("fieldlabel"): f.findtext("fieldentry")
+            for f in item.iter("qtimetadatafield")}
+    correct = {v.text for c in item.iter("respcondition")
+               if any(float(s.text or 0) > 0 for s in c.iter("setvar"))
+               for v in c.iter("varequal")}
+    answers = [{"text": label.findtext(".//mattext") or "",
+                "weight": 100 if label.get("ident") in correct else 0}
+               for label in item.iter("response_label")]
+    qtype = meta.get("question_type") or infer_type(answers)
+    return {
+        "question_name": item.get("title") or "Question",
+        "question_text": item.findtext("presentation/material/mattext") or "",
+        "question_type": qtype,
+        "points_possible": _points(meta.get("points_possible")),
+        "answers": answers,
+        "group": group,
+    }
+
+
+def parse_qti(xml: str) -> Parsed:
+    root = _strip_ns(ET.fromstring(xml))
+    parent = {child: node for node in root.iter() for child in node}
+    groups: Dict[int, Dict[str, Any]] = {}
+    for section in root.iter("section"):
+        selection = section.find("selection_ordering/selection")
+        if selection is not None and selection.findtext("selection_number"):
+            groups[id(section)] = {
+                "name": section.get("title") or section.get("ident"),
+                "pick_count": int(selection.findtext("selection_number")),
+                "question_points": _points(selection.findtext(".//points_per_item")),
+            }
+
+    def group_of(item: ET.Element) -> Optional[str]:
+        node = parent.get(item)
+        while node is not None:
+            if id(node) in groups:
+                return groups[id(node)]["name"]
+            node = parent.get(node)
+        return None
+
+    questions = [_qti_item(item, group_of(item)) for item in root.iter("item")]
+    return list(groups.values()), questions
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# E N T R Y   P O I N T
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+EXTENSIONS = (".md", ".markdown", ".csv", ".xml", ".qti", ".zip")
+
+
+def load_question_bank(path: str) -> Parsed:
+    """
+    Parse a .md, .csv, .xml (QTI) or .zip (QTI export) question bank.  Every
+    assessment in a zip is read, in file name order.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".zip":
+        with zipfile.ZipFile(path) as zf:
+            names = [n for n in zf.namelist()
+                     if n.endswith(".xml") and not n.endswith("imsmanifest.xml")
+                     and "assessment_meta" not in n]
+            if not names:
+                raise ValueError(f"No QTI assessment found in {path}")
+            # A course export holds one assessment file per quiz or bank: import them all.
+            groups, questions = [], []
+            for name in sorted(names):
+                g, q = parse_qti(zf.read(name).decode("utf-8"))
+                groups.extend(g)
+                questions.extend(q)
+            return groups, questions
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if ext in (".md", ".markdown"):
+        return parse_markdown(text)
+    if ext == ".csv":
+        return parse_csv(text)
+    if ext in (".xml", ".qti"):
+        return parse_qti(text)
+    raise ValueError(f"Unsupported question bank format: {ext}")
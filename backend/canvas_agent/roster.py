@@ -0,0 +1,182 @@
+"""
+ROSTER INDEX
+============
+
+One `user_id -> person` index per course, so tools can put names next to
+user ids themselves instead of asking Canvas to embed a `user` object in
+every submission, enrollment or quiz-submission response.
+
+Each person is `{'name', 'sortable_name', 'sis_user_id', 'section_id',
+'section', 'role', 'state'}`.
+
+* Built once from the paginated enrollments listing (every role and state;
+  Canvas embeds the user's names and SIS id in each enrollment) and one
+  sections listing for section names
+* Refreshed incrementally: ids the index has not seen (a late add, a new TA)
+  are fetched together in batched `users?user_ids[]=` calls and merged in;
+  the full listing re-runs at most once per `ROSTER_MAX_AGE`
+* Kept in the disk cache, so a new process starts with the index warm
+
+    roster = roster_for(course_id)
+    people = roster.resolve(s["user_id"] for s in submissions)
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from canvas_agent.canvas_cache import DiskCache
+from canvas_agent.course_sync import ROSTER_MAX_AGE
+from canvas_agent.openai_tools import canvas_map, canvas_paginate
+
+# Ids per batched `users?user_ids[]=` lookup (keeps the query string short).
+LOOKUP_BATCH = 50
+_STATES = ["active", "invited", "completed", "inactive"]
+
+_cache = DiskCache("rosters")
+_rosters: Dict[int, "Roster"] = {}
+_rosters_lock = threading.Lock()
+
+
+def _person(user: Dict[str, Any], enrollment: Dict[str, Any],
+            sections: Dict[int, str]) -> Dict[str, Any]:
+    section_id = enrollment.get("course_section_id")
+    return {
+        "name": user.get("name"),
+        "sortable_name": user.get("sortable_name"),
+        "sis_user_id": user.get("sis_user_id"),
+        "section_id": section_id,
+        "section": sections.get(section_id),
+        "role": enrollment.get("type"),
+        "state": enrollment.get("enrollment_state"),
+    }
+
+
+def course_users(course_id: int, user_ids: List[int],
+                 include: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """
+    The users among `user_ids` enrolled in the course (any role or state), via
+    concurrent `courses/:id/users?user_ids[]=` listings of `LOOKUP_BATCH` ids each.
+    """
+    def lookup(batch: List[int]) -> List[Dict[str, Any]]:
+        return list(canvas_paginate(f"courses/{course_id}/users",
+                                    params={"user_ids[]": batch,
+                                            "include[]": list(include),
+                                            "enrollment_state[]": _STATES}))
+
+    batches = [user_ids[i:i + LOOKUP_BATCH] for i in range(0, len(user_ids), LOOKUP_BATCH)]
+    return [user for users in canvas_map(lookup, batches) for user in users]
+
+
+class Roster:
+    """The roster index of one course.  Safe to share between threads."""
+
+    def __init__(self, course_id: int, people: Dict[int, Dict[str, Any]],
+                 sections: Dict[int, str], built_at: Optional[float] = None):
+        self.course_id = course_id
+        self.people = people
+        self.sections = sections
+        self.built_at = built_at or time.time()
+        self._absent: Set[int] = set()  # looked up, not in the course
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, course_id: int) -> "Roster":
+        """Full listing: every enrollment of the course, one paginated walk."""
+        sections = {s["id"]: s.get("name")
+                    for s in canvas_paginate(f"courses/{course_id}/sections")}
+        people: Dict[int, Dict[str, Any]] = {}
+        for e in canvas_paginate(f"courses/{course_id}/enrollments",
+                                 params={"state[]": _STATES}):
+            current = people.get(e["user_id"])
+            # A user enrolled twice (two sections, student + TA) keeps the active enrollment.
+            if current is None or (current["state"] != "active"
+                                   and e.get("enrollment_state") == "active"):
+                people[e["user_id"]] = _person(e.get("user") or {}, e, sections)
+        return cls(course_id, people, sections)
+
+    def save(self) -> None:
+        with self._lock:
+            value = {"people": {str(k): v for k, v in self.people.items()},
+                     "sections": {str(k): v for k, v in self.sections.items()},
+                     "built_at": self.built_at}
+        _cache.put(str(self.course_id), value)
+
+    @classmethod
+    def load(cls, course_id: int) -> Optional["Roster"]:
+        value = _cache.get(str(course_id))
+        if value is None:
+            return None
+        return cls(course_id, {int(k): v for k, v in value["people"].items()},
+                   {int(k): v for k, v in value["sections"].items()}, value["built_at"])
+
+    @property
+    def stale(self) -> bool:
+        return time.time() - self.built_at > ROSTER_MAX_AGE
+
+    # -- lookups ------------------------------------------------------------
+
+    def get(self, user_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        """The indexed person, without fetching."""
+        return self.people.get(user_id) if user_id is not None else None
+
+    def name(self, user_id: Optional[int]) -> Optional[str]:
+        person = self.get(user_id)
+        return person["name"] if person else None
+
+    def resolve(self, user_ids: Iterable[Optional[int]]) -> Dict[int, Dict[str, Any]]:
+        """
+        The people behind `user_ids`; ids the index has not seen are looked up
+        in batches and added to it.
+        """
+        wanted = {u for u in user_ids if u is not None}
+        with self._lock:
+            unknown = sorted(wanted - self.people.keys() - self._absent)
+        if unknown:
+            self._add(unknown)
+        return {u: self.people[u] for u in wanted if u in self.people}
+
+    def _add(self, user_ids: List[int]) -> None:
+        found = {}
+        for user in course_users(self.course_id, user_ids, include=["enrollments"]):
+            enrollments = [e for e in user.get("enrollments") or []
+                           if e.get("course_id") in (None, self.course_id)]
+            enrollment = next((e for e in enrollments if e.get("enrollment_state") == "active"),
+                              enrollments[0] if enrollments else {})
+            found[user["id"]] = _person(user, enrollment, self.sections)
+        with self._lock:
+            self.people.update(found)
+            self._absent.update(set(user_ids) - found.keys())
+        if found:
+            self.save()
+
+
+def roster_for(course_id: int, refresh: bool = False) -> Roster:
+    """The course's roster index: in memory, else from the disk cache, else built."""
+    with _rosters_lock:
+        roster = None if refresh else _rosters.get(course_id)
+    if roster is None or roster.stale:
+        roster = None if refresh else Roster.load(course_id)
+        if roster is None or roster.stale:
+            roster = Roster.build(course_id)
+            roster.save()
+        with _rosters_lock:
+            _rosters[course_id] = roster
+    return roster
+
+
+def invalidate_roster(course_id: int) -> None:
+    """Forget the course's index (memory and disk) so the next use rebuilds it."""
+    with _rosters_lock:
+        _rosters.pop(course_id, None)
+    _cache.delete(str(course_id))
+
+
+def with_names(course_id: int, rows: List[Dict[str, Any]], key: str = "user_id",
+               field: str = "user_name") -> List[Dict[str, Any]]:
+    """Set `row[field]` to the roster name of `row[key]` on every row (in place)."""
+    people = roster_for(course_id).resolve(r.get(key) for r in rows)
+    for row in rows:
+        person = people.get(row.get(key))
+        row[field] = person["name"] if person else None
+    return rows
@@ -0,0 +1,349 @@
+"""
+TOOL SCHEMA CACHE
+=================
+
+`@function_tool()` turns each tool's signature and docstring into a JSON
+schema when its module is imported: the docstring is parsed, a Pydantic model
+is built for the parameters and its JSON schema generated and made strict.
+For ~70 tools (several taking large models such as `AssignmentCreate`,
+`QuizCreate` or `QuizQuestionCreate`) that is a noticeable part of every
+start-up, and the result only changes when the code does.
+
+This module's `function_tool` is a drop-in replacement (re-exported by
+`canvas_agent.openai_tools`) that stores each tool's name, description and
+parameter schema in the disk cache (`DiskCache("tool_schemas")`), keyed by a
+fingerprint of:
+
+* the source file of the tool's module, and of every other project module
+  defining a type used in its annotations (e.g. a shared Pydantic model)
+* the tool's default values (some come from the environment, like
+  `DEFAULT_COURSE_ID`) and those of the models it takes
+* the decorator options and the `openai-agents` / `pydantic` versions
+
+On a hit the tool is built straight from the stored schema.  The Pydantic
+model is only needed to validate arguments, so the SDK's own tool is created
+on the first call and every invocation is delegated to it; tools the model
+never calls never pay for it.  Any change to the inputs above is a miss, which
+falls back to the SDK decorator and stores the new schema.  The schema sent
+to the model is byte-for-byte the one the SDK would generate.
+
+    python -m canvas_agent.tool_schemas build           # precompile every tool
+    python -m canvas_agent.tool_schemas build --clear   # ... dropping stale entries
+    python -m canvas_agent.tool_schemas bench           # cold vs cached import time
+
+Set `CANVAS_TOOL_SCHEMA_CACHE=0` to always generate schemas.
+"""
+
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import re
+import statistics
+import subprocess
+import sys
+import sysconfig
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import agents
+import pydantic
+from agents import FunctionTool
+from agents import function_tool as sdk_function_tool
+from pydantic import BaseModel
+
+from canvas_agent.canvas_cache import DiskCache
+
+CACHE_ENABLED = os.getenv("CANVAS_TOOL_SCHEMA_CACHE", "1") not in ("0", "false", "no")
+
+# Decorator options that only shape the schema (or are handled by the SDK tool
+# invocations are delegated to); any other option is passed through uncached.
+_SCHEMA_OPTIONS = {"name_override", "description_override", "docstring_style",
+                   "use_docstring_info", "strict_mode"}
+_DELEGATED_OPTIONS = {"failure_error_function"}
+
+# Tool modules precompiled by `build` and imported by `bench`.
+TOOL_PACKAGES = ("canvas_agent.canvas",)
+
+_cache = DiskCache("tool_schemas")
+_versions = f"{getattr(agents, '__version__', '?')}|{pydantic.VERSION}"
+_file_digests: Dict[str, str] = {}
+_library_dirs = tuple({sysconfig.get_paths()[k] for k in ("stdlib", "platstdlib",
+                                                          "purelib", "platlib")})
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+STATS = {"hits": 0, "misses": 0, "uncached": 0, "resolved": 0}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# F I N G E R P R I N T
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def _file_digest(path: str) -> str:
+    digest = _file_digests.get(path)
+    if digest is None:
+        try:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            digest = "-"
+        _file_digests[path] = digest
+    return digest
+
+
+def _project_file(obj: Any) -> Optional[str]:
+    """Source file of the module defining `obj`, unless it is a library."""
+    path = getattr(sys.modules.get(getattr(obj, "__module__", None) or ""), "__file__", None)
+    if not path or path.startswith(_library_dirs):
+        return None
+    return path
+
+
+def _walk_annotation(annotation: Any, namespace: Dict[str, Any], files: Set[str],
+                     extra: List[str], seen: Set[int]) -> None:
+    """Collect the project files and model defaults an annotation depends on."""
+    if isinstance(annotation, str):
+        # `from __future__ import annotations`: look the names up instead of
+        # evaluating the string.
+        for name in _IDENTIFIER.findall(annotation):
+            if name in namespace:
+                _walk_annotation(namespace[name], namespace, files, extra, seen)
+        return
+    if id(annotation) in seen:
+        return
+    seen.add(id(annotation))
+    path = _project_file(annotation)
+    if path:
+        files.add(path)
+    for arg in getattr(annotation, "__args__", None) or ():
+        _walk_annotation(arg, namespace, files, extra, seen)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        model_namespace = vars(sys.modules.get(annotation.__module__, sys))
+        for name, field in annotation.model_fields.items():
+            extra.append(f"{annotation.__qualname__}.{name}={field.default!r}")
+            _walk_annotation(field.annotation, model_namespace, files, extra, seen)
+
+
+def fingerprint(func: Callable[..., Any], options: Dict[str, Any]) -> str:
+    """
+    Hash of everything a tool's schema is generated from.
+
+    Args:
+        func: The tool function.
+        options: Schema-shaping decorator options.
+
+    Returns:
+        str: Hex digest, stable across processes while the inputs are unchanged.
+    """
+    files: Set[str] = set()
+    extra: List[str] = [repr(func.__defaults__), repr(func.__kwdefaults__),
+                        repr(sorted(options.items()))]
+    own = inspect.getsourcefile(func) if hasattr(func, "__code__") else None
+    if own:
+        files.add(own)
+    seen: Set[int] = set()
+    for annotation in getattr(func, "__annotations__", {}).values():
+        _walk_annotation(annotation, getattr(func, "__globals__", {}), files, extra, seen)
+    h = hashlib.sha256(_versions.encode())
+    for path in sorted(files):
+        h.update(f"\0{path}\0{_file_digest(path)}".encode())
+    for item in extra:
+        h.update(f"\0{item}".encode())
+    return h.hexdigest()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# D E C O R A T O R
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def _lazy_tool(func: Callable[..., Any], options: Dict[str, Any],
+               entry: Dict[str, Any]) -> FunctionTool:
+    """A tool built from a stored schema; the SDK tool is created on first call."""
+    real: List[FunctionTool] = []
+    lock = threading.Lock()
+
+    def resolve() -> FunctionTool:
+        if not real:
+            with lock:
+                if not real:
+                    real.append(sdk_function_tool(func, **options))
+                    STATS["resolved"] += 1
+        return real[0]
+
+    async def on_invoke_tool(ctx: Any, input: str) -> Any:
+        return await resolve().on_invoke_tool(ctx, input)
+
+    return FunctionTool(
+        name=entry["name"],
+        description=entry["description"],
+        params_json_schema=entry["params_json_schema"],
+        on_invoke_tool=on_invoke_tool,
+        strict_json_schema=entry["strict_json_schema"],
+    )
+
+
+def _cached_tool(func: Callable[..., Any], options: Dict[str, Any]) -> FunctionTool:
+    if not CACHE_ENABLED or not set(options) <= _SCHEMA_OPTIONS | _DELEGATED_OPTIONS:
+        STATS["uncached"] += 1
+        return sdk_function_tool(func, **options)
+    schema_options = {k: v for k, v in options.items() if k in _SCHEMA_OPTIONS}
+    key = f"{func.__module__}.{func.__qualname__}:{fingerprint(func, schema_options)}"
+    entry = _cache.get(key)
+    if entry is not None:
+        STATS["hits"] += 1
+        return _lazy_tool(func, options, entry)
+
+    STATS["misses"] += 1
+    tool = sdk_function_tool(func, **options)
+    try:
+        _cache.put(key, {
+            "name": tool.name,
+            "description": tool.description,
+            "params_json_schema": tool.params_json_schema,
+            "strict_json_schema": tool.strict_json_schema,
+        }, permanent=True)
+    except OSError:
+        pass  # read-only checkout: keep working uncached
+    return tool
+
+
+def function_tool(func: Optional[Callable[..., Any]] = None, **options: Any) -> Any:
+    """
+    `agents.function_tool` with the generated schema cached on disk.
+
+    Use it exactly like the SDK decorator, with or without parentheses.
+
+    Args:
+        func: The tool function (when used as `@function_tool`).
+        **options: Options of `agents.function_tool` (`name_override`,
+            `description_override`, `failure_error_function`...).
+
+    Returns:
+        FunctionTool, or a decorator producing one.
+    """
+    if func is not None:
+        return _cached_tool(func, options)
+    return lambda f: _cached_tool(f, options)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# B U I L D   /   B E N C H M A R K
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def tool_modules() -> List[str]:
+    """Names of the modules defining the agent's tools (test scripts excluded)."""
+    names = []
+    for package_name in TOOL_PACKAGES:
+        package = importlib.import_module(package_name)
+        names += [f"{package_name}.{m.name}" for m in pkgutil.iter_modules(package.__path__)
+                  if not m.name.endswith("_testing")]
+    return names
+
+
+def build(clear: bool = False) -> Dict[str, Any]:
+    """
+    Import every tool module so each tool's schema is generated and stored.
+
+    Args:
+        clear: Drop all stored schemas first (removes entries of old code).
+
+    Returns:
+        Dict[str, Any]: {'modules', 'failed': {module: error}, 'hits', 'misses', 'seconds'}
+    """
+    if clear:
+        _cache.clear()
+    started = time.time()
+    modules = tool_modules()
+    failed = {}
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as exc:  # one broken module must not stop the build
+            failed[name] = f"{type(exc).__name__}: {exc}"
+    return {"modules": len(modules) - len(failed), "failed": failed,
+            "hits": STATS["hits"], "misses": STATS["misses"],
+            "seconds": round(time.time() - started, 3)}
+
+
+_BENCH_SCRIPT = """
+import importlib, json, time
+import numpy, pandas  # third-party start-up is the same with or without the cache
+from canvas_agent import openai_tools, tool_schemas
+started = time.perf_counter()
+for name in tool_schemas.tool_modules():
+    try:
+        importlib.import_module(name)
+    except Exception:
+        pass
+print(json.dumps({"seconds": time.perf_counter() - started, **tool_schemas.STATS}))
+"""
+
+
+def _timed_import(cached: bool) -> Dict[str, Any]:
+    env = {**os.environ, "CANVAS_TOOL_SCHEMA_CACHE": "1" if cached else "0"}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    out = subprocess.run([sys.executable, "-c", _BENCH_SCRIPT], env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def benchmark(runs: int = 5) -> Dict[str, Any]:
+    """
+    Time importing the tool modules in fresh processes, with and without the cache.
+
+    Third-party packages are imported before the clock starts, so the numbers
+    cover the tool modules themselves.  The cache is filled first and the two
+    variants alternate, so the cached runs measure warm starts under the same
+    machine load.
+
+    Args:
+        runs: Processes per variant; the median is reported.
+
+    Returns:
+        Dict[str, Any]: {'runs', 'uncached_s', 'cached_s', 'saved_s', 'speedup', 'tools'}
+    """
+    _timed_import(cached=True)
+    uncached, cached = [], []
+    for _ in range(runs):
+        uncached.append(_timed_import(cached=False))
+        cached.append(_timed_import(cached=True))
+    cold = statistics.median(r["seconds"] for r in uncached)
+    warm = statistics.median(r["seconds"] for r in cached)
+    return {"runs": runs, "uncached_s": round(cold, 3), "cached_s": round(warm, 3),
+            "saved_s": round(cold - warm, 3), "speedup": round(cold / warm, 2),
+            "tools": cached[-1]["hits"] + cached[-1]["misses"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompile or benchmark the tool schema cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_parser = sub.add_parser("build", help="Generate and store every tool's schema.")
+    build_parser.add_argument("--clear", action="store_true", help="Drop stored schemas first.")
+    bench_parser = sub.add_parser("bench", help="Compare import time with and without the cache.")
+    bench_parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        result = build(clear=args.clear)
+        print(f"Compiled {result['misses']} tool schemas ({result['hits']} already cached) "
+              f"from {result['modules']} modules in {result['seconds']}s")
+        for name, error in result["failed"].items():
+            print(f"  skipped {name}: {error}")
+    else:
+        result = benchmark(args.runs)
+        print(f"Importing {result['tools']} tools, median of {result['runs']} processes: "
+              f"{result['uncached_s']}s uncached, {result['cached_s']}s cached "
+              f"({result['saved_s']}s saved, {result['speedup']}x)")
+
+
+if __name__ == "__main__":
+    # Run the imported module's copy so `build` sees the STATS the tools update.
+    from canvas_agent.tool_schemas import main as _main
+    _main()
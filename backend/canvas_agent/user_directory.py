@@ -0,0 +1,129 @@
+"""
+USER DIRECTORY
+==============
+
+Resolves Canvas user ids to people (name, sortable name, SIS/login id) with
+as few requests as possible:
+
+1. An in-process LRU cache (`USER_CACHE_SIZE` entries)
+2. Misses, when a course is given: the roster's batched
+   `courses/:id/users?user_ids[]=` listings (`roster.LOOKUP_BATCH` ids per
+   request); skipped if the course is not visible to this token
+3. Whatever is still missing: concurrent `users/:id` requests
+
+Resolving 50 ids of one course is a single request cold and none warm.
+
+    people = get_directory().lookup([101, 102, 103], course_id=123)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from canvas_agent.openai_tools import canvas_map, canvas_request
+from canvas_agent.roster import course_users
+
+USER_CACHE_SIZE = int(os.getenv("CANVAS_USER_CACHE_SIZE", "5000"))
+
+_FIELDS = ("id", "name", "sortable_name", "short_name", "sis_user_id", "login_id", "email")
+
+
+def _slim(user: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: user.get(k) for k in _FIELDS if user.get(k) is not None}
+
+
+class UserDirectory:
+    """Thread-safe user lookups with an LRU cache in front of Canvas."""
+
+    def __init__(self, capacity: int = USER_CACHE_SIZE):
+        self.capacity = capacity
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # -- cache --------------------------------------------------------------
+
+    def _get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            user = self._cache.get(user_id)
+            if user is not None:
+                self._cache.move_to_end(user_id)
+            return user
+
+    def _put(self, users: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            for user in users:
+                self._cache[user["id"]] = user
+                self._cache.move_to_end(user["id"])
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+
+    def forget(self, user_id: int) -> None:
+        with self._lock:
+            self._cache.pop(user_id, None)
+
+    # -- Canvas -------------------------------------------------------------
+
+    def _from_course(self, course_id: int, user_ids: List[int]) -> List[Dict[str, Any]]:
+        try:
+            return [_slim(u) for u in course_users(course_id, user_ids, include=["email"])]
+        except RuntimeError:
+            return []  # course missing or not visible: the per-user requests still run
+
+    def _one(self, user_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            return _slim(canvas_request("GET", f"users/{user_id}").json())
+        except RuntimeError as exc:
+            if "error 404" in str(exc) or "error 401" in str(exc):
+                return None  # no such user, or not visible to this token
+            raise
+
+    # -- lookups ------------------------------------------------------------
+
+    def lookup(self, user_ids: Iterable[int],
+               course_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        The users behind `user_ids` that exist (ids Canvas does not know are left out).
+
+        Args:
+            user_ids: Canvas user ids, in any order, duplicates allowed.
+            course_id: A course the users are likely enrolled in (enables batching).
+        """
+        ids = list(dict.fromkeys(int(u) for u in user_ids))
+        found: Dict[int, Dict[str, Any]] = {}
+        for uid in ids:
+            user = self._get(uid)
+            if user is not None:
+                found[uid] = user
+        missing = [u for u in ids if u not in found]
+        self.hits += len(found)
+        self.misses += len(missing)
+
+        if missing and course_id is not None:
+            users = self._from_course(course_id, missing)
+            self._put(users)
+            found.update({u["id"]: u for u in users})
+            missing = [u for u in missing if u not in found]
+        if missing:
+            users = [u for u in canvas_map(self._one, missing) if u is not None]
+            self._put(users)
+            found.update({u["id"]: u for u in users})
+        return {uid: found[uid] for uid in ids if uid in found}
+
+    def get(self, user_id: int, course_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        return self.lookup([user_id], course_id).get(user_id)
+
+
+_directory: Optional[UserDirectory] = None
+_directory_lock = threading.Lock()
+
+
+def get_directory() -> UserDirectory:
+    """The process-wide directory."""
+    global _directory
+    with _directory_lock:
+        if _directory is None:
+            _directory = UserDirectory()
+        return _directory
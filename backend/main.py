@@ -1,3 +1,4 @@
+import json
 import uuid
 from canvasapi import Canvas
 import os
@@ -7,17 +8,41 @@ from discord_agent.discord_openai import create_discord_server, list_discord_cha
 import canvas_agent.openai_tools as canvas_tools
 from agents import Agent, Runner
 from canvas_agent.openai_tools import *
-from canvas_agent.canvas.canvas_courses import get_all_courses, get_course
+from canvas_agent.live_events import (
+    MAX_BODY_BYTES,
+    LiveEventQueueFull,
+    authorized,
+    configured,
+    get_event_queue,
+    parse_payload,
+)
+from canvas_agent.canvas.canvas_courses import get_all_courses, get_course, upload_file
+from canvas_agent.canvas.canvas_files import sync_course_files
+from canvas_agent.canvas.canvas_modules import get_module_tree, update_module, create_module_item
+from canvas_agent.canvas.canvas_pages import get_course_pages
+from canvas_agent.canvas.canvas_users import get_user, get_users
+from canvas_agent.canvas.canvas_accounts import get_account, list_account_users, scan_account_grades
+from canvas_agent.canvas.canvas_groups import list_groups_in_context, get_group, create_group, \
+    list_group_users, add_user_to_group, add_users_to_group, get_group_activity_stream
 from canvas_agent.canvas.canvas_assignments import create_assignment, get_assignments, edit_assignment, delete_assignment
-from canvas_agent.canvas.canvas_gradebook_history import get_student_grades
+from canvas_agent.canvas.canvas_quiz_statistic import get_quiz_statistics
+from canvas_agent.canvas.canvas_analytics import get_department_grades, compare_department_grades, \
+    get_course_participation, get_course_assignment_analytics, get_student_engagement, get_course_pulse, \
+    get_at_risk_students
+from canvas_agent.canvas.canvas_gradebook_history import get_student_grades, get_grade_history_for_course, list_grading_days, get_grading_day, get_grading_day_submissions, \
+    get_grade_timeline, get_grade_as_of, get_top_graders, get_grading_activity, get_regrades
 from canvas_agent.canvas.canvas_submissions import get_submissions
-from canvas_agent.canvas.canvas_quizzes import create_quiz, list_quizzes, get_quiz, edit_quiz, delete_quiz, reorder_quiz_items, validate_quiz_access_code
-from canvas_agent.canvas.canvas_quiz_submissions import list_quiz_submissions, get_quiz_submission, start_quiz_submission, update_quiz_submission, complete_quiz_submission, quiz_submission_time
-from canvas_agent.canvas.canvas_quiz_questions import list_quiz_questions, get_quiz_question, create_quiz_question, update_quiz_question, delete_quiz_question
+from canvas_agent.canvas.canvas_quizzes import create_quiz, list_quizzes, get_quiz, edit_quiz, delete_quiz, reorder_quiz_items, validate_quiz_access_code, clone_quiz
+from canvas_agent.canvas.canvas_quiz_submissions import list_quiz_submissions, get_quiz_submission, start_quiz_submission, update_quiz_submission, complete_quiz_submission, quiz_submission_time, \
+    export_quiz_submissions
+from canvas_agent.canvas.canvas_quiz_questions import list_quiz_questions, get_quiz_question, create_quiz_question, update_quiz_question, delete_quiz_question, \
+    import_quiz_questions
+from canvas_agent.canvas.canvas_gradebook_analytics import grade_distribution, assignment_statistics, student_zscores, assignment_correlations, \
+    missing_work_report
 import inspect
 from ai_check_agent.ai_checking import check_ai
 from slack_agent.slack_agent import monitor_slack_channel, send_slack_message, read_slack_messages, list_slack_channels
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 # Load environment variables from .env file
@@ -51,15 +76,30 @@ async def create_chat():
 @app.post("/chat/create")
 async def create_chat():
     print("Creating chat session...")
-    canvas_tools = [get_all_courses, get_course, create_assignment,
+    canvas_tools = [get_all_courses, get_course, upload_file, sync_course_files,
+                    get_module_tree, update_module, create_module_item, get_course_pages,
+                    get_user, get_users, get_account, list_account_users, scan_account_grades,
+                    list_groups_in_context, get_group, create_group, list_group_users,
+                    add_user_to_group, add_users_to_group, get_group_activity_stream,
+                    create_assignment,
                     get_student_grades, get_assignments, edit_assignment,
                     delete_assignment, get_submissions, create_quiz,
                     list_quizzes, get_quiz, edit_quiz,
-                    delete_quiz, reorder_quiz_items, validate_quiz_access_code,
+                    delete_quiz, reorder_quiz_items, validate_quiz_access_code, clone_quiz,
                     list_quiz_submissions, get_quiz_submission, start_quiz_submission,
                     update_quiz_submission, complete_quiz_submission, quiz_submission_time,
+                    export_quiz_submissions,
                     list_quiz_questions, get_quiz_question, create_quiz_question,
-                    update_quiz_question, delete_quiz_question]
+                    update_quiz_question, delete_quiz_question, import_quiz_questions,
+                    get_quiz_statistics,
+                    grade_distribution, assignment_statistics, student_zscores,
+                    assignment_correlations, missing_work_report,
+                    get_grade_history_for_course, list_grading_days, get_grading_day,
+                    get_grading_day_submissions, get_grade_timeline, get_grade_as_of,
+                    get_top_graders, get_grading_activity, get_regrades,
+                    get_department_grades, compare_department_grades,
+                    get_course_participation, get_course_assignment_analytics,
+                    get_student_engagement, get_course_pulse, get_at_risk_students]
     discord_tools = [
         list_discord_channels,
         read_discord_messages,
@@ -78,7 +118,7 @@ async def create_chat():
     # Create a new master agent
     master_agent = Agent(name="Master",
                          instructions=make_instructions(
-                             11883051, 1365757418998464593, 1365757421938544721, "cse"),
+                             DEFAULT_COURSE_ID, 1365757418998464593, 1365757421938544721, "cse"),
                          model="o4-mini",
                          tools=all_tools)
 
@@ -127,6 +167,36 @@ async def delete_chat(chat_id: str):
     return {"status": "success"}
 
 
+@app.post("/live_events", status_code=202)
+async def receive_live_events(request: Request):
+    # Canvas Live Events (HTTP delivery or an SQS forwarder); applied in batches.
+    if not configured():
+        raise HTTPException(status_code=503, detail="Live events are not configured")
+    if not authorized(request.headers.get("authorization")):
+        raise HTTPException(status_code=401, detail="Invalid live events token")
+    if int(request.headers.get("content-length") or 0) > MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="Body too large")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BODY_BYTES:
+            raise HTTPException(status_code=413, detail="Body too large")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be JSON")
+    try:
+        return {"accepted": get_event_queue().put(parse_payload(payload))}
+    except LiveEventQueueFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"})
+
+
+@app.get("/live_events/status")
+async def live_events_status():
+    queue = get_event_queue()
+    return {"pending": queue.pending(), **queue.stats}
+
+
 def make_instructions(course_id: int, discord_server_id: int, discord_channel_id: int, slack_name: str):
     return f"You are an assistant designed to help and assist the user, primarily to help interface and collect insights from different services and APIs. To this end, you have been given some tools pertaining to the Canvas LMS, Discord, and Slack. The Canvas tools allow you to do a multitude of operations that you can do in the actual canvas, and you may interact with the Canvas API given the tools. Based on what you learn from querying the Canvas API, you will give the user information or complete their request in the best fashion that you can. The same goes for the Discord and Slack tools, which will mainly be used to retrieve messages, analyze, and report back to the user in addition to their other capabilities. Your primary course right now is course ID {course_id}. This  means that when unclear or in most cases, you are to respond about this course (unless explicitly asked to provide other information about other courses or data). Based on the user’s query, you may use any combination of the provided tools in any order to complete the task to the maximum possible level. The Discord server ID is {discord_server_id}, and the Discord channel ID is {discord_channel_id}. The Slack is called {slack_name}. You also have a small AI check tool to be used only when specifically asked for."
 
@@ -136,15 +206,30 @@ def main():
         print("Error: CANVAS_API_URL and CANVAS_API_TOKEN must be set in .env file")
         sys.exit(1)
 
-    canvas_tools = [get_all_courses, get_course, create_assignment,
+    canvas_tools = [get_all_courses, get_course, upload_file, sync_course_files,
+                    get_module_tree, update_module, create_module_item, get_course_pages,
+                    get_user, get_users, get_account, list_account_users, scan_account_grades,
+                    list_groups_in_context, get_group, create_group, list_group_users,
+                    add_user_to_group, add_users_to_group, get_group_activity_stream,
+                    create_assignment,
                     get_student_grades, get_assignments, edit_assignment,
                     delete_assignment, get_submissions, create_quiz,
                     list_quizzes, get_quiz, edit_quiz,
-                    delete_quiz, reorder_quiz_items, validate_quiz_access_code,
+                    delete_quiz, reorder_quiz_items, validate_quiz_access_code, clone_quiz,
                     list_quiz_submissions, get_quiz_submission, start_quiz_submission,
                     update_quiz_submission, complete_quiz_submission, quiz_submission_time,
+                    export_quiz_submissions,
                     list_quiz_questions, get_quiz_question, create_quiz_question,
-                    update_quiz_question, delete_quiz_question]
+                    update_quiz_question, delete_quiz_question, import_quiz_questions,
+                    get_quiz_statistics,
+                    grade_distribution, assignment_statistics, student_zscores,
+                    assignment_correlations, missing_work_report,
+                    get_grade_history_for_course, list_grading_days, get_grading_day,
+                    get_grading_day_submissions, get_grade_timeline, get_grade_as_of,
+                    get_top_graders, get_grading_activity, get_regrades,
+                    get_department_grades, compare_department_grades,
+                    get_course_participation, get_course_assignment_analytics,
+                    get_student_engagement, get_course_pulse, get_at_risk_students]
     discord_tools = [
         list_discord_channels,
         read_discord_messages,
@@ -174,7 +259,7 @@ def main():
 
     master_agent = Agent(name="Master",
                          instructions=make_instructions(
-                             11883051, 1365757418998464593, 1365757421938544721, "cse"),
+                             DEFAULT_COURSE_ID, 1365757418998464593, 1365757421938544721, "cse"),
                          model="o4-mini",
                          tools=all_tools)
 
@@ -0,0 +1,81 @@
+"""
+Shared fixtures: one fake Canvas server (`canvas_agent.fake_canvas`) per test
+session, reached through the real client code in `canvas_agent.openai_tools`.
+
+The environment is set here, before any `canvas_agent` module is imported,
+because the client reads its base URL and directories at import time.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+
+# `backend/` holds the packages; make them importable when pytest runs from the repo root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+PORT = _free_port()
+_TMP = tempfile.mkdtemp(prefix="canvas-agent-tests-")
+os.environ.update({
+    "CANVAS_API_URL": f"http://127.0.0.1:{PORT}",
+    "CANVAS_API_TOKEN": "test-token",
+    "CANVAS_CACHE_DIR": os.path.join(_TMP, "cache"),
+    "CANVAS_MIRROR_PATH": os.path.join(_TMP, "mirror.db"),
+    "CANVAS_FILES_DIR": os.path.join(_TMP, "files"),
+})
+
+import pytest  # noqa: E402
+
+from canvas_agent.fake_canvas import FakeCanvasConfig, serve_in_background  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def fake_canvas():
+    """The running fake server (uvicorn `Server`); throttling off so tests are quick."""
+    server = serve_in_background(FakeCanvasConfig(rate_limit=False), port=PORT)
+    yield server
+    server.should_exit = True
+
+
+@pytest.fixture
+def course(fake_canvas):
+    """The server's `FakeCourse`: the ground truth the tools are checked against."""
+    return fake_canvas.config.app.state.data
+
+
+@pytest.fixture
+def course_id(fake_canvas) -> int:
+    return fake_canvas.config.app.state.config.course_id
+
+
+@pytest.fixture
+def call_tool():
+    """Invoke a `function_tool` the way the agent runner does and return its result."""
+    from agents.tool_context import ToolContext
+
+    def call(tool, **kwargs):
+        arguments = json.dumps(kwargs)
+        ctx = ToolContext(context=None, tool_name=tool.name, tool_call_id="test",
+                          tool_arguments=arguments)
+        return asyncio.run(tool.on_invoke_tool(ctx, arguments))
+
+    return call
+
+
+@pytest.fixture
+def mirror(course_id):
+    """The configured course mirror, freshly built from the fake course."""
+    from canvas_agent.course_mirror import get_mirror
+
+    mirror = get_mirror()
+    mirror.build(course_id)
+    return mirror
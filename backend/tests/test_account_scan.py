@@ -0,0 +1,52 @@
+"""Account-wide course grade scan."""
+
+import statistics
+
+from canvas_agent.canvas import canvas_accounts
+from canvas_agent.canvas.canvas_accounts import scan_account_grades
+
+
+def _synthetic_course(course_id, scores):
+    enrollments = [{"id": course_id * 10 + k, "user_id": course_id * 10 + k,
+                    "course_id": course_id, "type": "StudentEnrollment",
+                    "enrollment_state": "active", "grades": {"current_score": s}}
+                   for k, s in enumerate(scores)]
+    course = {"id": course_id, "name": f"Course {course_id}", "course_code": str(course_id),
+              "account_id": 1, "enrollment_term_id": 1, "workflow_state": "available",
+              "total_students": len(scores)}
+    return course, enrollments
+
+
+def test_scan_ranks_courses_and_weights_the_account_mean(fake_canvas, course, course_id,
+                                                         call_tool, monkeypatch):
+    account_id = fake_canvas.config.app.state.config.account_id
+    monkeypatch.setitem(course.other_courses, 90001, _synthetic_course(90001, [50, 60, None]))
+    monkeypatch.setitem(course.other_courses, 90002, _synthetic_course(90002, [95, 85]))
+    main_scores = [e["grades"]["current_score"] for e in course.enrollments
+                   if e["type"] == "StudentEnrollment" and e["enrollment_state"] == "active"
+                   and e["grades"]["current_score"] is not None]
+
+    result = call_tool(scan_account_grades, account_id=account_id, sort_by="mean")
+    ranked = [c["course_id"] for c in result["courses"]]
+    assert ranked[0] == 90002 and ranked[-1] == 90001 and course_id in ranked
+    low = result["courses"][-1]
+    assert (low["students"], low["graded"], low["mean"], low["pct_below"]) == (3, 2, 55.0, 100.0)
+    every = main_scores + [50, 60, 95, 85]
+    assert result["graded"] == len(every)
+    assert abs(result["account_mean"] - statistics.fmean(every)) < 0.05
+
+
+def test_failed_course_is_reported(fake_canvas, course, call_tool, monkeypatch):
+    account_id = fake_canvas.config.app.state.config.account_id
+    stats = canvas_accounts.course_grade_stats
+
+    def flaky(c, threshold=70.0):
+        if c["id"] == 90003:
+            raise RuntimeError("Canvas API error 500: enrollments")
+        return stats(c, threshold)
+
+    monkeypatch.setitem(course.other_courses, 90003, _synthetic_course(90003, [70]))
+    monkeypatch.setattr(canvas_accounts, "course_grade_stats", flaky)
+    result = call_tool(scan_account_grades, account_id=account_id)
+    assert [f["course_id"] for f in result["failed"]] == [90003]
+    assert 90003 not in [c["course_id"] for c in result["courses"]]
@@ -0,0 +1,41 @@
+"""Incremental at-risk scoring against the fake course."""
+
+from datetime import timedelta
+
+import pytest
+
+from canvas_agent import at_risk
+from canvas_agent.at_risk import score_course
+from canvas_agent.canvas.canvas_analytics import get_at_risk_students
+from canvas_agent.fake_canvas import _iso
+
+
+@pytest.fixture
+def from_canvas(monkeypatch):
+    """Score from the API rather than the mirror other tests may have built."""
+    monkeypatch.setattr(at_risk, "fresh_mirror", lambda course_id, resource: None)
+
+
+def test_rescoring_touches_only_changed_students(from_canvas, course, course_id, monkeypatch):
+    first = score_course(course_id, full=True).last_run
+    assert first["full"] and first["recomputed"] == first["students"]
+
+    again = score_course(course_id, refresh=True).last_run
+    assert not again["full"] and again["recomputed"] == 0
+
+    sub = next(s for s in course.submissions.values()
+               if s["submitted_at"] and not s["late"] and not s["excused"]
+               and course.assignments[s["assignment_id"]]["due_at"])
+    monkeypatch.setitem(sub, "late", True)
+    monkeypatch.setitem(sub, "submitted_at", _iso(course.now + timedelta(days=1)))
+    changed = score_course(course_id, refresh=True).last_run
+    assert changed["recomputed"] == 1 and changed["fetched_submissions"] < 10
+
+
+def test_stored_list_is_served_within_max_age(from_canvas, course_id, call_tool):
+    score_course(course_id, refresh=True)
+    result = call_tool(get_at_risk_students, course_id=course_id, min_level="low", limit=500)
+    assert result["run"] is None
+    assert sum(result["levels"].values()) == len(result["students"])
+    risks = [s["risk"] for s in result["students"]]
+    assert risks == sorted(risks, reverse=True)
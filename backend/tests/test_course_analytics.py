@@ -0,0 +1,25 @@
+"""Course analytics tables: sorting and the advertised sort columns."""
+
+from canvas_agent.canvas.canvas_analytics import (
+    get_course_assignment_analytics,
+    get_student_engagement,
+)
+
+
+def test_assignment_analytics_sorted_by_column(course_id, call_tool):
+    rows = call_tool(get_course_assignment_analytics, course_id=course_id, sort_by="late_rate")
+    rates = [r["late_rate"] for r in rows]
+    assert rates == sorted(rates, reverse=True)
+
+
+def test_engagement_sorted_by_column(course_id, call_tool):
+    result = call_tool(get_student_engagement, course_id=course_id, sort_by="missing",
+                       descending=True, limit=100)
+    missing = [r["missing"] for r in result["students"]]
+    assert missing == sorted(missing, reverse=True)
+
+
+def test_sort_columns_are_in_the_schema():
+    for tool, column in ((get_course_assignment_analytics, "median"),
+                         (get_student_engagement, "current_score")):
+        assert column in tool.params_json_schema["properties"]["sort_by"]["enum"]
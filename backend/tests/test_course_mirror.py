@@ -0,0 +1,41 @@
+"""Building, reading and inspecting the local course mirror."""
+
+import sys
+
+from canvas_agent import course_mirror
+from canvas_agent.live_events import apply_events
+
+
+def test_build_mirrors_the_whole_course(mirror, course, course_id):
+    counts = mirror.build(course_id)
+    assert counts["assignments"] == len(course.assignments)
+    assert counts["submissions"] == len(course.submissions)
+    assert counts["enrollments"] == len(course.enrollments)
+    students = {e["user_id"] for e in course.enrollments
+                if e["type"] == "StudentEnrollment" and e["enrollment_state"] == "active"}
+    assert {e["user_id"] for e in mirror.enrollments(course_id)} == students
+    assert all(mirror.is_fresh(course_id, resource) for resource in ("assignments", "submissions"))
+
+
+def test_enrollment_event_keeps_other_enrollments(mirror, course_id):
+    # Enrollments are keyed by enrollment id: a TA enrollment for a student adds a row.
+    student = mirror.enrollments(course_id)[0]
+    event = {"metadata": {"event_name": "enrollment_created", "context_type": "Course",
+                          "context_id": str(course_id), "event_time": "2026-10-19T10:00:00Z"},
+             "body": {"enrollment_id": "880001", "user_id": str(student["user_id"]),
+                      "course_id": str(course_id), "user_name": student["user"]["name"],
+                      "type": "TaEnrollment", "workflow_state": "active"}}
+    result = apply_events([event])
+    assert result["mirror_rows"] == 1
+    assert any(e["id"] == student["id"] for e in mirror.enrollments(course_id))
+    assert mirror.enrollments(course_id, "TaEnrollment")[0]["user_id"] == student["user_id"]
+
+
+def test_status_reports_a_pending_cursor(tmp_path, monkeypatch, capsys):
+    db = str(tmp_path / "mirror.db")
+    course_mirror.CourseMirror(db).save_cursor(42, "grade_events", "page-3")
+    monkeypatch.setattr(sys, "argv", ["course_mirror", "status", "--course", "42", "--db", db])
+    course_mirror.main()
+    out = capsys.readouterr().out
+    assert "grade_events: in progress, resuming from page-3" in out
+    assert "assignments: never synced" in out
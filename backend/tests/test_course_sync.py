@@ -0,0 +1,23 @@
+"""Incremental refresh of the course mirror."""
+
+from datetime import timedelta
+
+from canvas_agent.course_sync import sync_course
+
+
+def test_refresh_fetches_only_what_changed(mirror, course, course_id):
+    teacher = next(e["user_id"] for e in course.enrollments if e["type"] == "TeacherEnrollment")
+    sub = next(s for s in course.submissions.values() if s["workflow_state"] == "submitted")
+    course._grade(sub, 7.5, teacher, course.now + timedelta(hours=1))
+
+    counts = sync_course(course_id, mirror)
+    # The row at the previous watermark is read again; nothing else is.
+    assert counts["submissions_users"] <= 2
+    assert counts["assignments"] == 0
+    assert counts["grade_events"] == 1
+    row = next(s for s in mirror.submissions(course_id, sub["assignment_id"])
+               if s["user_id"] == sub["user_id"])
+    assert row["score"] == 7.5 and row["workflow_state"] == "graded"
+
+    counts = sync_course(course_id, mirror)
+    assert counts["submissions_users"] == 1 and counts["grade_events"] == 0
@@ -0,0 +1,28 @@
+"""Department grade distributions merged across terms and sub-accounts."""
+
+from canvas_agent.canvas.canvas_analytics import compare_department_grades, get_department_grades
+
+
+def _mean(hist):
+    total = sum(hist.values())
+    return round(sum(int(b) * n for b, n in hist.items()) / total, 2)
+
+
+def test_terms_are_summarised_and_merged(fake_canvas, call_tool):
+    account_id = fake_canvas.config.app.state.config.account_id
+    result = call_tool(compare_department_grades, account_id=account_id, last_terms=3,
+                       include_sub_accounts=True)
+    terms = result["terms"]
+    assert len(terms) == 3
+
+    for term in terms:
+        hist = call_tool(get_department_grades, account_id=account_id, term_id=term["term_id"])
+        assert term["count"] == sum(hist.values())
+        assert term["mean"] == _mean(hist)
+    assert terms[0]["delta"] is None
+    assert terms[1]["delta"]["mean"] == round(terms[1]["mean"] - terms[0]["mean"], 2)
+    assert result["overall"]["count"] == sum(t["count"] for t in terms)
+
+    assert result["sub_accounts"]
+    for sub in result["sub_accounts"]:
+        assert set(sub["by_term"]) == {t["term_id"] for t in terms}
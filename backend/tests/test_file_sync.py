@@ -0,0 +1,47 @@
+"""Resuming interrupted downloads in `canvas_agent.file_sync`."""
+
+import os
+
+from canvas_agent.file_sync import FileSync
+
+
+def test_sync_resumes_a_part_file(course, course_id, tmp_path):
+    sync = FileSync(course_id, str(tmp_path))
+    remote = max(sync.remote_files(), key=lambda f: f["size"])
+    blob = course.file_blobs[remote["id"]]
+    part = sync._part_path(remote)
+    os.makedirs(os.path.dirname(part), exist_ok=True)
+    with open(part, "wb") as f:
+        f.write(blob[: len(blob) // 2])
+
+    result = sync.run()
+
+    assert result["failed"] == []
+    assert result["resumed"] == 1
+    assert (tmp_path / remote["path"]).read_bytes() == blob
+    assert not os.path.exists(part)
+    entry = next(e for e in result["entries"] if e["id"] == remote["id"])
+    assert entry["status"] == "resumed"
+
+
+def test_oversized_part_file_is_fetched_again(course, course_id, tmp_path):
+    sync = FileSync(course_id, str(tmp_path))
+    remote = sync.remote_files()[0]
+    part = sync._part_path(remote)
+    os.makedirs(os.path.dirname(part), exist_ok=True)
+    with open(part, "wb") as f:
+        f.write(b"x" * (remote["size"] + 10))
+
+    result = sync.run()
+
+    assert result["failed"] == []
+    assert (tmp_path / remote["path"]).read_bytes() == course.file_blobs[remote["id"]]
+
+
+def test_second_run_skips_unchanged_files(course_id, tmp_path):
+    first = FileSync(course_id, str(tmp_path)).run()
+    second = FileSync(course_id, str(tmp_path)).run()
+    assert first["downloaded"] == first["files"]
+    assert second["skipped"] == second["files"]
+    assert second["downloaded"] == 0
+    assert second["bytes"] == 0
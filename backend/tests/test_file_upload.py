@@ -0,0 +1,22 @@
+"""Streaming three-step file uploads into the fake course."""
+
+from canvas_agent.canvas import canvas_courses
+from canvas_agent.canvas.canvas_courses import upload_file
+
+
+def test_upload_streams_files_into_the_course(tmp_path, course, course_id, call_tool,
+                                              monkeypatch):
+    monkeypatch.setattr(canvas_courses, "UPLOAD_DIR", str(tmp_path))
+    (tmp_path / "notes.txt").write_bytes(b"week 3 notes\n")
+    (tmp_path / "data.csv").write_bytes(b"a,b\n" * 50_000)
+
+    result = call_tool(upload_file, course_id=course_id,
+                       paths=["notes.txt", "data.csv", "../secret.txt", "missing.txt"],
+                       folder="Lectures/Week 3")
+    ok, outside, missing = result["files"][:2], result["files"][2], result["files"][3]
+    assert outside["error"] == "Outside the upload directory" and missing["error"] == "Not a file"
+    assert result["sent_bytes"] == result["total_bytes"] == 13 + 200_000
+    assert result["files_done"] == 2
+    for row, path in zip(ok, ("notes.txt", "data.csv")):
+        assert row["path"] == path and "error" not in row
+        assert course.file_blobs[row["id"]] == (tmp_path / path).read_bytes()
@@ -0,0 +1,21 @@
+"""Cursor-resumable gradebook history ingestion."""
+
+from canvas_agent.course_mirror import CourseMirror
+from canvas_agent.grade_history import RESOURCE, GradeHistoryIngester
+
+
+def test_interrupted_run_resumes_without_duplicates(tmp_path, course, course_id):
+    mirror = CourseMirror(str(tmp_path / "mirror.db"))
+    pages = GradeHistoryIngester(mirror, course_id, per_page=50).pages()
+    assert len(next(pages)) == 50
+    next(pages)  # stores the first page; the second is still in flight
+    pages.close()
+    state = mirror.sync_state(course_id, RESOURCE)
+    assert state["synced_at"] is None and "page=2" in state["cursor"]
+    assert len(mirror.grade_events(course_id)) == 50
+
+    total = len(course.grade_events)
+    assert GradeHistoryIngester(mirror, course_id, per_page=50).run() == total - 50
+    assert len(mirror.grade_events(course_id)) == total
+    assert mirror.is_fresh(course_id, RESOURCE)
+    assert GradeHistoryIngester(mirror, course_id, per_page=50).run() == 0
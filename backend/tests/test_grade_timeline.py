@@ -0,0 +1,55 @@
+"""Grade timeline queries over the mirrored gradebook history."""
+
+from datetime import date
+from zoneinfo import ZoneInfo
+
+from canvas_agent import grade_timeline
+from canvas_agent.canvas.canvas_gradebook_history import (
+    get_grade_as_of,
+    get_grade_timeline,
+    get_grading_activity,
+    list_grading_days,
+)
+
+
+def _regraded(course):
+    return next(events for events in course.grade_events_by_sub.values() if len(events) > 1)
+
+
+def test_timeline_and_grade_as_of(mirror, course, course_id, call_tool):
+    events = sorted(_regraded(course), key=lambda e: e["new_graded_at"])
+    user_id, assignment_id = events[0]["user_id"], events[0]["assignment_id"]
+
+    result = call_tool(get_grade_timeline, course_id=course_id, user_id=user_id,
+                       assignment_id=assignment_id)
+    assert [e["new_grade"] for e in result["timeline"]] == [e["new_grade"] for e in events]
+    assert result["current_grade"] == events[-1]["new_grade"]
+
+    # Offsets are normalized before comparing with the stored UTC times.
+    regrade = call_tool(get_grade_as_of, course_id=course_id, user_id=user_id,
+                        assignment_id=assignment_id, at=events[1]["new_graded_at"][:-1] + "+00:00")
+    assert regrade["grade"] == events[1]["new_grade"]
+    first = call_tool(get_grade_as_of, course_id=course_id, user_id=user_id,
+                      assignment_id=assignment_id, at="2000-01-01")
+    assert first["grade"] is None
+
+
+def test_activity_days_match_grading_days(mirror, course_id, call_tool, monkeypatch):
+    # A course far from UTC: evening grading falls on the next UTC day.
+    monkeypatch.setitem(grade_timeline._zones, course_id, ZoneInfo("America/Los_Angeles"))
+    days = call_tool(list_grading_days, course_id=course_id, limit=1000)
+    expected = {(d["date"], g["id"]) for d in days for g in d["graders"]}
+
+    activity = call_tool(get_grading_activity, course_id=course_id, bucket="day")
+    assert {(row["bucket"], row["grader_id"]) for row in activity} == expected
+
+    day = days[0]["date"]
+    one_day = call_tool(get_grading_activity, course_id=course_id, since=day, until=day)
+    assert {row["bucket"] for row in one_day} == {day}
+    weeks = call_tool(get_grading_activity, course_id=course_id, bucket="week")
+    assert sum(r["changes"] for r in weeks) == sum(r["changes"] for r in activity)
+    assert all(date.fromisoformat(r["bucket"]).weekday() == 0 for r in weeks)
+
+
+def test_activity_buckets_are_in_the_schema():
+    assert get_grading_activity.params_json_schema["properties"]["bucket"]["enum"] == ["day", "week"]
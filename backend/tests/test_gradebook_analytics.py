@@ -0,0 +1,39 @@
+"""`missing_work_report` against the fake course's own submission flags."""
+
+from canvas_agent.canvas import canvas_gradebook_analytics
+from canvas_agent.canvas.canvas_gradebook_analytics import invalidate_gradebook, missing_work_report
+
+
+def test_missing_report_matches_submissions(call_tool, course, course_id):
+    invalidate_gradebook(course_id)
+    students = {e["user_id"] for e in course.enrollments
+                if e["type"] == "StudentEnrollment" and e["enrollment_state"] == "active"}
+    missing = [s for s in course.submissions.values()
+               if s["user_id"] in students and s.get("missing") and not s.get("excused")]
+
+    report = call_tool(missing_work_report, course_id=course_id, limit=100)
+
+    assert report["students_considered"] == len(students)
+    assert report["total_missing"] == len(missing)
+    by_student = {}
+    for s in missing:
+        by_student.setdefault(s["user_id"], set()).add(s["assignment_id"])
+    for row in report["students"]:
+        assert set(row["missing_assignment_ids"]) == by_student.get(row["user_id"], set())
+        assert row["name"] == course.users[row["user_id"]]["name"]
+
+
+def test_missing_report_without_submissions(call_tool, course_id, monkeypatch):
+    student = {"user_id": 1001, "grades": {"current_score": 90.0}}
+    assignment = {"id": 5001, "name": "Homework 1", "points_possible": 10, "due_at": None}
+    monkeypatch.setattr(canvas_gradebook_analytics, "_fetch",
+                        lambda _: ([student], [assignment], []))
+    invalidate_gradebook(course_id)
+    try:
+        report = call_tool(missing_work_report, course_id=course_id)
+    finally:
+        invalidate_gradebook(course_id)
+    assert report["students_considered"] == 1
+    assert report["total_missing"] == 0
+    assert report["students"] == []
+    assert report["assignments"] == []
@@ -0,0 +1,53 @@
+"""Gradebook statistics tools against plain sums over the fake course."""
+
+import statistics
+
+import pytest
+
+from canvas_agent.canvas import canvas_gradebook_analytics
+from canvas_agent.canvas.canvas_gradebook_analytics import (
+    assignment_statistics,
+    grade_distribution,
+    invalidate_gradebook,
+)
+
+
+@pytest.fixture
+def from_canvas(course_id, monkeypatch):
+    """Load the gradebook from the API, not a mirror other tests may have built."""
+    monkeypatch.setattr(canvas_gradebook_analytics, "fresh_mirror", lambda *_: None)
+    invalidate_gradebook(course_id)
+    yield
+    invalidate_gradebook(course_id)
+
+
+def _students(course):
+    return [e for e in course.enrollments
+            if e["type"] == "StudentEnrollment" and e["enrollment_state"] == "active"]
+
+
+def test_grade_distribution(from_canvas, course, course_id, call_tool):
+    scores = [e["grades"]["current_score"] for e in _students(course)
+              if e["grades"]["current_score"] is not None]
+    result = call_tool(grade_distribution, course_id=course_id, bin_width=20)
+    assert result["count"] == len(scores)
+    assert result["mean"] == round(statistics.mean(scores), 2)
+    assert result["percentiles"]["p50"] == round(statistics.median(scores), 2)
+    assert list(result["histogram"]) == ["0-20", "20-40", "40-60", "60-80", "80-100"]
+    assert sum(result["histogram"].values()) == len(scores)
+
+
+def test_assignment_statistics(from_canvas, course, course_id, call_tool):
+    students = {e["user_id"] for e in _students(course)}
+    assignment = next(a for a in course.assignments.values() if a["points_possible"])
+    percents = [100 * s["score"] / assignment["points_possible"]
+                for s in course.submissions.values()
+                if s["assignment_id"] == assignment["id"] and s["user_id"] in students
+                and s["score"] is not None]
+
+    rows = call_tool(assignment_statistics, course_id=course_id,
+                     assignment_ids=[assignment["id"]])
+    assert [r["assignment_id"] for r in rows] == [assignment["id"]]
+    assert rows[0]["graded"] == len(percents)
+    assert rows[0]["mean"] == round(statistics.mean(percents), 2)
+    assert rows[0]["max"] == round(max(percents), 2)
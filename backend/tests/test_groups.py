@@ -0,0 +1,30 @@
+"""Group tools against the fake course."""
+
+from canvas_agent.canvas.canvas_groups import (
+    add_users_to_group,
+    create_group,
+    list_groups_in_context,
+)
+
+
+def test_add_users_keeps_existing_members(course, course_id, call_tool):
+    group = call_tool(create_group, name="Lab A", context_id=course_id)
+    students = [e["user_id"] for e in course.enrollments if e["type"] == "StudentEnrollment"]
+    first = call_tool(add_users_to_group, group_id=group["id"], user_ids=students[:2])
+    assert first["added"] == students[:2]
+
+    result = call_tool(add_users_to_group, group_id=group["id"],
+                       user_ids=[students[1], students[2], 999999])
+    assert result["added"] == [students[2]]
+    assert result["already_members"] == [students[1]]
+    assert [f["user_id"] for f in result["not_added"]] == [999999]
+    assert sorted(course.group_members[group["id"]]) == sorted(students[:3])
+    assert result["members_count"] == 3
+
+
+def test_list_groups_with_members(course, course_id, call_tool):
+    groups = call_tool(list_groups_in_context, context_id=course_id)
+    assert groups
+    for g in groups:
+        assert {m["id"] for m in g["members"]} == set(course.group_members[g["id"]])
+        assert g["members_count"] == len(g["members"])
@@ -0,0 +1,25 @@
+"""Plain text from Canvas rich-content HTML."""
+
+from canvas_agent.html_text import html_to_text
+
+
+def test_structure_survives_as_text():
+    html = ("<h2>Late work</h2><p>Read the <a href='https://x.edu/policy'>policy</a>.</p>"
+            "<ol><li><p>Ask first</p></li><li>Submit<ul><li>by Friday</li></ul></li></ol>"
+            "<table><tr><th>Day</th><th>Penalty</th></tr><tr><td>1</td><td>10%</td></tr></table>"
+            "<script>track()</script><img src='a.png'>")
+    assert html_to_text(html) == "\n".join([
+        "## Late work",
+        "Read the policy (https://x.edu/policy).",
+        "1. Ask first",
+        "2. Submit",
+        "  - by Friday",
+        "Day | Penalty",
+        "1 | 10%",
+    ])
+
+
+def test_pre_keeps_whitespace():
+    assert html_to_text("<p>Run:</p><pre>def f():\n    return 1</pre>") == \
+        "Run:\ndef f():\n    return 1"
+    assert html_to_text(None) == ""
@@ -0,0 +1,69 @@
+"""Applying Canvas Live Events to the course mirror."""
+
+from canvas_agent import live_events
+from canvas_agent.live_events import LiveEventQueue, apply_events, parse_payload
+
+
+def _grade_change(course_id, sub, grade, updated_at):
+    return {
+        "metadata": {"event_name": "grade_change", "context_type": "Course",
+                     "context_id": str(course_id), "event_time": updated_at},
+        "body": {"submission_id": str(sub["id"]), "assignment_id": str(sub["assignment_id"]),
+                 "student_id": str(sub["user_id"]), "grader_id": "1001",
+                 "old_grade": sub["grade"], "grade": grade, "score": float(grade),
+                 "grading_complete": True, "updated_at": updated_at},
+    }
+
+
+def test_grade_change_patches_submission_and_history(mirror, course, course_id):
+    sub = next(s for s in course.submissions.values() if s["workflow_state"] == "graded")
+    # Same moment twice, in two notations: one grade event.
+    events = [_grade_change(course_id, sub, "42", "2026-10-19T03:05:00.250-07:00"),
+              _grade_change(course_id, sub, "42", "2026-10-19T10:05:00Z")]
+
+    result = apply_events(parse_payload({"events": events}))
+
+    assert result["applied"] == 2
+    assert result["failed"] == 0
+    assert f"gradebook:{course_id}" in result["invalidated"]
+    row = next(s for s in mirror.submissions(course_id, sub["assignment_id"])
+               if s["id"] == sub["id"])
+    assert row["grade"] == "42"
+    history = [e for e in mirror.grade_events(course_id, user_id=sub["user_id"],
+                                              assignment_id=sub["assignment_id"])
+               if e["graded_at"] == "2026-10-19T10:05:00Z"]
+    assert len(history) == 1
+
+
+def test_malformed_and_unknown_events_are_counted(mirror):
+    result = apply_events([
+        {"metadata": {"event_name": "grade_change"}, "body": {}},
+        {"metadata": {"event_name": "logged_in"}, "body": {}},
+    ])
+    assert (result["applied"], result["failed"], result["ignored"]) == (0, 1, 1)
+
+
+def test_queue_keeps_the_rest_of_a_batch_when_one_event_breaks(mirror, course, course_id,
+                                                                monkeypatch):
+    sub = next(s for s in course.submissions.values() if s["workflow_state"] == "graded")
+    good = _grade_change(course_id, sub, "37", "2026-10-19T11:00:00Z")
+    bad = _grade_change(course_id, sub, "38", "2026-10-19T11:01:00Z")
+    bad["body"]["poison"] = True
+    real = live_events._grade_change
+
+    def handler(event, batch):
+        if event["body"].get("poison"):
+            raise RuntimeError("mirror write failed")
+        real(event, batch)
+
+    monkeypatch.setitem(live_events.EVENT_HANDLERS, "grade_change", handler)
+    queue = LiveEventQueue(batch_size=100, interval=60)
+    queue._events = [good, bad]  # queued without starting the worker
+
+    result = queue.flush()
+
+    assert (result["applied"], result["failed"]) == (1, 1)
+    assert queue.stats["errors"] == 1
+    row = next(s for s in mirror.submissions(course_id, sub["assignment_id"])
+               if s["id"] == sub["id"])
+    assert row["grade"] == "37"
@@ -0,0 +1,28 @@
+"""The cached single-listing module tree."""
+
+from canvas_agent.canvas.canvas_modules import create_module_item, get_module_tree
+
+
+def test_tree_matches_the_course(course, course_id, call_tool):
+    tree = call_tool(get_module_tree, course_id=course_id, refresh=True)
+    assert tree["module_count"] == len(course.modules)
+    assert tree["item_count"] == sum(map(len, course.module_items.values()))
+    for module in tree["modules"]:
+        assert [i["id"] for i in module["items"]] == \
+            [i["id"] for i in course.module_items[module["id"]]]
+
+
+def test_large_course_falls_back_to_per_module_items(fake_canvas, course_id, call_tool,
+                                                     monkeypatch):
+    inline = call_tool(get_module_tree, course_id=course_id, refresh=True)
+    monkeypatch.setattr(fake_canvas.config.app.state.config, "inline_items_max", 0)
+    assert call_tool(get_module_tree, course_id=course_id, refresh=True) == inline
+
+
+def test_search_and_writes_refresh_the_cache(course_id, call_tool):
+    module = call_tool(get_module_tree, course_id=course_id)["modules"][0]
+    call_tool(create_module_item, course_id=course_id, module_id=module["id"],
+              item={"type": "SubHeader", "title": "Zebra reading list"})
+    found = call_tool(get_module_tree, course_id=course_id, search="zebra reading")
+    assert [m["id"] for m in found["modules"]] == [module["id"]]
+    assert found["modules"][0]["items"][-1]["title"] == "Zebra reading list"
@@ -0,0 +1,47 @@
+"""Link-header pagination and throttling back-off of the shared Canvas client."""
+
+from canvas_agent import openai_tools
+from canvas_agent.fake_canvas import FakeCanvasConfig, serve_in_background
+from canvas_agent.openai_tools import canvas_get, canvas_paginate, canvas_request
+
+from conftest import _free_port
+
+
+def test_paginate_follows_next_links(course, course_id):
+    # 12 assignments at the default 10 per page: two pages.
+    ids = [a["id"] for a in canvas_paginate(f"courses/{course_id}/assignments")]
+    assert len(ids) == len(set(ids))
+    assert sorted(ids) == sorted(course.assignments)
+
+
+def test_paginate_small_pages_match_one_big_page(course_id):
+    small = list(canvas_paginate(f"courses/{course_id}/enrollments", params={"per_page": 7}))
+    big = list(canvas_paginate(f"courses/{course_id}/enrollments", params={"per_page": 100}))
+    assert [e["id"] for e in small] == [e["id"] for e in big]
+
+
+def test_quiz_submission_side_load_is_clamped_like_the_page(course, course_id):
+    quiz_id = next(iter(course.quizzes))
+    body = canvas_get(f"courses/{course_id}/quizzes/{quiz_id}/submissions",
+                      params={"include[]": ["user"], "per_page": 10_000, "page": 0})
+    assert len(body["users"]) == len(body["quiz_submissions"])
+    assert [u["id"] for u in body["users"]] == [q["user_id"] for q in body["quiz_submissions"]]
+
+
+def test_throttled_requests_are_retried(fake_canvas, monkeypatch):
+    port = _free_port()
+    server = serve_in_background(FakeCanvasConfig(bucket_size=2.0, leak_per_second=20.0),
+                                 port=port)
+    sleeps = []
+    real_sleep = openai_tools.time.sleep
+    monkeypatch.setattr(openai_tools.time, "sleep",
+                        lambda seconds: (sleeps.append(seconds), real_sleep(0.2)))
+    try:
+        config = server.config.app.state.config
+        url = f"http://127.0.0.1:{port}/api/v1/courses/{config.course_id}"
+        for _ in range(6):
+            assert canvas_request("GET", url).json()["id"] == config.course_id
+    finally:
+        server.should_exit = True
+    assert sleeps, "the bucket never ran dry"
+    assert sleeps[0] == 0.5
@@ -0,0 +1,29 @@
+"""Explicit `fields` lists in `canvas_agent.projection` and the tools using them."""
+
+import pytest
+
+from canvas_agent.canvas.canvas_submissions import get_submissions
+from canvas_agent.projection import UnknownFieldsError, select_fields
+
+
+def test_fields_keep_canonical_order():
+    assert select_fields("submission", fields=["score", "user_id"]) == ["user_id", "score"]
+
+
+def test_unknown_fields_are_rejected_with_the_valid_ones():
+    with pytest.raises(UnknownFieldsError) as exc:
+        select_fields("assignment", fields=["name", "title"])
+    assert "['title']" in str(exc.value)
+    assert "points_possible" in str(exc.value)
+
+
+def test_tool_reports_unknown_fields_to_the_model(call_tool, course, course_id):
+    assignment_id = next(iter(course.assignments))
+    rows = call_tool(get_submissions, course_id=course_id, assignment_id=assignment_id,
+                     fields=["user_id", "scor"])
+    assert isinstance(rows, str)
+    assert "scor" in rows and "valid fields" in rows
+
+    rows = call_tool(get_submissions, course_id=course_id, assignment_id=assignment_id,
+                     fields=["score", "user_id"])
+    assert rows and set(rows[0]) == {"user_id", "score"}
@@ -0,0 +1,33 @@
+"""Cloning a quiz with its questions and groups."""
+
+from datetime import datetime, timedelta
+
+from canvas_agent.canvas.canvas_quizzes import clone_quiz
+
+
+def _at(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def test_clone_copies_questions_groups_and_shifts_dates(course, course_id, call_tool):
+    quiz_id = next(q for q, quiz in course.quizzes.items()
+                   if quiz["course_id"] == course_id and quiz.get("due_at"))
+    source = course.quizzes[quiz_id]
+    sections = [s["id"] for s in course.sections]
+
+    result = call_tool(clone_quiz, course_id=course_id, quiz_id=quiz_id, days_offset=7,
+                       targets=[{"course_id": course_id},
+                                {"course_id": course_id, "days_offset": 14,
+                                 "section_ids": sections}])
+    assert result["questions"] == len(course.questions[quiz_id])
+    plain, per_section = result["targets"]
+    for copy, days in ((plain, 7), (per_section, 14)):
+        assert copy["errors"] == []
+        assert len(copy["question_ids"]) == result["questions"]
+        assert set(copy["group_ids"]) == {q["quiz_group_id"] for q in
+                                          course.questions[quiz_id].values()
+                                          if q.get("quiz_group_id")}
+        assert _at(course.quizzes[copy["quiz_id"]]["due_at"]) - _at(source["due_at"]) == \
+            timedelta(days=days)
+    assert len(per_section["override_ids"]) == len(sections)
+    assert course.quizzes[per_section["quiz_id"]]["only_visible_to_overrides"] is True
@@ -0,0 +1,27 @@
+"""Streaming quiz submission exports."""
+
+import csv
+
+from canvas_agent.canvas import canvas_quiz_submissions
+from canvas_agent.canvas.canvas_quiz_submissions import export_quiz_submissions
+
+
+def test_csv_export_joins_every_submission(tmp_path, course, course_id, call_tool,
+                                           monkeypatch):
+    monkeypatch.setattr(canvas_quiz_submissions, "EXPORT_DIR", str(tmp_path))
+    quiz_id = next(q for q, quiz in course.quizzes.items()
+                   if quiz["course_id"] == course_id and course.quiz_submissions.get(q))
+    expected = course.quiz_submissions[quiz_id]
+
+    result = call_tool(export_quiz_submissions, course_id=course_id, quiz_id=quiz_id,
+                       filename="../quiz.csv")
+    assert result["path"] == str(tmp_path / "quiz.csv")
+    assert result["rows"] == len(expected)
+    with open(result["path"], newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(int(r["quiz_submission_id"]) for r in rows) == sorted(q["id"] for q in expected)
+    assert all(r["user_name"] == course.users[int(r["user_id"])]["name"] for r in rows)
+
+    again = call_tool(export_quiz_submissions, course_id=course_id, quiz_id=quiz_id,
+                      filename="quiz.csv")
+    assert "already exists" in again["error"]
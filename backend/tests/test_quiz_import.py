@@ -0,0 +1,60 @@
+"""Bulk quiz question import and question bank parsing."""
+
+import zipfile
+
+from canvas_agent.canvas import canvas_quiz_questions
+from canvas_agent.canvas.canvas_quiz_questions import import_quiz_questions
+from canvas_agent.question_bank import load_question_bank
+
+
+def _question(name, group=None):
+    return {"question_name": name, "question_text": f"{name}?",
+            "question_type": "multiple_choice_question", "points_possible": 1,
+            "answers": [{"text": "yes", "weight": 100},
+                        {"text": "no", "weight": 0}],
+            "group": group}
+
+
+def test_failed_group_skips_its_questions(course, course_id, call_tool, monkeypatch):
+    quiz_id = next(q for q, quiz in course.quizzes.items() if quiz["course_id"] == course_id)
+    before = len(course.questions[quiz_id])
+    real = canvas_quiz_questions.canvas_request
+
+    def request(method, path, **kwargs):
+        groups = (kwargs.get("json") or {}).get("quiz_groups")
+        if groups and groups[0]["name"] == "Broken":
+            raise RuntimeError("Canvas API error 500: group")
+        return real(method, path, **kwargs)
+
+    monkeypatch.setattr(canvas_quiz_questions, "canvas_request", request)
+    result = call_tool(import_quiz_questions, course_id=course_id, quiz_id=quiz_id,
+                       questions=[_question("Loose"), _question("Kept", "Fine"),
+                                  _question("Lost", "Broken")])
+    assert result["created"] == 2
+    assert set(result["groups"]) == {"Fine"}
+    assert [g["name"] for g in result["failed_groups"]] == ["Broken"]
+    assert [f["question_name"] for f in result["failed"]] == ["Lost"]
+    assert len(course.questions[quiz_id]) == before + 2
+
+
+QTI = """<questestinterop><assessment title="{0}"><section ident="root">
+<item ident="{0}1" title="{0} question"><presentation><material>
+<mattext>Pick one</mattext></material><response_lid ident="r"><render_choice>
+<response_label ident="a"><material><mattext>A</mattext></material></response_label>
+<response_label ident="b"><material><mattext>B</mattext></material></response_label>
+</render_choice></response_lid></presentation><resprocessing><respcondition>
+<conditionvar><varequal respident="r">a</varequal></conditionvar>
+<setvar action="Set">100</setvar></respcondition></resprocessing></item>
+</section></assessment></questestinterop>"""
+
+
+def test_qti_zip_reads_every_assessment(tmp_path):
+    path = tmp_path / "export.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("imsmanifest.xml", "<manifest/>")
+        zf.writestr("g1/g1.xml", QTI.format("First"))
+        zf.writestr("g1/assessment_meta.xml", "<quiz/>")
+        zf.writestr("g2/g2.xml", QTI.format("Second"))
+    _, questions = load_question_bank(str(path))
+    assert [q["question_name"] for q in questions] == ["First question", "Second question"]
+    assert questions[0]["answers"][0]["weight"] == 100
@@ -0,0 +1,45 @@
+"""Quiz item analysis from Canvas' report and from raw submissions."""
+
+from canvas_agent.canvas import canvas_quiz_statistic
+from canvas_agent.canvas.canvas_quiz_statistic import get_quiz_statistics
+
+
+def _quiz(course, course_id):
+    return next(q for q, quiz in course.quizzes.items()
+                if quiz["course_id"] == course_id and course.quiz_submissions.get(q))
+
+
+def _share_correct(course, quiz_id):
+    answers = [a for (qid, _), rows in course.quiz_answers.items() if qid == quiz_id
+               for a in rows]
+    share = {}
+    for a in answers:
+        share.setdefault(a["question_id"], []).append(bool(a["correct"]))
+    return {q: round(sum(v) / len(v), 3) for q, v in share.items()}
+
+
+def _difficulty(result):
+    # Questions added by other tests have no answers yet.
+    return {q["question_id"]: q["difficulty"] for q in result["questions"] if q["answered"]}
+
+
+def test_item_analysis_from_canvas_statistics(course, course_id, call_tool):
+    quiz_id = _quiz(course, course_id)
+    result = call_tool(get_quiz_statistics, course_id=course_id, quiz_id=quiz_id, limit=100)
+    assert result["source"] == "canvas"
+    expected = _share_correct(course, quiz_id)
+    assert _difficulty(result) == expected
+    difficulty = [q["difficulty"] for q in result["questions"] if q["answered"]]
+    assert difficulty == sorted(difficulty)
+
+
+def test_submissions_fallback_agrees(course, course_id, call_tool, monkeypatch):
+    quiz_id = _quiz(course, course_id)
+    monkeypatch.setattr(canvas_quiz_statistic, "_items_from_statistics", lambda stats: [])
+    result = call_tool(get_quiz_statistics, course_id=course_id, quiz_id=quiz_id,
+                       sort_by="position", limit=100)
+    assert result["source"] == "submissions"
+    assert _difficulty(result) == _share_correct(course, quiz_id)
+    for q in result["questions"]:
+        if q["answered"]:
+            assert abs(sum(a["rate"] for a in q["answers"]) - 1) < 0.01
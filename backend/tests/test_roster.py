@@ -0,0 +1,27 @@
+"""The per-course roster index."""
+
+from canvas_agent import roster as roster_module
+from canvas_agent.roster import Roster, roster_for, with_names
+
+
+def test_roster_indexes_every_enrollment(course, course_id):
+    roster = roster_for(course_id, refresh=True)
+    assert set(roster.people) == {e["user_id"] for e in course.enrollments}
+    student = next(e for e in course.enrollments if e["type"] == "StudentEnrollment")
+    assert roster.name(student["user_id"]) == course.users[student["user_id"]]["name"]
+    assert Roster.load(course_id).people == roster.people
+
+
+def test_unknown_ids_are_looked_up_once(course, course_id, monkeypatch):
+    roster = roster_for(course_id, refresh=True)
+    late_add = next(iter(roster.people))
+    del roster.people[late_add]
+    batches = []
+    lookup = roster_module.course_users
+    monkeypatch.setattr(roster_module, "course_users",
+                        lambda cid, ids, **kw: batches.append(ids) or lookup(cid, ids, **kw))
+
+    rows = with_names(course_id, [{"user_id": late_add}, {"user_id": 999999}])
+    assert rows[0]["user_name"] == course.users[late_add]["name"] and rows[1]["user_name"] is None
+    roster.resolve([late_add, 999999])
+    assert batches == [[late_add, 999999]]
@@ -0,0 +1,40 @@
+"""The on-disk function-tool schema cache."""
+
+from agents import function_tool as sdk_function_tool
+
+from canvas_agent import tool_schemas
+
+
+def add(a: int, b: int = 2) -> int:
+    """
+    Add two numbers.
+
+    Args:
+        a (int): First number.
+        b (int): Second number.
+    """
+    return a + b
+
+
+def test_cached_schema_matches_the_sdk_and_still_runs(call_tool, monkeypatch):
+    monkeypatch.setattr(tool_schemas, "STATS", dict.fromkeys(tool_schemas.STATS, 0))
+    tool_schemas._cache.clear()
+    built = tool_schemas.function_tool(add)
+    cached = tool_schemas.function_tool(add)
+    assert tool_schemas.STATS["misses"] == 1 and tool_schemas.STATS["hits"] == 1
+
+    reference = sdk_function_tool(add)
+    assert cached.params_json_schema == built.params_json_schema == reference.params_json_schema
+    assert cached.description == reference.description
+    assert tool_schemas.STATS["resolved"] == 0
+    assert call_tool(cached, a=40) == 42
+    assert tool_schemas.STATS["resolved"] == 1
+
+
+def test_changed_defaults_miss_the_cache():
+    before = tool_schemas.fingerprint(add, {})
+    add.__defaults__ = (3,)
+    try:
+        assert tool_schemas.fingerprint(add, {}) != before
+    finally:
+        add.__defaults__ = (2,)
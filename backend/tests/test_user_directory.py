@@ -0,0 +1,22 @@
+"""Batched, cached user lookups."""
+
+from canvas_agent.user_directory import UserDirectory
+
+
+def test_lookup_batches_caches_and_drops_unknown_ids(course, course_id, monkeypatch):
+    students = [e["user_id"] for e in course.enrollments if e["type"] == "StudentEnrollment"]
+    directory = UserDirectory(capacity=3)
+    singles = []
+    one = directory._one
+    monkeypatch.setattr(directory, "_one", lambda uid: singles.append(uid) or one(uid))
+
+    found = directory.lookup([students[0], students[1], students[0], 999999], course_id)
+    assert list(found) == [students[0], students[1]]
+    assert found[students[0]]["name"] == course.users[students[0]]["name"]
+    assert singles == [999999]  # only the id the course listing did not return
+
+    directory.lookup([students[1]], course_id)
+    assert directory.hits == 1 and directory.misses == 3
+
+    directory.lookup(students[2:4], course_id)
+    assert students[0] not in directory._cache and len(directory._cache) == 3